@@ -1,2 +1,8 @@
-# `bel_comparator` 패키지의 초기화 파일. 패키지 레벨에서 사용할 모듈들을 불러옵니다.
-from .bel_comparator_core import BELComparator
+# `bel_comparator` 패키지의 초기화 파일. 패키지 레벨에서 사용할 이름을 정의합니다.
+# BELComparator는 pandas를 불러오므로 GUI 창이 먼저 뜨도록 처음 사용할 때 불러옵니다.
+
+def __getattr__(name):
+    if name == 'BELComparator':
+        from .bel_comparator_core import BELComparator
+        return BELComparator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,9 @@
+# `python -m bel_comparator`로 실행되는 헤드리스 CLI 진입점
+import multiprocessing
+import sys
+
+from bel_comparator.cli import main
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()  # PyInstaller 빌드에서 프로세스 풀 사용 시 필요
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+
+# 요약 통계를 나눌 컬럼 (LOA_CODE는 결과 컬럼이 아니므로 비교 결과와 함께 받은 범주형 배열을 사용)
+GROUP_COLUMNS = ['LOA_CODE', 'RIDER_PRD_CODE']
+# 요약 파일 이름 (컬럼별 요약 파일은 summary_<컬럼 이름 소문자><확장자>)
+SUMMARY_FILE_NAME = 'summary.json'
+# DIFF 히스토그램 구간 경계의 허용오차 배수 (0을 중심으로 양쪽 대칭, 양 끝은 무한대까지)
+HISTOGRAM_MULTIPLES = [0.01, 0.1, 1, 10, 100]
+
+# 비교 결과 요약
+#   total: 전체 행의 통계 dict, groups: 컬럼별 요약 표 DataFrame (값 순서, NaN 값은 마지막)
+#   histogram_edges: DIFF 히스토그램 구간 경계 (구간은 [앞 경계, 뒤 경계))
+ResultSummary = namedtuple('ResultSummary', ['total', 'groups', 'histogram_edges', 'adjustment_factor', 'exclude_na'])
+
+def histogram_edges(adjustment_factor):
+    """허용오차 배수로 DIFF 히스토그램의 구간 경계 배열을 만드는 함수"""
+    multiples = np.array(HISTOGRAM_MULTIPLES, dtype=np.float64)
+    return np.concatenate([-multiples[::-1], multiples]) * adjustment_factor
+
+def histogram_labels(edges):
+    """히스토그램 구간 경계로 구간별 컬럼 이름 목록을 만드는 함수"""
+    bounds = ['-inf'] + [f"{edge:g}" for edge in edges] + ['inf']
+    return [f"DIFF[{low},{high})" for low, high in zip(bounds[:-1], bounds[1:])]
+
+# 그룹 구분 없이 행마다 한 번만 계산해 두는 값
+#   valid: N/A가 아닌 행 여부, errors: 에러 행 여부, abs_diff, answer_abs, bins: N/A가 아닌 행의 |DIFF|, |ANSWER_BEL|, 히스토그램 구간 번호
+RowStatistics = namedtuple('RowStatistics', ['valid', 'errors', 'abs_diff', 'answer_abs', 'bins', 'bin_labels'])
+
+def row_statistics(diff, answer_abs, adjustment_factor, exclude_na):
+    """그룹별 집계에 공통으로 쓰는 행 단위 값(RowStatistics)을 계산하는 함수"""
+    valid = ~np.isnan(diff)
+    edges = histogram_edges(adjustment_factor)
+    valid_diff = diff[valid]
+    return RowStatistics(
+        valid, data_processing.error_mask(diff, adjustment_factor, exclude_na), np.abs(valid_diff), answer_abs[valid],
+        np.searchsorted(edges, valid_diff, side='right'), histogram_labels(edges)
+    )
+
+# 그룹별 합계 (평균과 상대 오차는 합계로 계산하므로 그룹을 합쳐도 다시 계산할 수 있음)
+GroupTotals = namedtuple('GroupTotals', ['count', 'valid_count', 'errors', 'abs_sum', 'answer_sum', 'max_abs', 'histogram'])
+
+def aggregate(codes, group_count, rows):
+    """그룹 번호 배열(0 ~ group_count-1)별 합계(GroupTotals)를 bincount로 계산하는 함수"""
+    valid_codes = codes[rows.valid]
+    max_abs = np.zeros(group_count)
+    np.maximum.at(max_abs, valid_codes, rows.abs_diff)
+
+    # 구간 번호와 그룹 번호를 하나의 번호로 묶어 그룹별 히스토그램도 bincount 한 번으로 계산
+    bin_count = len(rows.bin_labels)
+    histogram = np.bincount(valid_codes * bin_count + rows.bins, minlength=group_count * bin_count).reshape(group_count, bin_count)
+    return GroupTotals(
+        np.bincount(codes, minlength=group_count),
+        np.bincount(valid_codes, minlength=group_count),
+        np.bincount(codes[rows.errors], minlength=group_count),
+        np.bincount(valid_codes, weights=rows.abs_diff, minlength=group_count),
+        np.bincount(valid_codes, weights=rows.answer_abs, minlength=group_count),
+        max_abs,
+        histogram,
+    )
+
+def combine_totals(totals):
+    """여러 그룹의 합계를 그룹 하나의 합계로 합치는 함수 (그룹이 없으면 0)"""
+    return GroupTotals(*(
+        # |DIFF|는 0 이상이므로 initial=0으로 두면 그룹이 없는 빈 결과에서도 최댓값을 계산할 수 있음
+        values.max(axis=0, keepdims=True, initial=0) if name == 'max_abs' else values.sum(axis=0, keepdims=True)
+        for name, values in totals._asdict().items()
+    ))
+
+def group_statistics(totals, bin_labels):
+    """그룹별 합계로 요약 표의 컬럼별 배열 dict를 만드는 함수 (N/A가 아닌 행이 없는 그룹의 |DIFF| 통계는 NaN)"""
+    has_values = totals.valid_count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats = {
+            'COUNT': totals.count,
+            'ERRORS': totals.errors,
+            'NA_COUNT': totals.count - totals.valid_count,
+            'MEAN_ABS_DIFF': np.where(has_values, totals.abs_sum / totals.valid_count, np.nan),
+            'MAX_ABS_DIFF': np.where(has_values, totals.max_abs, np.nan),
+            'RELATIVE_ERROR': np.where(totals.answer_sum > 0, totals.abs_sum / totals.answer_sum, np.nan),
+        }
+    for label, values in zip(bin_labels, totals.histogram.T):
+        stats[label] = values
+    return stats
+
+def group_codes(values):
+    """범주형 배열의 코드를 그룹 번호로 바꾸고 (그룹 번호 배열, 그룹 값 범주형 배열)을 반환하는 함수 (NaN은 마지막 그룹)"""
+    values = pd.Categorical(values)
+    codes = values.codes.astype(np.intp)
+    categories = values.categories
+    if (codes < 0).any():
+        codes[codes < 0] = len(categories)
+        group_values = pd.Categorical.from_codes(np.r_[np.arange(len(categories)), -1], categories=categories)
+    else:
+        group_values = pd.Categorical.from_codes(np.arange(len(categories)), categories=categories)
+    return codes, group_values
+
+def summarize_result(result, loa_code, adjustment_factor, exclude_na, rows=None):
+    """비교 결과(rows가 주어지면 해당 행)의 전체 및 LOA_CODE별, RIDER_PRD_CODE별 통계를 계산하는 함수
+
+    에러 수는 count_errors와 같은 기준이고, 평균/최대 |DIFF|와 상대 오차(Σ|DIFF| / Σ|ANSWER_BEL|)는 N/A가 아닌 행만 사용합니다.
+    그룹별 통계는 범주 코드에 대한 bincount로 계산하므로 정렬 없이 행 수에 비례하는 시간이 걸립니다.
+    """
+    diff = data_processing.diff_array(result)
+    answer_abs = np.abs(result['ANSWER_BEL'].to_numpy(dtype=np.float64, na_value=np.nan))
+    group_values = {'LOA_CODE': loa_code, 'RIDER_PRD_CODE': result['RIDER_PRD_CODE'].array}
+    if rows is not None:
+        diff, answer_abs = diff[rows], answer_abs[rows]
+        group_values = {col: values.take(rows) for col, values in group_values.items()}
+    row_stats = row_statistics(diff, answer_abs, adjustment_factor, exclude_na)
+
+    groups = {}
+    total = None
+    for col in GROUP_COLUMNS:
+        codes, values = group_codes(group_values[col])
+        totals = aggregate(codes, len(values), row_stats)
+        frame = pd.DataFrame({col: values, **group_statistics(totals, row_stats.bin_labels)})
+        groups[col] = frame[frame['COUNT'] > 0].reset_index(drop=True)  # 선택한 행에 없는 값은 제외
+        if total is None:
+            # 모든 행이 어느 한 그룹에 속하므로 첫 컬럼의 그룹 합계를 합치면 전체 통계
+            total = group_statistics(combine_totals(totals), row_stats.bin_labels)
+    return ResultSummary(
+        {name: values[0].item() for name, values in total.items()}, groups, histogram_edges(adjustment_factor),
+        adjustment_factor, exclude_na
+    )
+
+def summary_record(summary):
+    """요약 결과를 JSON으로 저장할 dict로 변환하는 함수 (NaN 통계는 null)"""
+    def clean(value):
+        return None if isinstance(value, float) and np.isnan(value) else value
+
+    groups = {}
+    for col, frame in summary.groups.items():
+        records = frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+        groups[col] = [{name: clean(value) for name, value in record.items()} for record in records]
+    return {
+        'adjustment_factor': summary.adjustment_factor,
+        'exclude_na': summary.exclude_na,
+        'histogram_edges': summary.histogram_edges.tolist(),
+        'total': {name: clean(value) for name, value in summary.total.items()},
+        'groups': groups,
+    }
+
+def format_summary(summary):
+    """요약 결과의 전체 통계를 콘솔에 출력할 요약 줄 목록으로 변환하는 함수"""
+    total = summary.total
+    return [
+        f"요약 통계 ({total['COUNT']:,}행): 에러 {total['ERRORS']:,}개, N/A {total['NA_COUNT']:,}개, "
+        f"평균 |DIFF| {total['MEAN_ABS_DIFF']:.6f}, 최대 |DIFF| {total['MAX_ABS_DIFF']:.6f}, "
+        f"상대 오차 {total['RELATIVE_ERROR']:.6e}",
+        "  " + ", ".join(f"{col} {len(frame):,}개" for col, frame in summary.groups.items()),
+    ]
+
+def write_summary(summary, directory, export_format=None):
+    """컬럼별 요약 표 파일과 전체 요약 JSON을 directory에 쓰고 쓴 파일 경로 목록을 반환하는 함수"""
+    os.makedirs(directory, exist_ok=True)
+    extension = export.EXPORT_FORMATS[export_format or export.FORMAT_CSV][1]
+    paths = []
+    for col, frame in summary.groups.items():
+        path = os.path.join(directory, f"summary_{col.lower()}{extension}")
+        export.export_result(frame, path, export_format=export_format)
+        paths.append(path)
+
+    summary_path = os.path.join(directory, SUMMARY_FILE_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary_record(summary), f, ensure_ascii=False, indent=2)
+    paths.append(summary_path)
+    return paths
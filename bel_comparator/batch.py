@@ -0,0 +1,181 @@
+import glob
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from bel_comparator import BELComparator
+from bel_comparator.custom_exceptions import InvalidInputError
+from bel_comparator.key_index import KEY_COLUMNS, encode_keys, sort_keys
+from bel_comparator.progress import STAGE_LOAD_FIRST, STAGE_LOAD_SECOND, STAGE_VALIDATE, STAGE_BATCH, ensure_reporter
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.utils as utils
+
+# 배치 비교 요약 파일 이름 (결과 디렉터리에 저장)
+SUMMARY_FILE_NAME = 'batch_summary.csv'
+
+# 한 번 읽어 모든 Second 파일과 비교할 First 데이터 (범위를 자르고 BEL 값을 붙인 DataFrame, 키 정렬 정보)
+BatchFirst = namedtuple('BatchFirst', ['inno_df', 'key_order'])
+
+# Second 파일별 비교 옵션
+BatchOptions = namedtuple('BatchOptions', ['diff_only', 'exclude_na', 'adjustment_factor', 'export_format', 'chunksize', 'use_cache'])
+
+# Second 파일 하나의 비교 요약 (실패한 경우 error에 메시지가 있고 나머지 값은 None)
+BatchFileSummary = namedtuple('BatchFileSummary', [
+    'second_csv', 'output_path', 'pw_count', 'result_rows', 'error_count', 'na_count', 'max_abs_diff',
+    'unmatched_second_keys', 'unmatched_first_keys', 'error'
+])
+
+# 배치 비교의 실행 결과
+BatchRun = namedtuple('BatchRun', ['summaries', 'summary_path', 'inno_count', 'adjustment_factor'])
+
+# 요약 파일의 컬럼 이름 (BatchFileSummary 필드 순서)
+SUMMARY_COLUMNS = [
+    'SECOND_CSV', 'OUTPUT', 'PW_COUNT', 'RESULT_ROWS', 'ERRORS', 'NA_COUNT', 'MAX_ABS_DIFF',
+    'UNMATCHED_SECOND_KEYS', 'UNMATCHED_FIRST_KEYS', 'ERROR'
+]
+
+# 워커 프로세스에서 사용할 First 데이터 (프로세스 시작 시 한 번만 전달받음)
+worker_first = None
+
+def resolve_second_paths(path):
+    """디렉터리(안의 *.csv), glob 패턴, 파일 경로를 Second CSV 파일 목록으로 변환하는 함수"""
+    if os.path.isdir(path):
+        names = sorted(name for name in os.listdir(path) if name.lower().endswith('.csv'))
+        paths = [os.path.join(path, name) for name in names]
+    elif glob.has_magic(path):
+        paths = sorted(glob.glob(path))
+    else:
+        paths = [path]
+    paths = [path for path in paths if os.path.isfile(path)]
+    if not paths:
+        raise InvalidInputError(f"비교할 Second CSV 파일이 없습니다: {path}")
+    return paths
+
+def output_paths_for(second_paths, output_dir, export_format):
+    """Second CSV 파일별 결과 파일 경로를 만드는 함수 (결과 디렉터리 안에서 이름이 겹치면 오류)"""
+    extension = export.EXPORT_FORMATS[export_format or export.FORMAT_CSV][1]
+    output_paths = []
+    for path in second_paths:
+        name = os.path.basename(path)
+        if name.lower().endswith('.csv'):
+            name = name[:-len('.csv')]
+        output_paths.append(os.path.join(output_dir, f"{name}_result{extension}"))
+
+    duplicates = sorted({path for path in output_paths if output_paths.count(path) > 1})
+    if duplicates:
+        raise InvalidInputError(f"결과 파일 이름이 같은 Second CSV 파일이 있습니다: {', '.join(duplicates)}")
+    return output_paths
+
+def prepare_first(inno_csv_path, bel_input_text, start_str, end_str, chunksize, progress, use_cache=True):
+    """First CSV를 읽어 범위를 자르고 BEL 값을 붙인 뒤 키 정렬 정보를 한 번 계산하는 함수"""
+    with progress.measure(STAGE_LOAD_FIRST) as stage:
+        inno_df = data_processing.load_first_range(inno_csv_path, start_str, end_str, chunksize, progress, use_cache=use_cache)
+        stage['rows'] = len(inno_df)
+
+    bel_values = BELComparator.parse_bel_values(bel_input_text)
+
+    with progress.measure(STAGE_VALIDATE) as stage:
+        # Innolink 컬럼 검증과 BEL 값 배치는 빈 Pathwise 데이터로 한 번만 수행
+        comparator = BELComparator(inno_df, pd.DataFrame(columns=KEY_COLUMNS + ['BEL']), bel_values)
+        comparator.validate_and_prepare_data()
+        inno_df = comparator.inno_df
+
+        # 사전 코드는 Second 파일마다 달라지지만 First 키의 정렬 순서와 키별 첫 행은 같으므로 미리 계산
+        encoding = encode_keys([inno_df])
+        key_order = sort_keys(encoding.keys[0], encoding.valid[0])
+        stage['rows'] = len(inno_df)
+    return BatchFirst(inno_df, key_order)
+
+def compare_second_file(first, pw_csv_path, output_path, options):
+    """First 데이터와 Second CSV 파일 하나를 비교하여 결과 파일을 쓰고 요약(BatchFileSummary)을 반환하는 함수"""
+    try:
+        pw_df = utils.load_csv_with_chunksize(pw_csv_path, options.chunksize, None, STAGE_LOAD_SECOND,
+                                              KEY_COLUMNS + ['BEL'], options.use_cache)
+        comparator = BELComparator(first.inno_df, pw_df, first.inno_df['INNOLINC_BEL'].to_numpy(), first.key_order)
+        comparator.validate_and_prepare_data()
+        result = comparator.compare_bel()
+
+        diff = data_processing.diff_array(result)
+        rows = np.flatnonzero(data_processing.filter_mask(diff, options.diff_only, options.exclude_na, options.adjustment_factor))
+        error_count = data_processing.count_errors(diff[rows], options.adjustment_factor, options.exclude_na)
+        export.export_result(result, output_path, rows, options.export_format)
+
+        # N/A 개수와 최대 |DIFF|는 조회 방식과 관계없이 전체 결과 기준
+        is_na = np.isnan(diff)
+        max_abs_diff = float(np.abs(diff[~is_na]).max()) if not is_na.all() else np.nan
+        key_diagnostics = comparator.key_diagnostics
+        return BatchFileSummary(pw_csv_path, output_path, len(pw_df), len(rows), error_count, int(np.count_nonzero(is_na)),
+                                max_abs_diff, len(key_diagnostics.second_only), len(key_diagnostics.first_only), None)
+    except Exception as e:
+        return BatchFileSummary(pw_csv_path, None, None, None, None, None, None, None, None, str(e))
+
+def init_worker(first):
+    """워커 프로세스 시작 시 First 데이터를 전역 변수에 보관하는 함수"""
+    global worker_first
+    worker_first = first
+
+def compare_in_worker(pw_csv_path, output_path, options):
+    """워커 프로세스에 보관한 First 데이터로 Second CSV 파일 하나를 비교하는 함수"""
+    return compare_second_file(worker_first, pw_csv_path, output_path, options)
+
+def summary_frame(summaries):
+    """파일별 요약 목록을 요약 표(DataFrame)로 변환하는 함수"""
+    summary = pd.DataFrame(list(summaries), columns=BatchFileSummary._fields)
+    summary.columns = SUMMARY_COLUMNS
+    for col in ['PW_COUNT', 'RESULT_ROWS', 'ERRORS', 'NA_COUNT', 'UNMATCHED_SECOND_KEYS', 'UNMATCHED_FIRST_KEYS']:
+        summary[col] = summary[col].astype('Int64')  # 실패한 파일은 빈 값
+    summary['MAX_ABS_DIFF'] = summary['MAX_ABS_DIFF'].astype(np.float64)
+    summary['ERROR'] = summary['ERROR'].fillna('')
+    return summary
+
+def run_batch_comparison(inno_csv_path, pw_csv_paths, bel_input_text, start_str, end_str,
+                         adjustment_factor_str, default_adjustment_factor, output_dir,
+                         diff_only, exclude_na, chunksize, log_to_console, progress=None,
+                         workers=1, export_format=None, use_cache=True):
+    """First CSV 하나를 여러 Second CSV 파일과 비교하여 파일별 결과와 요약 파일을 output_dir에 쓰는 함수
+
+    First 파일의 로드, 검증, 키 정렬은 한 번만 수행하고, Second 파일은 workers개의 프로세스에서 동시에 비교합니다.
+    파일별 결과는 같은 두 파일로 run_comparison + export_result를 실행한 결과와 같습니다.
+    한 파일의 비교가 실패해도 나머지 파일은 계속 비교하고, 실패 내용은 요약의 ERROR 컬럼에 기록합니다.
+    """
+    progress = ensure_reporter(progress)
+    adjustment_factor = data_processing.parse_adjustment_factor(adjustment_factor_str, default_adjustment_factor)
+    output_paths = output_paths_for(pw_csv_paths, output_dir, export_format)
+    os.makedirs(output_dir, exist_ok=True)
+
+    first = prepare_first(inno_csv_path, bel_input_text, start_str, end_str, chunksize, progress, use_cache)
+    log_to_console(f"Innolink CSV 파일 로드 완료: {inno_csv_path}")
+    options = BatchOptions(diff_only, exclude_na, adjustment_factor, export_format, chunksize, use_cache)
+
+    summaries = [None] * len(pw_csv_paths)
+    with progress.measure(STAGE_BATCH) as stage:
+        progress.update(STAGE_BATCH, 0, len(pw_csv_paths))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(first,)) as executor:
+                futures = {
+                    executor.submit(compare_in_worker, pw_csv_path, output_path, options): i
+                    for i, (pw_csv_path, output_path) in enumerate(zip(pw_csv_paths, output_paths))
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    summaries[futures[future]] = log_summary(future.result(), log_to_console)
+                    progress.update(STAGE_BATCH, done, len(pw_csv_paths))
+        else:
+            for i, (pw_csv_path, output_path) in enumerate(zip(pw_csv_paths, output_paths)):
+                summaries[i] = log_summary(compare_second_file(first, pw_csv_path, output_path, options), log_to_console)
+                progress.update(STAGE_BATCH, i + 1, len(pw_csv_paths))
+        stage['rows'] = sum(summary.pw_count or 0 for summary in summaries)
+
+    summary_path = os.path.join(output_dir, SUMMARY_FILE_NAME)
+    summary_frame(summaries).to_csv(summary_path, index=False)
+    return BatchRun(summaries, summary_path, len(first.inno_df), adjustment_factor)
+
+def log_summary(summary, log_to_console):
+    """파일 하나의 비교 완료 또는 실패를 로그로 남기고 요약을 그대로 반환하는 함수"""
+    if summary.error is not None:
+        log_to_console(f"비교 실패: {summary.second_csv} ({summary.error})")
+    else:
+        log_to_console(f"비교 완료: {summary.second_csv} -> {summary.output_path}")
+    return summary
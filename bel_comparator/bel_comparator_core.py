@@ -1,39 +1,45 @@
+import numpy as np
 import pandas as pd
 from bel_comparator.custom_exceptions import MissingColumnsError, InvalidBELValuesError
+from bel_comparator.key_index import (
+    KEY_COLUMNS, build_key_index, decode_categorical, encode_keys, expand_groups, group_first_rows, group_keys,
+    lookup_index, merged_codes, right_first_rows, take_rows
+)
+from bel_comparator.progress import STAGE_MERGE, STAGE_DIAGNOSTICS, STAGE_INDEX, ensure_reporter
+import bel_comparator.diagnostics as diagnostics
+import bel_comparator.utils as utils
+
+# 인덱스 계산 시 진행 상황을 보고하는 행 단위
+INDEX_CHUNKSIZE = 100000
 
 class BELComparator:
-    def __init__(self, inno_df, pw_df, bel_values):
+    def __init__(self, inno_df, pw_df, bel_values, inno_key_order=None):
         self.inno_df = inno_df
         self.pw_df = pw_df
         self.bel_values = bel_values
-        
+        self.inno_key_order = inno_key_order  # 미리 계산한 Innolink 키 정렬 정보 (KeyOrder, 없으면 비교 시 계산)
+        self.merged_row_count = None  # BEL 필터링 전 병합 결과의 행 수 (ROW 번호의 기준)
+        self.key_diagnostics = None  # 중복 키, 한쪽에만 있는 키, 병합 팬아웃 진단 결과 (KeyDiagnostics)
+        self.loa_code = None  # 결과 행별 LOA_CODE (범주형, 결과 컬럼에는 넣지 않음)
+
     @staticmethod
     def parse_bel_values(bel_text):
-        """입력된 BEL 텍스트를 파싱하여 숫자 리스트로 반환합니다."""
-        bel_lines = bel_text.strip().splitlines()
-        bel_values = []
-
-        # 첫 번째 줄 처리
-        if bel_lines:
-            first_line = bel_lines[0].strip()
-            if first_line.isalpha():
-                bel_lines = bel_lines[1:]  # 첫 번째 줄을 제거
-
-        for line in bel_lines:
-            line = line.strip()
-            try:
-                if line:
-                    bel_values.append(float(line))
-            except ValueError:
-                bel_values.append(pd.NA)  # 변환이 안 되는 경우 NaN으로 처리
-        
-        if not bel_values:
+        """입력된 BEL 텍스트를 파싱하여 float64 배열로 반환합니다. (변환이 안 되는 줄은 NaN)"""
+        bel_text = bel_text.strip()
+
+        # 첫 번째 줄이 헤더(문자로만 구성)이면 제거
+        first_line = bel_text.partition('\n')[0].splitlines()[0] if bel_text else ''
+        if first_line.strip().isalpha():
+            bel_text = bel_text[len(first_line):]
+
+        bel_values = utils.parse_float_lines(bel_text)
+        if len(bel_values) == 0:
             raise InvalidBELValuesError("잘못된 BEL 값이 입력되었습니다.")
-        
+
         return bel_values
 
-    def validate_and_prepare_data(self):
-        """데이터 유효성을 검사하고 필요한 컬럼을 준비합니다."""
+    def validate_columns(self):
+        """필수 컬럼이 있는지 검사합니다."""
         required_inno_columns = ['POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK', 'LOA_CODE']
         missing_inno_columns = [col for col in required_inno_columns if col not in self.inno_df.columns]
         if missing_inno_columns:
@@ -44,69 +50,110 @@ class BELComparator:
         if missing_pw_columns:
             raise MissingColumnsError(f"Pathwise CSV 파일에 '{', '.join(missing_pw_columns)}' 컬럼이 없습니다.")
 
+    def validate_and_prepare_data(self):
+        """데이터 유효성을 검사하고 필요한 컬럼을 준비합니다."""
+        self.validate_columns()
+
         # BEL 값의 개수가 inno_df의 행 개수보다 적으면 NaN으로 채움
-        if len(self.bel_values) < len(self.inno_df):
-            self.bel_values.extend([pd.NA] * (len(self.inno_df) - len(self.bel_values)))
+        bel_values = np.asarray(self.bel_values, dtype=np.float64)
+        if len(bel_values) < len(self.inno_df):
+            bel_values = np.concatenate([bel_values, np.full(len(self.inno_df) - len(bel_values), np.nan)])
 
         # BEL 값의 개수가 많으면 잘라냄
-        self.bel_values = self.bel_values[:len(self.inno_df)]
+        self.bel_values = bel_values[:len(self.inno_df)]
 
         self.inno_df.columns = [col.upper() for col in self.inno_df.columns]
         self.pw_df.columns = [col.upper() for col in self.pw_df.columns]
         self.inno_df['INNOLINC_BEL'] = self.bel_values
 
-    def calculate_index(self, row):
-        """주어진 행에서 일치하는 인덱스를 계산합니다."""
-        matching_indices = self.inno_df.index[
-            (self.inno_df['POL_NO'] == row['POL_NO']) &
-            (self.inno_df['RIDER_PRD_CODE'] == row['RIDER_PRD_CODE']) &
-            (self.inno_df['INIT_V_CHECK'] == row['INIT_V_CHECK']) &
-            (self.inno_df['LOA_CODE'] == row['LOA_CODE'])
-        ]
-        return matching_indices[0] if not matching_indices.empty else None
-
-    def format_column(self, value):
-        """열의 값을 포맷팅합니다."""
-        return f"{value:.6f}" if pd.notna(value) else ""
-
-    def format_diff_column(self, value):
-        """DIFF 열의 값을 포맷팅합니다."""
-        return f"{value:.6f}" if pd.notna(value) else 'NaN'
-
-    def compare_bel(self):
-        """Innolink와 Pathwise 데이터를 비교하여 결과를 반환합니다."""
+    def calculate_index(self, encoding, inno_first_rows, merged_keys, progress=None):
+        """키 조회 테이블을 이용해 각 행과 일치하는 Innolink 인덱스를 계산합니다. (없으면 NA)"""
+        progress = ensure_reporter(progress)
+        key_index = build_key_index(encoding.keys[1], inno_first_rows, self.inno_df.index.to_numpy())
+
+        total_rows = len(merged_keys)
+        index = np.zeros(total_rows, dtype=np.int64)
+        found = np.zeros(total_rows, dtype=bool)
+        for start in range(0, total_rows, INDEX_CHUNKSIZE):
+            end = min(start + INDEX_CHUNKSIZE, total_rows)
+            index[start:end], found[start:end] = lookup_index(key_index, merged_keys[start:end])
+            progress.update(STAGE_INDEX, end, total_rows)
+        return pd.arrays.IntegerArray(index, ~found)
+
+    def diagnose_keys(self, encoding, groups):
+        """키 그룹별 Pathwise/Innolink 행 수로 중복 키와 한쪽에만 있는 키를 진단합니다."""
+        labels = self.inno_df.index.to_numpy()
+
+        def describe(group_ids):
+            pw_rows, inno_rows = group_first_rows(groups, group_ids)
+            column_codes = {
+                col: (merged_codes(encoding.columns[col][0], pw_rows, inno_rows), encoding.columns[col][1])
+                for col in KEY_COLUMNS
+            }
+            return diagnostics.key_frame(column_codes, take_rows(labels, inno_rows, -1))
+
+        return diagnostics.diagnose_keys(groups.left_count, groups.right_count, describe)
+
+    def compare_bel(self, progress=None):
+        """Innolink와 Pathwise 데이터를 비교하여 숫자형 결과를 반환합니다."""
+        progress = ensure_reporter(progress)
         try:
-            # Innolink 데이터와 Pathwise 데이터를 병합합니다.
-            merged_df = pd.merge(
-                self.pw_df,
-                self.inno_df[['POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK', 'LOA_CODE', 'INNOLINC_BEL']],
-                on=['POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK', 'LOA_CODE'],
-                how='outer'
-            )
-
-            # Pathwise BEL 값이 없는 행을 필터링하여 제거합니다.
-            merged_df = merged_df[merged_df['BEL'].notna()]
+            progress.update(STAGE_MERGE, 0, len(self.pw_df))
+
+            with progress.measure(STAGE_MERGE) as stage:
+                # 정책 키 네 컬럼을 int64 코드 하나로 인코딩하여 Innolink 데이터와 Pathwise 데이터를 병합합니다.
+                encoding = encode_keys([self.pw_df, self.inno_df])
+                if self.inno_key_order is not None:
+                    inno_order = self.inno_key_order.order
+                else:
+                    inno_order = np.argsort(encoding.keys[1], kind='stable')
+                groups = group_keys(encoding.keys[0], encoding.keys[1], inno_order)
+
+                # 병합 행으로 펼치기 전에 키 그룹별 행 수로 중복 키와 한쪽에만 있는 키를 진단합니다.
+                with progress.measure(STAGE_DIAGNOSTICS) as diagnostics_stage:
+                    self.key_diagnostics = self.diagnose_keys(encoding, groups)
+                    diagnostics_stage['rows'] = self.key_diagnostics.key_count
+                pw_rows, inno_rows = expand_groups(groups)
+                if self.inno_key_order is not None:
+                    inno_first_rows = self.inno_key_order.first_rows
+                else:
+                    inno_first_rows = right_first_rows(groups, encoding.valid[1])
+                del groups, inno_order  # 큰 파일에서 최대 메모리를 줄이기 위해 바로 해제
+                self.merged_row_count = len(pw_rows)
+                merged_keys = merged_codes(encoding.keys, pw_rows, inno_rows)
+
+                # Pathwise BEL 값이 없는 행을 필터링하여 제거합니다. (ROW는 필터링 전 병합 행 번호)
+                pw_bel = self.pw_df['BEL'].to_numpy(dtype=np.float64, na_value=np.nan)
+                answer_bel = take_rows(pw_bel, pw_rows, np.nan)
+                selected = np.flatnonzero(~np.isnan(answer_bel))
+                pw_rows, inno_rows, answer_bel = pw_rows[selected], inno_rows[selected], answer_bel[selected]
+                merged_keys = merged_keys[selected]
+                stage['rows'] = self.merged_row_count
+            progress.update(STAGE_MERGE, len(selected), len(selected))
 
             # BEL 비교 및 기타 계산을 수행합니다.
-            merged_df['DIFF'] = merged_df['BEL'] - merged_df['INNOLINC_BEL']
-            merged_df['INDEX'] = merged_df.apply(self.calculate_index, axis=1)
-            merged_df['ROW'] = merged_df.index
-
-            # NaN 처리 및 포맷팅
-            merged_df['INDEX'] = merged_df['INDEX'].apply(lambda x: int(x) if pd.notnull(x) else 'NaN')
-            merged_df['POL_NO'] = merged_df['POL_NO'].astype(str)
-            merged_df['RIDER_PRD_CODE'] = merged_df['RIDER_PRD_CODE'].astype(str)
-            merged_df['PATHWISE_BEL'] = merged_df['BEL'].apply(self.format_column)
-            merged_df['INNOLINC_BEL'] = merged_df['INNOLINC_BEL'].apply(self.format_column)
-            merged_df['DIFF'] = merged_df['DIFF'].apply(self.format_diff_column)
+            input_bel = take_rows(self.inno_df['INNOLINC_BEL'].to_numpy(dtype=np.float64), inno_rows, np.nan)
+            with progress.measure(STAGE_INDEX) as stage:
+                index = self.calculate_index(encoding, inno_first_rows, merged_keys, progress)
+                stage['rows'] = len(selected)
+
+            # 결과 타입 지정 (INDEX는 nullable 정수, 정책 키는 사전 코드에서 복원한 범주형)
+            columns = {}
+            for col in ['POL_NO', 'RIDER_PRD_CODE', 'LOA_CODE']:
+                frame_codes, uniques = encoding.columns[col]
+                columns[col] = decode_categorical(merged_codes(frame_codes, pw_rows, inno_rows), uniques)
+            self.loa_code = columns['LOA_CODE']
 
             # 최종 결과를 반환합니다.
-            result = merged_df[['ROW', 'INDEX', 'POL_NO', 'RIDER_PRD_CODE', 'PATHWISE_BEL', 'INNOLINC_BEL', 'DIFF']].rename(
-                columns={
-                    'PATHWISE_BEL': 'ANSWER_BEL',
-                    'INNOLINC_BEL': 'INPUT_BEL',
-                }
-            )            
+            result = pd.DataFrame({
+                'ROW': selected,
+                'INDEX': index,
+                'POL_NO': columns['POL_NO'],
+                'RIDER_PRD_CODE': columns['RIDER_PRD_CODE'],
+                'ANSWER_BEL': answer_bel,
+                'INPUT_BEL': input_bel,
+                'DIFF': answer_bel - input_bel,
+            }, index=selected)
             return result
         except Exception as e:
             raise e
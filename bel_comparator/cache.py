@@ -0,0 +1,260 @@
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+try:
+    import pyarrow.feather as feather  # 선택 의존성: 없으면 캐시를 사용하지 않음
+except ImportError:
+    feather = None
+
+try:
+    import fcntl  # POSIX 파일 잠금
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt  # Windows 파일 잠금
+except ImportError:
+    msvcrt = None
+
+# 캐시 형식 버전 (로더의 dtype 규칙이 바뀌면 올려서 기존 캐시를 무효화)
+CACHE_VERSION = 1
+# 캐시 최대 용량 기본값 (MB)
+DEFAULT_CACHE_MAX_MB = 2048
+INDEX_FILE_NAME = 'index.json'
+# 인덱스를 갱신하는 동안 잡는 잠금 파일
+LOCK_FILE_NAME = 'index.lock'
+# 캐시 항목 파일 확장자
+ENTRY_SUFFIXES = ('.feather', '.npy')
+
+def is_available():
+    """pyarrow가 설치되어 캐시를 사용할 수 있는지 반환하는 함수"""
+    return feather is not None
+
+def get_cache_dir():
+    """캐시 디렉터리 경로를 반환하는 함수 (BEL_COMPARATOR_CACHE_DIR 환경 변수로 변경 가능)"""
+    cache_dir = os.environ.get('BEL_COMPARATOR_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    if sys.platform == 'win32':
+        base_dir = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        base_dir = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base_dir, 'bel_comparator')
+
+def get_cache_max_bytes():
+    """캐시 최대 용량을 바이트 단위로 반환하는 함수 (BEL_COMPARATOR_CACHE_MAX_MB 환경 변수로 변경 가능)"""
+    max_mb = os.environ.get('BEL_COMPARATOR_CACHE_MAX_MB')
+    return int((float(max_mb) if max_mb else DEFAULT_CACHE_MAX_MB) * 1024 * 1024)
+
+def load_index(cache_dir):
+    """캐시 인덱스(항목별 크기/최근 사용 시각, 파일 메타데이터별 내용 해시)를 읽는 함수"""
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE_NAME), encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    index.setdefault('entries', {})
+    index.setdefault('fingerprints', {})
+    return index
+
+@contextlib.contextmanager
+def index_lock(cache_dir):
+    """여러 프로세스(병렬 로더, 배치 워커)가 인덱스를 동시에 갱신하지 않도록 잠금 파일을 잠그는 컨텍스트 관리자"""
+    with open(os.path.join(cache_dir, LOCK_FILE_NAME), 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # 약 10초 동안 재시도한 뒤 OSError
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def save_index(cache_dir, index):
+    """캐시 인덱스를 임시 파일에 쓴 뒤 교체하여 저장하는 함수"""
+    path = os.path.join(cache_dir, INDEX_FILE_NAME)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(temp_path, path)
+
+def hash_file(file_name, block_size=4 * 1024 * 1024):
+    """파일 내용의 BLAKE2b 해시를 계산하는 함수"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_name, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_fingerprint(file_name, index):
+    """경로, 크기, 수정 시각이 같으면 저장된 해시를 재사용하여 파일의 내용 해시를 반환하는 함수"""
+    stat = os.stat(file_name)
+    metadata_key = f"{os.path.abspath(file_name)}|{stat.st_size}|{stat.st_mtime_ns}"
+    content_hash = index['fingerprints'].get(metadata_key)
+    if content_hash is None:
+        content_hash = hash_file(file_name)
+        index['fingerprints'][metadata_key] = content_hash
+    return content_hash
+
+def array_entry_name(content_hash, kind):
+    """내용 해시와 배열 종류로 배열 캐시 파일 이름을 만드는 함수"""
+    return f"v{CACHE_VERSION}_{content_hash}_{kind}.npy"
+
+def entry_name(content_hash, usecols):
+    """내용 해시와 읽을 컬럼 목록으로 캐시 파일 이름을 만드는 함수"""
+    columns_key = ','.join(sorted(col.upper() for col in usecols)) if usecols is not None else '*'
+    columns_hash = hashlib.blake2b(columns_key.encode('utf-8'), digest_size=8).hexdigest()
+    return f"v{CACHE_VERSION}_{content_hash}_{columns_hash}.feather"
+
+def evict(cache_dir, index, max_bytes):
+    """캐시 총 용량이 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목부터 삭제하는 함수
+
+    인덱스에 기록되지 않은 캐시 파일(저장 도중 종료된 프로세스 등)도 디렉터리를 훑어 수정 시각을 사용 시각으로 포함합니다.
+    """
+    entries = index['entries']
+    on_disk = {name for name in os.listdir(cache_dir) if name.endswith(ENTRY_SUFFIXES)}
+    for name in set(entries) - on_disk:
+        del entries[name]
+    for name in on_disk - set(entries):
+        try:
+            stat = os.stat(os.path.join(cache_dir, name))
+        except OSError:
+            continue
+        entries[name] = {'size': stat.st_size, 'last_access': stat.st_mtime}
+
+    total_bytes = sum(entry['size'] for entry in entries.values())
+    for name in sorted(entries, key=lambda name: entries[name]['last_access']):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError:
+            pass
+        total_bytes -= entries.pop(name)['size']
+
+    # 남아 있는 항목의 해시만 파일 메타데이터 목록에 유지
+    live_hashes = {name.split('_')[1] for name in entries}
+    index['fingerprints'] = {key: value for key, value in index['fingerprints'].items() if value in live_hashes}
+
+def record_access(cache_dir, fingerprints, name, new_entry=None):
+    """잠금을 잡고 최신 인덱스를 다시 읽어 항목의 사용 시각을 기록하고 저장하는 함수
+
+    new_entry(크기, 원본 경로)가 주어지면 새 항목으로 추가한 뒤 용량 한도에 맞게 오래된 항목을 삭제합니다.
+    다른 프로세스가 그사이 추가한 항목을 덮어쓰지 않도록 읽은 시점의 인덱스가 아니라 잠금 안에서 다시 읽은 인덱스를 갱신합니다.
+    """
+    with index_lock(cache_dir):
+        index = load_index(cache_dir)
+        index['fingerprints'].update(fingerprints)
+        if new_entry is not None:
+            index['entries'][name] = dict(new_entry, last_access=time.time())
+            evict(cache_dir, index, get_cache_max_bytes())
+        elif name in index['entries']:
+            index['entries'][name]['last_access'] = time.time()
+        save_index(cache_dir, index)
+
+def load_cached(file_name, usecols, loader):
+    """캐시에 같은 내용의 파일이 있으면 메모리 매핑으로 읽고, 없으면 loader()로 읽어 캐시에 저장하는 함수
+
+    캐시에는 컬럼명을 대문자로 바꾸고 dtype을 정한 DataFrame이 Feather(Arrow IPC) 형식으로 저장되며,
+    pyarrow가 없거나 캐시 디렉터리를 쓸 수 없으면 loader()의 결과를 그대로 반환합니다.
+    """
+    if not is_available():
+        return loader()
+
+    cache_dir = get_cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        index = load_index(cache_dir)
+        name = entry_name(file_fingerprint(file_name, index), usecols)
+        path = os.path.join(cache_dir, name)
+    except OSError:
+        return loader()
+
+    if name in index['entries'] and os.path.exists(path):
+        try:
+            df = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+            record_access(cache_dir, index['fingerprints'], name)
+            return df
+        except Exception:
+            pass  # 손상된 캐시 항목은 다시 생성
+
+    df = loader()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(df, temp_path, compression='uncompressed')  # 메모리 매핑을 위해 비압축 저장
+        os.replace(temp_path, path)
+        record_access(cache_dir, index['fingerprints'], name,
+                      {'size': os.path.getsize(path), 'source': os.path.abspath(file_name)})
+    except Exception:
+        # 캐시 저장 실패는 로드 결과에 영향을 주지 않음
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return df
+
+def load_cached_array(file_name, kind, builder):
+    """캐시에 같은 내용의 파일로 만든 kind 배열이 있으면 메모리 매핑으로 읽고, 없으면 builder()로 만들어 저장하는 함수
+
+    줄 위치 색인처럼 파일 내용에서 계산하는 NumPy 배열을 .npy 형식으로 저장하므로 pyarrow가 없어도 사용할 수 있습니다.
+    """
+    cache_dir = get_cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        index = load_index(cache_dir)
+        name = array_entry_name(file_fingerprint(file_name, index), kind)
+        path = os.path.join(cache_dir, name)
+    except OSError:
+        return builder()
+
+    if name in index['entries'] and os.path.exists(path):
+        try:
+            values = np.load(path, mmap_mode='r')
+            record_access(cache_dir, index['fingerprints'], name)
+            return values
+        except Exception:
+            pass  # 손상된 캐시 항목은 다시 생성
+
+    values = builder()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(temp_path, path)
+        record_access(cache_dir, index['fingerprints'], name,
+                      {'size': os.path.getsize(path), 'source': os.path.abspath(file_name)})
+    except Exception:
+        # 캐시 저장 실패는 결과에 영향을 주지 않음
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return values
+
+def clear_cache():
+    """캐시 디렉터리의 모든 항목을 삭제하고 삭제한 항목 수를 반환하는 함수"""
+    cache_dir = get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith(ENTRY_SUFFIXES + ('.tmp',)) or name == INDEX_FILE_NAME:
+            os.remove(os.path.join(cache_dir, name))
+            removed += name.endswith(ENTRY_SUFFIXES)
+    return removed
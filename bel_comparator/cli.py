@@ -0,0 +1,302 @@
+import argparse
+import os
+import sys
+from contextlib import nullcontext
+
+import numpy as np
+import bel_comparator.aggregation as aggregation
+import bel_comparator.batch as batch
+import bel_comparator.cache as cache
+import bel_comparator.utils as utils
+import bel_comparator.data_processing as data_processing
+import bel_comparator.diagnostics as diagnostics
+import bel_comparator.export as export
+import bel_comparator.instrumentation as instrumentation
+import bel_comparator.parallel as parallel
+import bel_comparator.result_store as result_store
+import bel_comparator.run_diff as run_diff
+import bel_comparator.streaming as streaming
+import bel_comparator.tolerance_sweep as tolerance_sweep
+from bel_comparator.custom_exceptions import InvalidBELValuesError, InvalidInputError, MissingColumnsError
+from bel_comparator.progress import (
+    ProgressReporter, STAGE_FILTER, STAGE_ERROR_COUNT, STAGE_SUMMARY, STAGE_SWEEP, STAGE_EXPORT, STAGE_STORE, ensure_reporter
+)
+
+DEFAULT_ADJUSTMENT_FACTOR = 0.001
+
+def build_parser():
+    """명령행 인자 파서를 생성하는 함수"""
+    parser = argparse.ArgumentParser(
+        prog='python -m bel_comparator',
+        description='GUI 없이 First/Second CSV 파일의 BEL 값을 비교합니다.'
+    )
+    parser.add_argument('first_csv', nargs='?', help='First(Innolink) CSV 파일 경로')
+    parser.add_argument('second_csv', nargs='?',
+                        help='Second(Pathwise) CSV 파일 경로 (--batch에서는 디렉터리 또는 따옴표로 감싼 glob 패턴도 가능)')
+    parser.add_argument('bel_file', nargs='?', help='BEL 값 파일 경로 (한 줄에 하나, 첫 줄 헤더 허용)')
+    parser.add_argument('-o', '--output', help='결과 파일 경로 (--batch에서는 결과 디렉터리)')
+    parser.add_argument('--format', choices=list(export.EXPORT_FORMATS), default=None,
+                        help='결과 파일 형식 (기본값: 확장자로 판단, .gz/.zst/.parquet 외에는 csv)')
+    parser.add_argument('--start', default='', help='데이터 범위 시작 (기본값: 0)')
+    parser.add_argument('--end', default='', help='데이터 범위 종료 (기본값: 최대값)')
+    parser.add_argument('--tolerance', default='', help=f'허용오차 (기본값: {DEFAULT_ADJUSTMENT_FACTOR})')
+    parser.add_argument('--view', choices=['all', 'diff'], default='all', help='전체조회(all) 또는 오차조회(diff)')
+    parser.add_argument('--exclude-na', action='store_true', help='N/A 제외')
+    parser.add_argument('--chunksize', type=int, default=None, help='CSV 로드 시 chunksize (기본값: 사용 가능한 메모리로 계산)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'CSV 파싱과 비교에 사용할 프로세스 수 (기본값: 1, 이 시스템의 코어 수: {parallel.default_worker_count()})')
+    parser.add_argument('--diagnostics', default=None, metavar='DIR',
+                        help='중복 키, 한쪽 파일에만 있는 키 보고서와 요약(병합 팬아웃 포함)을 DIR에 저장 (--streaming, --batch와 함께 사용 불가)')
+    parser.add_argument('--summary', default=None, metavar='DIR',
+                        help='결과 행의 전체, LOA_CODE별, RIDER_PRD_CODE별 통계(에러 수, N/A 수, 평균/최대 |DIFF|, 상대 오차, '
+                             f'DIFF 히스토그램)를 DIR에 저장 (요약 표와 {aggregation.SUMMARY_FILE_NAME}, --streaming, --batch와 함께 사용 불가)')
+    parser.add_argument('--sweep', nargs='?', const=tolerance_sweep.DEFAULT_SWEEP, default=None, metavar='TOLERANCES',
+                        help='허용오차별 에러 수(N/A 포함/제외) 표를 출력. 쉼표로 구분한 값 또는 시작:종료:간격 범위 '
+                             f'(생략 시 {tolerance_sweep.DEFAULT_SWEEP}, --streaming, --batch와 함께 사용 불가)')
+    parser.add_argument('--sweep-output', default=None, metavar='FILE',
+                        help='허용오차 스윕 표를 FILE에 저장 (형식은 확장자로 결정)')
+    parser.add_argument('--range-keys-only', action='store_true',
+                        help='Second 행 중 --start/--end 범위 안 First 행과 키가 같은 행만 비교 (범위 밖 Second 전용 행 제외, '
+                             '--streaming, --batch와 함께 사용 불가)')
+    parser.add_argument('--batch', action='store_true',
+                        help=f'First CSV 하나를 여러 Second CSV와 비교하여 파일별 결과와 요약({batch.SUMMARY_FILE_NAME})을 결과 디렉터리에 저장')
+    parser.add_argument('--streaming', action='store_true', help='파일을 디스크 파티션으로 나누어 제한된 메모리로 비교')
+    parser.add_argument('--memory-limit', type=int, default=streaming.DEFAULT_MEMORY_LIMIT_MB,
+                        help=f'스트리밍 모드의 메모리 한도 MB (기본값: {streaming.DEFAULT_MEMORY_LIMIT_MB}, '
+                             '같은 POL_NO의 행은 한 파티션에 들어가므로 한 POL_NO의 행이 한도보다 많으면 넘을 수 있음)')
+    parser.add_argument('--work-dir', default=None, help='스트리밍 모드의 임시 파티션 디렉터리 (기본값: 시스템 임시 디렉터리)')
+    parser.add_argument('--no-cache', action='store_true', help='로드한 CSV의 컬럼형 캐시를 사용하지 않음')
+    parser.add_argument('--metrics', nargs='?', const='-', default=None, metavar='FILE',
+                        help='단계별 소요 시간/CPU 시간/행 수/RSS 변화량을 JSON lines로 기록 (FILE 생략 시 표준 에러)')
+    parser.add_argument('--profile', default=None, metavar='FILE', help='비교 실행을 cProfile로 프로파일링하여 pstats 파일로 저장')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help=f'컬럼형 캐시를 모두 삭제하고 종료 (캐시 위치: {cache.get_cache_dir()})')
+    parser.add_argument('--store', action='store_true',
+                        help='비교 결과와 입력 정보를 결과 저장소에 저장하여 GUI에서 다시 열 수 있게 함 '
+                             '(pyarrow 필요, --streaming, --batch와 함께 사용 불가)')
+    parser.add_argument('--list-runs', action='store_true',
+                        help=f'결과 저장소에 저장된 비교 실행 목록을 출력하고 종료 (저장 위치: {result_store.get_store_dir()})')
+    parser.add_argument('--diff-runs', nargs=2, default=None, metavar=('OLD', 'NEW'),
+                        help='두 비교 실행(결과 파일 또는 저장된 실행 ID)을 키로 맞추어 새로 실패/통과한 행, DIFF 변화, '
+                             '한쪽에만 있는 행 보고서와 요약(%s)을 -o 디렉터리에 저장 (--tolerance, --exclude-na, '
+                             '--memory-limit, --work-dir, --format 사용)' % run_diff.SUMMARY_FILE_NAME)
+    return parser
+
+def log_to_console(message):
+    """표준 에러로 로그 메시지를 출력하는 함수"""
+    print(message, file=sys.stderr)
+
+def open_metrics_stream(path):
+    """단계 기록을 쓸 스트림을 여는 함수 ('-'이면 표준 에러, None이면 기록하지 않음)"""
+    if path is None:
+        return nullcontext(None)
+    if path == '-':
+        return nullcontext(sys.stderr)
+    return open(path, 'w', encoding='utf-8')
+
+def run(args, progress=None):
+    """인자에 따라 BEL 비교를 수행하고 결과 파일과 요약 정보를 출력하는 함수"""
+    progress = ensure_reporter(progress)
+    if args.diff_runs:
+        return run_diff_runs(args, progress)
+    bel_input_text = utils.read_text_file(args.bel_file).strip()
+    if not bel_input_text:
+        log_to_console("BEL 값을 입력하세요.")
+        return 1
+
+    if args.batch:
+        return run_batch(args, bel_input_text, progress)
+    if args.streaming:
+        return run_streaming(args, bel_input_text, progress)
+
+    chunksize = args.chunksize
+    if chunksize is None:
+        chunksize, _ = utils.calculate_dynamic_chunksize(0, None)
+    tolerances = tolerance_sweep.parse_tolerances(args.sweep) if args.sweep else None
+
+    comparison = data_processing.run_comparison(
+        args.first_csv,
+        args.second_csv,
+        bel_input_text,
+        args.start.strip(),
+        args.end.strip(),
+        args.tolerance.strip(),
+        DEFAULT_ADJUSTMENT_FACTOR,
+        chunksize,
+        log_to_console,
+        progress=progress,
+        workers=max(args.workers, 1),
+        use_cache=not args.no_cache,
+        range_keys_only=args.range_keys_only
+    )
+    if comparison is None:
+        return 1
+
+    result, adjustment_factor = comparison.result, comparison.adjustment_factor
+    for line in diagnostics.format_summary(comparison.key_diagnostics):
+        log_to_console(line)
+    if args.diagnostics:
+        diagnostics.write_reports(comparison.key_diagnostics, args.diagnostics, args.format)
+        log_to_console(f"키 진단 보고서 저장 완료: {args.diagnostics}")
+
+    with progress.measure(STAGE_FILTER) as stage:
+        diff = data_processing.diff_array(result)
+        filtered_rows = np.flatnonzero(data_processing.filter_mask(diff, args.view == 'diff', args.exclude_na, adjustment_factor))
+        stage['rows'] = len(filtered_rows)
+    with progress.measure(STAGE_ERROR_COUNT) as stage:
+        error_count = data_processing.count_errors(diff[filtered_rows], adjustment_factor, args.exclude_na)
+        stage['rows'] = len(filtered_rows)
+    if args.summary:
+        with progress.measure(STAGE_SUMMARY) as stage:
+            summary = aggregation.summarize_result(result, comparison.loa_code, adjustment_factor, args.exclude_na, filtered_rows)
+            aggregation.write_summary(summary, args.summary, args.format)
+            stage['rows'] = len(filtered_rows)
+        for line in aggregation.format_summary(summary):
+            log_to_console(line)
+        log_to_console(f"요약 통계 저장 완료: {args.summary}")
+    sweep = None
+    if tolerances is not None:
+        # 허용오차와 관계없이 같은 행을 대상으로 하도록 조회 방식 필터 전의 전체 결과로 계산
+        with progress.measure(STAGE_SWEEP) as stage:
+            sweep = tolerance_sweep.sweep_error_counts(tolerance_sweep.sort_diff(diff), tolerances)
+            stage['rows'] = len(diff)
+        if args.sweep_output:
+            export.export_result(sweep, args.sweep_output)
+            log_to_console(f"허용오차 스윕 저장 완료: {args.sweep_output}")
+    if args.store:
+        with progress.measure(STAGE_STORE) as stage:
+            run_id = result_store.save_run(comparison, result_store.RunInputs(
+                args.first_csv, args.second_csv, f"BEL 파일: {os.path.abspath(args.bel_file)}", bel_input_text,
+                args.start.strip(), args.end.strip()
+            ))
+            stage['rows'] = len(result)
+        log_to_console(f"결과 저장 완료: {run_id}")
+    with progress.measure(STAGE_EXPORT) as stage:
+        stage['rows'] = export.export_result(result, args.output, filtered_rows, args.format, progress)
+    log_to_console(f"결과 파일로 내보내기 완료: {args.output}")
+
+    print(f"Pathwise Count: {comparison.pw_count}")
+    print(f"Innolink Count: {comparison.inno_count}")
+    print(f"Result Rows: {len(filtered_rows)}")
+    print(f"Errors: {error_count}")
+    if sweep is not None:
+        print(sweep.to_string(index=False))
+    return 0
+
+def run_streaming(args, bel_input_text, progress=None):
+    """스트리밍 모드로 BEL 비교를 수행하고 요약 정보를 출력하는 함수"""
+    comparison = streaming.run_streaming_comparison(
+        args.first_csv,
+        args.second_csv,
+        bel_input_text,
+        args.start.strip(),
+        args.end.strip(),
+        args.tolerance.strip(),
+        DEFAULT_ADJUSTMENT_FACTOR,
+        args.output,
+        args.view == 'diff',
+        args.exclude_na,
+        log_to_console,
+        memory_limit_mb=args.memory_limit,
+        work_dir=args.work_dir,
+        progress=progress,
+        export_format=args.format
+    )
+    log_to_console(f"결과 파일로 내보내기 완료: {args.output}")
+
+    print(f"Pathwise Count: {comparison.pw_count}")
+    print(f"Innolink Count: {comparison.inno_count}")
+    print(f"Result Rows: {comparison.result_rows}")
+    print(f"Errors: {comparison.error_count}")
+    return 0
+
+def run_batch(args, bel_input_text, progress=None):
+    """배치 모드로 여러 Second CSV 파일을 비교하고 요약 표를 출력하는 함수"""
+    chunksize = args.chunksize
+    if chunksize is None:
+        chunksize, _ = utils.calculate_dynamic_chunksize(0, None)
+
+    comparison = batch.run_batch_comparison(
+        args.first_csv,
+        batch.resolve_second_paths(args.second_csv),
+        bel_input_text,
+        args.start.strip(),
+        args.end.strip(),
+        args.tolerance.strip(),
+        DEFAULT_ADJUSTMENT_FACTOR,
+        args.output,
+        args.view == 'diff',
+        args.exclude_na,
+        chunksize,
+        log_to_console,
+        progress=progress,
+        workers=max(args.workers, 1),
+        export_format=args.format,
+        use_cache=not args.no_cache
+    )
+    log_to_console(f"배치 요약 저장 완료: {comparison.summary_path}")
+
+    print(f"Innolink Count: {comparison.inno_count}")
+    print(batch.summary_frame(comparison.summaries).drop(columns=['OUTPUT']).to_string(index=False))
+    return 1 if any(summary.error is not None for summary in comparison.summaries) else 0
+
+def run_diff_runs(args, progress=None):
+    """두 비교 실행의 차이 보고서를 저장하고 요약 정보를 출력하는 함수"""
+    adjustment_factor = data_processing.parse_adjustment_factor(args.tolerance.strip(), DEFAULT_ADJUSTMENT_FACTOR)
+    diff_result = run_diff.run_diff(
+        args.diff_runs[0],
+        args.diff_runs[1],
+        args.output,
+        adjustment_factor,
+        args.exclude_na,
+        log_to_console,
+        memory_limit_mb=args.memory_limit,
+        work_dir=args.work_dir,
+        progress=progress,
+        export_format=args.format
+    )
+    log_to_console(f"실행 비교 보고서 저장 완료: {args.output}")
+
+    for line in run_diff.format_summary(diff_result):
+        print(line)
+    return 0
+
+def main(argv=None):
+    """CLI 진입점"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.clear_cache:
+        log_to_console(f"캐시 삭제 완료: {cache.clear_cache()}개 항목")
+        return 0
+    if args.list_runs:
+        print(result_store.runs_frame(result_store.list_runs()).to_string(index=False))
+        return 0
+    if args.diff_runs and not args.output:
+        parser.error('--diff-runs에는 -o/--output 결과 디렉터리가 필요합니다.')
+    if not args.diff_runs and not (args.first_csv and args.second_csv and args.bel_file and args.output):
+        parser.error('first_csv, second_csv, bel_file, -o/--output 인자가 필요합니다.')
+    if args.diagnostics and (args.streaming or args.batch):
+        parser.error('--diagnostics는 --streaming, --batch와 함께 사용할 수 없습니다.')
+    if args.summary and (args.streaming or args.batch):
+        parser.error('--summary는 --streaming, --batch와 함께 사용할 수 없습니다.')
+    if args.range_keys_only and (args.streaming or args.batch):
+        parser.error('--range-keys-only는 --streaming, --batch와 함께 사용할 수 없습니다.')
+    if args.sweep_output and not args.sweep:
+        args.sweep = tolerance_sweep.DEFAULT_SWEEP
+    if args.sweep and (args.streaming or args.batch):
+        parser.error('--sweep은 --streaming, --batch와 함께 사용할 수 없습니다.')
+    if args.store and (args.streaming or args.batch):
+        parser.error('--store는 --streaming, --batch와 함께 사용할 수 없습니다.')
+    if args.store and not result_store.is_available():
+        parser.error('--store에는 pyarrow가 필요합니다.')
+
+    try:
+        with open_metrics_stream(args.metrics) as stream, instrumentation.profile_to(args.profile):
+            metrics = instrumentation.Instrumentation(instrumentation.json_lines_sink(stream)) if stream else None
+            return run(args, ProgressReporter(metrics=metrics))
+    except (InvalidInputError, InvalidBELValuesError, MissingColumnsError) as e:
+        log_to_console(f"오류 발생: {str(e)}")
+        return 1
+    except Exception as e:
+        log_to_console(f"예기치 않은 오류 발생: {str(e)}")
+        return 1
@@ -5,3 +5,11 @@ class MissingColumnsError(Exception):
 class InvalidBELValuesError(Exception):
     """잘못된 BEL 값이 입력되었을 때 발생하는 예외"""
     pass
+
+class InvalidInputError(Exception):
+    """데이터 범위나 허용오차 등 입력 값이 올바르지 않을 때 발생하는 예외"""
+    pass
+
+class ComparisonCancelledError(Exception):
+    """사용자가 비교 작업을 취소했을 때 발생하는 예외"""
+    pass
@@ -1,23 +1,46 @@
+from collections import namedtuple
+
+import numpy as np
 import pandas as pd
 from bel_comparator import BELComparator
-from bel_comparator.custom_exceptions import MissingColumnsError, InvalidBELValuesError
+from bel_comparator.custom_exceptions import (
+    MissingColumnsError, InvalidBELValuesError, InvalidInputError, ComparisonCancelledError
+)
+from bel_comparator.key_index import KEY_COLUMNS
+from bel_comparator.progress import STAGE_LOAD_FIRST, STAGE_LOAD_SECOND, STAGE_VALIDATE, STAGE_BUCKET, ensure_reporter
+import bel_comparator.parallel as parallel
+import bel_comparator.range_loader as range_loader
 import bel_comparator.utils as utils
 
-def compare_bel(inno_df, pw_df, bel_values, progress_bar, log_to_console):
-    """Innolink와 Pathwise 데이터를 비교하여 결과를 반환하는 함수"""
-    try:
-        comparator = BELComparator(inno_df, pw_df, bel_values)
-        comparator.validate_and_prepare_data()
+# 전체 비교 파이프라인의 실행 결과
+#   key_diagnostics: 중복 키, 한쪽에만 있는 키, 병합 팬아웃 진단 결과 (KeyDiagnostics)
+#   loa_code: 결과 행별 LOA_CODE (범주형, 요약 통계에 사용)
+ComparisonRun = namedtuple('ComparisonRun', ['result', 'inno_count', 'pw_count', 'adjustment_factor', 'key_diagnostics', 'loa_code'])
 
-        progress_bar.setMaximum(len(pw_df))
-        progress_bar.setValue(0)
+def compare_bel(inno_df, pw_df, bel_values, progress, log_to_console, executor=None, workers=1):
+    """Innolink와 Pathwise 데이터를 비교하여 (결과, 키 진단, 결과 행별 LOA_CODE)를 반환하는 함수 (progress는 ProgressReporter 또는 None)
 
-        result = comparator.compare_bel()
+    executor(프로세스 풀)가 주어지면 POL_NO 범위 파티션별로 나누어 workers개의 프로세스에서 비교합니다.
+    """
+    progress = ensure_reporter(progress)
+    try:
+        if executor is not None:
+            with progress.measure(STAGE_BUCKET) as stage:
+                comparison = parallel.compare_parallel(inno_df, pw_df, bel_values, executor, workers, progress)
+                stage['rows'] = len(comparison[0])
+            return comparison
 
-        for row_idx in range(len(result)):
-            progress_bar.setValue(row_idx + 1)
+        comparator = BELComparator(inno_df, pw_df, bel_values)
+        progress.update(STAGE_VALIDATE, 0, 1)
+        with progress.measure(STAGE_VALIDATE) as stage:
+            comparator.validate_and_prepare_data()
+            stage['rows'] = len(inno_df)
+        progress.update(STAGE_VALIDATE, 1, 1)
 
-        return result
+        result = comparator.compare_bel(progress)
+        return result, comparator.key_diagnostics, comparator.loa_code
+    except ComparisonCancelledError:
+        raise
     except (MissingColumnsError, InvalidBELValuesError) as e:
         log_to_console(f"오류 발생: {str(e)}")
         return None
@@ -25,23 +48,166 @@ def compare_bel(inno_df, pw_df, bel_values, progress_bar, log_to_console):
         log_to_console(f"예기치 않은 오류 발생: {str(e)}")
         return None
 
+def run_comparison(inno_csv_path, pw_csv_path, bel_input_text, start_str, end_str,
+                   adjustment_factor_str, default_adjustment_factor, chunksize, log_to_console, progress=None,
+                   workers=1, use_cache=True, range_keys_only=False):
+    """CSV 로드, 범위/허용오차 검증, BEL 비교까지 전체 파이프라인을 실행하는 함수
+
+    workers가 2 이상이면 CSV 파싱과 비교를 프로세스 풀에서 병렬로 수행합니다.
+    use_cache가 True이면 이전에 읽은 파일은 컬럼형 캐시에서 바로 읽습니다.
+    range_keys_only가 True이면 Second 행 중 범위 안 First 행과 키가 같은 행만 비교합니다.
+    비교에 실패하면 None을, 성공하면 ComparisonRun을 반환합니다.
+    """
+    if workers > 1:
+        with parallel.create_executor(workers) as executor:
+            return run_comparison_with_executor(
+                inno_csv_path, pw_csv_path, bel_input_text, start_str, end_str, adjustment_factor_str,
+                default_adjustment_factor, chunksize, log_to_console, progress, executor, workers, use_cache,
+                range_keys_only
+            )
+    return run_comparison_with_executor(
+        inno_csv_path, pw_csv_path, bel_input_text, start_str, end_str, adjustment_factor_str,
+        default_adjustment_factor, chunksize, log_to_console, progress, None, 1, use_cache, range_keys_only
+    )
+
+def run_comparison_with_executor(inno_csv_path, pw_csv_path, bel_input_text, start_str, end_str,
+                                 adjustment_factor_str, default_adjustment_factor, chunksize, log_to_console,
+                                 progress, executor, workers, use_cache=True, range_keys_only=False):
+    """run_comparison의 본체 (executor가 None이면 단일 프로세스로 실행)"""
+    progress = ensure_reporter(progress)
+    with progress.measure(STAGE_LOAD_FIRST) as stage:
+        inno_df = load_first_range(inno_csv_path, start_str, end_str, chunksize, progress, executor, workers, use_cache)
+        stage['rows'] = len(inno_df)
+    log_to_console(f"Innolink CSV 파일 로드 완료: {inno_csv_path}")
+    with progress.measure(STAGE_LOAD_SECOND) as stage:
+        pw_df = load_input_csv(pw_csv_path, chunksize, progress, STAGE_LOAD_SECOND, KEY_COLUMNS + ['BEL'], executor, workers, use_cache)
+        stage['rows'] = len(pw_df)
+    log_to_console(f"Pathwise CSV 파일 로드 완료: {pw_csv_path}")
+
+    bel_values = BELComparator.parse_bel_values(bel_input_text)
+    pw_count = len(pw_df)
+    if range_keys_only:
+        with progress.measure(STAGE_VALIDATE):
+            BELComparator(inno_df, pw_df, []).validate_columns()
+            pw_df = range_loader.filter_to_keys(pw_df, inno_df)
+        log_to_console(f"범위 키 필터링 완료: Second {pw_count:,}행 중 {len(pw_df):,}행")
+
+    # 허용오차 값 읽기 및 유효성 검사
+    adjustment_factor = parse_adjustment_factor(adjustment_factor_str, default_adjustment_factor)
+
+    comparison = compare_bel(inno_df, pw_df, bel_values, progress, log_to_console, executor, workers)
+    if comparison is None:
+        return None
+    result, key_diagnostics, loa_code = comparison
+    return ComparisonRun(result, len(inno_df), pw_count, adjustment_factor, key_diagnostics, loa_code)
+
+def load_first_range(inno_csv_path, start_str, end_str, chunksize, progress, executor=None, workers=1, use_cache=True):
+    """First CSV에서 데이터 범위 [start, end]의 키 컬럼을 읽는 함수 (인덱스는 파일 내 행 번호)
+
+    범위가 지정되면 메모리 매핑한 파일의 줄 위치 색인(캐시에 저장)으로 범위 안의 줄만 파싱하고
+    전체 파일 기준 컬럼 dtype(캐시에 저장)으로 맞추므로, 처음 한 번 이후에는 파일 크기와 관계없이 범위 길이에
+    비례하는 시간이 걸립니다. 따옴표나 빈 줄이 있는 파일과 캐시를 쓰지 않을 때(색인과 dtype을 매번 전체 파일에서
+    다시 구해야 하므로)는 전체를 읽어 자릅니다.
+    """
+    if (start_str or end_str) and use_cache:
+        line_starts = range_loader.load_line_starts(inno_csv_path, use_cache)
+        if range_loader.is_usable(line_starts):
+            start, end = resolve_range(start_str, end_str, range_loader.row_count(line_starts))
+            dtypes = range_loader.load_column_dtypes(inno_csv_path, KEY_COLUMNS, chunksize, use_cache)
+            inno_df = range_loader.read_row_window(inno_csv_path, line_starts, start, end, KEY_COLUMNS, dtypes)
+            if inno_df is not None:
+                progress.update(STAGE_LOAD_FIRST, len(inno_df), len(inno_df))
+                return inno_df
+
+    # 데이터 범위 입력 값 검증 및 데이터 프레임 자르기
+    inno_df = load_input_csv(inno_csv_path, chunksize, progress, STAGE_LOAD_FIRST, KEY_COLUMNS, executor, workers, use_cache)
+    start, end = resolve_range(start_str, end_str, len(inno_df))
+    return inno_df.iloc[start:end + 1]
+
+def load_input_csv(file_name, chunksize, progress, stage, usecols, executor, workers, use_cache=True):
+    """executor 유무에 따라 CSV 파일을 단일 프로세스 또는 병렬로 로드하는 함수"""
+    if executor is None:
+        return utils.load_csv_with_chunksize(file_name, chunksize, progress, stage, usecols, use_cache)
+
+    progress.update(stage, 0, 0)
+    df = parallel.load_csv_parallel(file_name, executor, workers, usecols, use_cache)
+    progress.update(stage, len(df), len(df))
+    return df
+
+def resolve_range(start_str, end_str, total_rows):
+    """데이터 범위 입력 값을 검증하여 (start, end) 튜플을 반환하는 함수"""
+    # 기본값 설정
+    start = 0
+    end = total_rows
+
+    # start 값 검증 및 설정
+    if start_str:
+        if not start_str.isdigit():
+            raise InvalidInputError("시작 값은 정수여야 합니다.")
+        start = int(start_str)
+        if start < 0:
+            raise InvalidInputError("시작 값은 0 이상이어야 합니다.")
+
+    # end 값 검증 및 설정
+    if end_str:
+        if not end_str.isdigit():
+            raise InvalidInputError("종료 값은 정수여야 합니다.")
+        end = min(int(end_str), total_rows)  # 최대 값으로 제한
+        if end < start:
+            raise InvalidInputError("종료 값은 시작 값보다 크거나 같아야 합니다.")
+
+    return start, end
+
+def parse_adjustment_factor(adjustment_factor_str, default):
+    """허용오차 입력 값을 검증하여 반환하는 함수 (입력이 없으면 기본값 사용)"""
+    if not adjustment_factor_str:
+        return default
+
+    adjustment_factor = float(adjustment_factor_str)
+    if adjustment_factor < 0.000001 or adjustment_factor > 1:
+        raise InvalidInputError("허용오차는 0.000001 이상 1 이하의 값이어야 합니다.")
+    return adjustment_factor
+
+def diff_array(result):
+    """결과의 DIFF 컬럼을 float64 NumPy 배열로 반환하는 함수"""
+    return pd.to_numeric(result['DIFF'], errors='coerce').to_numpy(dtype=np.float64)
+
+def filter_mask(diff, diff_only, exclude_na, adjustment_factor):
+    """조회 방식(전체/오차)과 N/A 제외 여부에 따른 행 선택 마스크를 계산하는 함수"""
+    is_na = np.isnan(diff)
+    mask = np.ones(len(diff), dtype=bool)
+
+    if diff_only:
+        # NaN 비교는 항상 False이므로 N/A 행은 is_na로 따로 포함
+        with np.errstate(invalid='ignore'):
+            mask &= is_na | (np.abs(diff) >= adjustment_factor)
+
+    if exclude_na:
+        mask &= ~is_na
+
+    return mask
+
+def filter_result(result, mask):
+    """마스크(또는 행 위치 배열)에 해당하는 행만 남긴 결과를 반환하는 함수"""
+    # 배열 Index 재설정
+    return result.iloc[mask].reset_index(drop=True)
+
+def error_mask(diff, adjustment_factor, exclude_na):
+    """DIFF 배열에서 에러로 간주하는 행의 마스크를 계산하는 함수"""
+    with np.errstate(invalid='ignore'):
+        over_tolerance = np.abs(diff) > adjustment_factor
+
+    if exclude_na:
+        # N/A 제외가 체크된 경우, NaN이 아닌 값 중 허용오차 초과만 오류로 간주
+        return over_tolerance
+
+    # N/A 제외가 체크되지 않은 경우, NaN도 오류로 간주
+    return over_tolerance | np.isnan(diff)
+
+def count_errors(diff, adjustment_factor, exclude_na):
+    """DIFF 배열에서 허용오차를 초과하는 에러 개수를 계산하는 함수"""
+    return int(np.count_nonzero(error_mask(diff, adjustment_factor, exclude_na)))
+
 def calculate_error_count(result, adjustment_factor, exclude_na):
     """에러 카운트를 계산하는 함수"""
-    error_count = 0
-    for _, row in result.iterrows():
-        try:
-            diff_value = abs(float(row['DIFF'])) if utils.is_valid_float(row['DIFF']) else None
-
-            if exclude_na:
-                # N/A 제외가 체크된 경우, NaN 또는 'NaN' 문자열이 아닌 경우에만 오류로 간주
-                if diff_value is not None and diff_value > adjustment_factor:
-                    error_count += 1
-            else:
-                # N/A 제외가 체크되지 않은 경우, NaN 또는 'NaN' 문자열 포함하여 오류로 간주
-                if (row['DIFF'] == 'NaN') or pd.isna(row['DIFF']) or (diff_value is not None and diff_value > adjustment_factor):
-                    error_count += 1
-
-        except ValueError:
-            error_count += 1
-    
-    return error_count
+    return count_errors(diff_array(result), adjustment_factor, exclude_na)
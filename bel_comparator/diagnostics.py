@@ -0,0 +1,121 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from bel_comparator.key_index import KEY_COLUMNS, decode_categorical
+import bel_comparator.export as export
+
+# 진단 보고서 이름과 화면/로그에 보여줄 설명
+DIAGNOSTIC_REPORTS = {
+    'first_duplicates': 'First 중복 키',
+    'second_duplicates': 'Second 중복 키',
+    'first_only': 'First에만 있는 키',
+    'second_only': 'Second에만 있는 키',
+}
+# 진단 요약 파일 이름
+SUMMARY_FILE_NAME = 'key_diagnostics.json'
+
+# 키 진단 결과
+#   first_duplicates, second_duplicates, first_only, second_only: 키 컬럼과 FIRST_COUNT, SECOND_COUNT,
+#     FIRST_INDEX(비교 결과의 INDEX로 쓰인 First 첫 행)를 담은 보고서 DataFrame (키 순서)
+#   key_count: 병합한 고유 키 수, merged_rows: BEL 필터링 전 병합 결과의 행 수
+KeyDiagnostics = namedtuple('KeyDiagnostics', [
+    'first_duplicates', 'second_duplicates', 'first_only', 'second_only', 'key_count', 'merged_rows'
+])
+
+def key_frame(column_codes, first_index):
+    """컬럼별 (사전 코드 배열, 정렬된 고유값)과 First 첫 행 번호(없으면 -1)로 보고서의 키 값 DataFrame을 만드는 함수"""
+    frame = pd.DataFrame({col: decode_categorical(codes, uniques) for col, (codes, uniques) in column_codes.items()})
+    frame['FIRST_INDEX'] = pd.arrays.IntegerArray(np.where(first_index < 0, 0, first_index).astype(np.int64), first_index < 0)
+    return frame
+
+def diagnose_keys(second_counts, first_counts, describe):
+    """키 그룹별 Second/First 행 수로 중복 키, 한쪽에만 있는 키, 병합 팬아웃을 계산하는 함수
+
+    행 수 배열에 대한 마스크 연산만 하고 보고서에 들어갈 그룹만 describe(그룹 번호 배열)로 키 값(key_frame)을 복원하므로
+    비용은 키 수에 비례합니다. 두 행 수가 모두 0인 그룹(범위 밖 First 키)은 제외합니다.
+    """
+    def report(mask):
+        groups = np.flatnonzero(mask)
+        frame = describe(groups)
+        frame['FIRST_COUNT'] = first_counts[groups]
+        frame['SECOND_COUNT'] = second_counts[groups]
+        return frame
+
+    # 한쪽에만 있는 키는 반대쪽을 빈 행 하나로 보고 병합 행 수(곱집합 크기)를 계산
+    present = (second_counts > 0) | (first_counts > 0)
+    sizes = np.maximum(second_counts, 1)
+    sizes *= np.maximum(first_counts, 1)
+    merged_rows = int(np.sum(sizes, where=present))
+    del sizes
+    return KeyDiagnostics(
+        report(first_counts > 1),
+        report(second_counts > 1),
+        report((first_counts > 0) & (second_counts == 0)),
+        report((second_counts > 0) & (first_counts == 0)),
+        int(np.count_nonzero(present)),
+        merged_rows,
+    )
+
+def fanout_factor(diagnostics):
+    """병합 팬아웃 (키당 평균 병합 행 수, 모든 키가 양쪽에 한 행씩이면 1.0)을 반환하는 함수"""
+    return diagnostics.merged_rows / diagnostics.key_count if diagnostics.key_count else 1.0
+
+def combine_diagnostics(parts):
+    """POL_NO 범위 파티션별 진단 결과를 파티션 순서대로 합치는 함수"""
+    reports = {}
+    for name in DIAGNOSTIC_REPORTS:
+        frames = [getattr(part, name) for part in parts]
+        for frame in frames:
+            for col in KEY_COLUMNS:
+                frame[col] = frame[col].astype(frame[col].cat.categories.dtype)
+        combined = pd.concat(frames, ignore_index=True)
+        for col in KEY_COLUMNS:
+            combined[col] = combined[col].astype('category')
+        reports[name] = combined
+    return KeyDiagnostics(
+        **reports,
+        key_count=sum(part.key_count for part in parts),
+        merged_rows=sum(part.merged_rows for part in parts),
+    )
+
+def summary_record(diagnostics):
+    """진단 결과의 보고서별 키 수와 행 수, 팬아웃을 dict로 반환하는 함수"""
+    record = {'key_count': diagnostics.key_count, 'merged_rows': diagnostics.merged_rows,
+              'fanout_factor': round(fanout_factor(diagnostics), 6)}
+    for name in DIAGNOSTIC_REPORTS:
+        report = getattr(diagnostics, name)
+        record[name] = {
+            'keys': len(report),
+            'first_rows': int(report['FIRST_COUNT'].sum()),
+            'second_rows': int(report['SECOND_COUNT'].sum()),
+        }
+    return record
+
+def format_summary(diagnostics):
+    """진단 결과를 콘솔에 출력할 요약 줄 목록으로 변환하는 함수"""
+    lines = [f"키 진단 (키 {diagnostics.key_count:,}개, 병합 {diagnostics.merged_rows:,}행, "
+             f"팬아웃 {fanout_factor(diagnostics):.4f}):"]
+    for name, label in DIAGNOSTIC_REPORTS.items():
+        report = getattr(diagnostics, name)
+        lines.append(f"  {label}: {len(report):,}개 "
+                     f"(First {int(report['FIRST_COUNT'].sum()):,}행, Second {int(report['SECOND_COUNT'].sum()):,}행)")
+    return lines
+
+def write_reports(diagnostics, directory, export_format=None):
+    """보고서별 파일과 요약 JSON을 directory에 쓰고 쓴 파일 경로 목록을 반환하는 함수"""
+    os.makedirs(directory, exist_ok=True)
+    extension = export.EXPORT_FORMATS[export_format or export.FORMAT_CSV][1]
+    paths = []
+    for name in DIAGNOSTIC_REPORTS:
+        path = os.path.join(directory, f"{name}{extension}")
+        export.export_result(getattr(diagnostics, name), path, export_format=export_format)
+        paths.append(path)
+
+    summary_path = os.path.join(directory, SUMMARY_FILE_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary_record(diagnostics), f, ensure_ascii=False, indent=2)
+    paths.append(summary_path)
+    return paths
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# 소수점 형식으로 표시할 BEL 컬럼과 DIFF 컬럼 (실행 비교 보고서의 이전/새 실행 컬럼 포함)
+BEL_COLUMNS = ['ANSWER_BEL', 'INPUT_BEL', 'OLD_ANSWER_BEL', 'NEW_ANSWER_BEL', 'OLD_INPUT_BEL', 'NEW_INPUT_BEL']
+DIFF_COLUMNS = ['DIFF', 'OLD_DIFF', 'NEW_DIFF', 'DIFF_DELTA']
+# NA가 있을 수 있는 정수 컬럼
+NULLABLE_INT_COLUMNS = ['INDEX', 'OLD_ROW', 'NEW_ROW']
+
+def format_float(values, na_rep):
+    """float 배열을 소수점 6자리 문자열 배열로 변환하는 함수 (NaN은 na_rep로 표시)"""
+    values = np.asarray(values, dtype=np.float64)
+    # np.char.mod보다 파이썬 리스트에서 문자열 포맷팅하는 편이 빠름
+    formatted = np.array(['%.6f' % value for value in values.tolist()], dtype=object)
+    formatted[np.isnan(values)] = na_rep
+    return formatted
+
+def format_int(values, na_rep='NaN'):
+    """nullable 정수 컬럼을 문자열 배열로 변환하는 함수 (NA는 na_rep로 표시)"""
+    values = pd.Series(values)
+    is_na = values.isna().to_numpy()
+    formatted = values.fillna(0).astype(np.int64).astype(str).to_numpy(dtype=object)
+    formatted[is_na] = na_rep
+    return formatted
+
+def format_text(values, na_rep='NaN'):
+    """키 등 범주형/문자열 컬럼을 문자열 배열로 변환하는 함수 (NaN은 결과 표와 같이 na_rep로 표시)"""
+    values = pd.Series(values)
+    is_na = values.isna().to_numpy()
+    formatted = values.astype(str).to_numpy(dtype=object)
+    formatted[is_na] = na_rep
+    return formatted
+
+def format_result(result, bel_na_rep='', diff_na_rep='NaN'):
+    """숫자형 비교 결과를 표시/내보내기용 문자열 DataFrame으로 변환하는 함수"""
+    formatted = {}
+    for col in result.columns:
+        if col in BEL_COLUMNS:
+            formatted[col] = format_float(result[col], bel_na_rep)
+        elif col in DIFF_COLUMNS:
+            formatted[col] = format_float(result[col], diff_na_rep)
+        elif col in NULLABLE_INT_COLUMNS:
+            formatted[col] = format_int(result[col])
+        else:
+            formatted[col] = format_text(result[col])
+    return pd.DataFrame(formatted, index=result.index)
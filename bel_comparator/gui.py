@@ -1,13 +1,46 @@
-import pandas as pd
-pd.set_option('future.no_silent_downcasting', True)
+import os
 
-from PyQt5.QtWidgets import QWidget, QFileDialog, QAbstractItemView, QTableWidgetItem
-from PyQt5.QtCore import Qt
+import numpy as np
+from PyQt5.QtWidgets import QWidget, QFileDialog, QAbstractItemView, QApplication
+from PyQt5.QtCore import Qt, QThread, QTimer
 from PyQt5.QtGui import QFontMetrics
 import bel_comparator.ui_setup as ui_setup  # UI 설정 모듈
-import bel_comparator.utils as utils  # 유틸리티 함수 모듈
-import bel_comparator.data_processing as data_processing  # 데이터 처리 모듈
-from bel_comparator import BELComparator  # BELComparator 클래스 임포트
+import bel_comparator.instrumentation as instrumentation  # 단계별 측정 모듈
+import bel_comparator.lazy as lazy
+from bel_comparator.custom_exceptions import InvalidInputError
+from bel_comparator.progress import (
+    STAGE_LABELS, STAGE_FILTER, STAGE_ERROR_COUNT, STAGE_SUMMARY, STAGE_SWEEP, STAGE_RENDER, STAGE_OPEN_RUN
+)
+
+# pandas와 비교 엔진, 데이터 로더는 창이 뜬 뒤 백그라운드에서 미리 불러오고, 그 전에 사용하면 그때 불러옴
+utils = lazy.LazyModule('bel_comparator.utils')  # 유틸리티 함수 모듈
+aggregation = lazy.LazyModule('bel_comparator.aggregation')  # 요약 통계 모듈
+data_processing = lazy.LazyModule('bel_comparator.data_processing')  # 데이터 처리 모듈
+diagnostics = lazy.LazyModule('bel_comparator.diagnostics')  # 키 진단 모듈
+export = lazy.LazyModule('bel_comparator.export')  # 결과 내보내기 모듈
+result_store = lazy.LazyModule('bel_comparator.result_store')  # 비교 결과 저장소
+session = lazy.LazyModule('bel_comparator.session')  # 재비교용 로드/키 정렬 상태
+tolerance_sweep = lazy.LazyModule('bel_comparator.tolerance_sweep')  # 허용오차 스윕 모듈
+worker = lazy.LazyModule('bel_comparator.worker')  # 백그라운드 비교/내보내기 워커
+
+def load_engine_modules():
+    """비교 엔진 모듈을 불러오는 함수 (창 표시 후 백그라운드 스레드에서 실행)
+
+    PyInstaller가 이름만으로 지정한 모듈도 함께 묶도록 import 문으로 불러옵니다.
+    불러오기에 실패하면 무시하고, 모듈을 처음 사용할 때 다시 불러오며 오류를 알립니다.
+    """
+    try:
+        import bel_comparator.utils  # noqa: F401
+        import bel_comparator.data_processing  # noqa: F401
+        import bel_comparator.session  # noqa: F401
+        import bel_comparator.aggregation  # noqa: F401
+        import bel_comparator.diagnostics  # noqa: F401
+        import bel_comparator.export  # noqa: F401
+        import bel_comparator.tolerance_sweep  # noqa: F401
+        import bel_comparator.result_store  # noqa: F401
+        import bel_comparator.worker  # noqa: F401
+    except Exception:
+        pass
 
 class BELComparatorApp(QWidget):
     def __init__(self):
@@ -18,14 +51,33 @@ class BELComparatorApp(QWidget):
         self.last_memory_check_time = 0
         self.cached_chunksize = None
         self.original_result_df = None  # 원본 결과 저장용
-        self.filtered_result_df = None  # 필터링된 결과 저장용
+        self.filtered_rows = None  # 필터링된 결과의 행 위치 배열
+        self.original_diff = None  # 원본 결과의 DIFF float64 배열
+        self.key_diagnostics = None  # 마지막 비교의 키 진단 결과
+        self.original_loa_code = None  # 원본 결과의 행별 LOA_CODE (범주형)
+        self.result_summary = None  # 현재 조회 중인 결과의 요약 통계 (ResultSummary)
+        self.sorted_diff = None  # 허용오차 스윕용으로 정렬한 원본 결과의 |DIFF| (SortedDiff, 첫 스윕 때 계산)
+        self.tolerance_sweep = None  # 마지막 허용오차 스윕 표
         self.adjustment_factor = 0.001
+        self.worker = None  # 백그라운드 비교 워커
+        self.worker_thread = None
+        self.export_worker = None  # 백그라운드 내보내기 워커
+        self.export_thread = None
+        self.metrics = instrumentation.Instrumentation()  # 마지막 비교의 단계별 측정 결과
+        self.loaded_bel_text = None  # 파일/클립보드에서 불러온 BEL 텍스트 (입력란에 표시하지 않음)
+        self.loaded_bel_source = None  # 불러온 BEL 텍스트의 출처 (결과 저장소에 기록)
+        self.session = None  # 파일이 바뀌지 않으면 로드/병합 결과를 재사용 (ComparisonSession, 첫 비교 시 생성)
         ui_setup.init_ui(self)
 
+        # 이벤트 루프가 시작되어 창이 그려진 뒤 무거운 모듈을 백그라운드에서 불러옴
+        QTimer.singleShot(0, lambda: lazy.warm_up(load_engine_modules))
+
         # 라디오 버튼 및 체크박스 클릭 시 필터링 함수 연결
         self.all_radio.clicked.connect(self.apply_filter)
         self.diff_radio.clicked.connect(self.apply_filter)
         self.na_checkbox.clicked.connect(self.apply_filter)
+        # 허용오차만 바뀐 경우 비교 없이 필터만 다시 적용
+        self.adjustment_input.editingFinished.connect(self.apply_adjustment_factor)
 
     def center(self):
         ui_setup.center(self)
@@ -49,165 +101,401 @@ class BELComparatorApp(QWidget):
             self.cached_chunksize, self.last_memory_check_time = utils.calculate_dynamic_chunksize(
                 self.last_memory_check_time, self.cached_chunksize)
 
+    def load_bel_file(self):
+        """BEL 값 파일을 입력란을 거치지 않고 불러오는 함수"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Select BEL File", "", "CSV Files (*.csv);;Text Files (*.txt);;All Files (*)")
+        if file_name:
+            try:
+                self.set_loaded_bel_text(utils.read_text_file(file_name), f"BEL 파일: {file_name}")
+            except (OSError, UnicodeDecodeError) as e:
+                self.log_to_console(f"BEL 파일 읽기 오류: {str(e)}")
+
+    def load_bel_clipboard(self):
+        """클립보드의 BEL 값을 입력란을 거치지 않고 불러오는 함수"""
+        text = QApplication.clipboard().text()
+        if not text.strip():
+            self.log_to_console("클립보드에 BEL 값이 없습니다.")
+            return
+        self.set_loaded_bel_text(text, "클립보드")
+
+    def set_loaded_bel_text(self, text, source):
+        """불러온 BEL 텍스트를 보관하고 입력란에는 출처와 줄 수만 표시하는 함수"""
+        self.bel_input.clear()
+        self.loaded_bel_text = text
+        self.loaded_bel_source = source
+        line_count = text.strip().count('\n') + 1 if text.strip() else 0
+        self.bel_input.setPlaceholderText(f"{source} ({line_count}줄) - 직접 입력하면 불러온 값 대신 사용됩니다.")
+        self.log_to_console(f"BEL 값 불러오기 완료: {source} ({line_count}줄)")
+
+    def on_bel_input_changed(self):
+        """입력란에 값을 직접 입력하면 불러온 BEL 텍스트를 해제하는 함수"""
+        if self.loaded_bel_text is not None and self.bel_input.toPlainText().strip():
+            self.loaded_bel_text = None
+            self.bel_input.setPlaceholderText("")
+
     def apply_filter(self):
         """라디오 버튼 및 체크박스 상태에 따라 결과를 필터링하여 표시"""
         if self.original_result_df is None:
             self.log_to_console("BEL 비교를 먼저 실행하세요.")
             return
-        
-        # 초기화
-        self.filtered_result_df = self.original_result_df.copy()              
-        
-        # 필터링 작업 (전체조회, 오차조회, N/A 제외)
-        if self.diff_radio.isChecked():
-            self.log_to_console("오차조회 선택됨.")
-            self.filtered_result_df = self.filtered_result_df[self.filtered_result_df['DIFF'].apply(
-                lambda x: x == 'NaN' or (utils.is_valid_float(x) and abs(float(x)) >= self.adjustment_factor)
-            )]
-        else:
-            self.log_to_console("전체조회 선택됨.")
-
-        if self.na_checkbox.isChecked():
-            self.log_to_console("N/A 제외 선택됨.")
-            self.filtered_result_df = self.filtered_result_df[self.filtered_result_df['DIFF'] != 'NaN']
-        
-        # 배열 Index 재설정
-        self.filtered_result_df = self.filtered_result_df.fillna('NaN')
-        self.filtered_result_df = self.filtered_result_df.infer_objects(copy=False)
-        self.filtered_result_df = self.filtered_result_df.reset_index(drop=True)
-
-        # 에러 카운트를 계산
-        error_count = data_processing.calculate_error_count(
-            self.filtered_result_df,
-            self.adjustment_factor,
-            self.na_checkbox.isChecked()
-        )
-
-        # 에러 카운트를 업데이트
-        self.error_count_label.setText(f"Errors: {error_count}")
-
-        # 필터링된 결과를 테이블에 표시
-        self.update_result_table(self.filtered_result_df)
-
-    def update_result_table(self, result):
-        """결과를 테이블에 업데이트하는 함수"""
-        self.result_table.clear()
-        self.result_table.setRowCount(len(result))
-        self.result_table.setColumnCount(len(result.columns))
-        self.result_table.setHorizontalHeaderLabels(result.columns)
-
-        font_metrics = QFontMetrics(self.result_table.font())
-
-        for row_idx, row in result.iterrows():
-            for col_idx, value in enumerate(row):
-                if value == '' or pd.isna(value):
-                    value = 'NaN'
-                item = QTableWidgetItem(str(value))
-                self.result_table.setItem(row_idx, col_idx, item)
-                width = font_metrics.width(str(value)) + 10
-                self.result_table.setColumnWidth(col_idx, max(self.result_table.columnWidth(col_idx), width))
+
+        try:
+            # 필터링 작업 (전체조회, 오차조회, N/A 제외)
+            if self.diff_radio.isChecked():
+                self.log_to_console("오차조회 선택됨.")
+            else:
+                self.log_to_console("전체조회 선택됨.")
+
+            if self.na_checkbox.isChecked():
+                self.log_to_console("N/A 제외 선택됨.")
+
+            with self.metrics.measure(STAGE_FILTER) as stage:
+                mask = data_processing.filter_mask(
+                    self.original_diff,
+                    self.diff_radio.isChecked(),
+                    self.na_checkbox.isChecked(),
+                    self.adjustment_factor
+                )
+                self.filtered_rows = np.flatnonzero(mask)
+                stage['rows'] = len(self.filtered_rows)
+
+            # 에러 카운트를 계산
+            with self.metrics.measure(STAGE_ERROR_COUNT) as stage:
+                error_count = data_processing.count_errors(
+                    self.original_diff[mask],
+                    self.adjustment_factor,
+                    self.na_checkbox.isChecked()
+                )
+                stage['rows'] = len(self.filtered_rows)
+
+            # 에러 카운트를 업데이트
+            self.error_count_label.setText(f"Errors: {error_count}")
+
+            # 조회 중인 행의 LOA_CODE별, RIDER_PRD_CODE별 요약 통계를 다시 계산
+            with self.metrics.measure(STAGE_SUMMARY) as stage:
+                self.show_result_summary(aggregation.summarize_result(
+                    self.original_result_df, self.original_loa_code, self.adjustment_factor,
+                    self.na_checkbox.isChecked(), self.filtered_rows
+                ))
+                stage['rows'] = len(self.filtered_rows)
+
+            # 필터링된 결과를 테이블에 표시
+            self.update_result_table(self.filtered_rows)
+        except Exception as e:
+            self.log_to_console(f"예기치 않은 오류 발생: {str(e)}")
+
+    def apply_adjustment_factor(self):
+        """입력된 허용오차로 마스크와 에러 카운트만 다시 계산하는 함수"""
+        if self.original_result_df is None or self.worker_thread is not None:
+            return
+
+        try:
+            adjustment_factor = data_processing.parse_adjustment_factor(
+                self.adjustment_input.text().strip(), self.adjustment_factor)
+        except (InvalidInputError, ValueError) as e:
+            self.log_to_console(f"허용오차 입력 오류: {str(e)}")
+            return
+
+        if adjustment_factor != self.adjustment_factor:
+            self.adjustment_factor = adjustment_factor
+            self.log_to_console(f"허용오차 변경: {adjustment_factor}")
+            self.apply_filter()
+
+    def apply_tolerance_sweep(self):
+        """입력한 허용오차 목록의 에러 수(N/A 포함/제외) 표를 스윕 탭에 표시하는 함수 (|DIFF|는 비교 결과마다 한 번만 정렬)"""
+        if self.original_diff is None:
+            self.log_to_console("BEL 비교를 먼저 실행하세요.")
+            return
+
+        try:
+            tolerances = tolerance_sweep.parse_tolerances(self.sweep_input.text().strip() or tolerance_sweep.DEFAULT_SWEEP)
+        except InvalidInputError as e:
+            self.log_to_console(f"허용오차 스윕 입력 오류: {str(e)}")
+            return
+
+        with self.metrics.measure(STAGE_SWEEP) as stage:
+            if self.sorted_diff is None:
+                self.sorted_diff = tolerance_sweep.sort_diff(self.original_diff)
+            self.tolerance_sweep = tolerance_sweep.sweep_error_counts(self.sorted_diff, tolerances)
+            stage['rows'] = len(self.original_diff)
+        self.show_report(self.sweep_table, self.tolerance_sweep, "허용오차 스윕", self.sweep_tab)
+
+    def update_result_table(self, rows):
+        """필터링된 행 위치 배열을 테이블 모델에 반영하는 함수"""
+        with self.metrics.measure(STAGE_RENDER) as stage:
+            self.result_model.set_rows(rows)
+
+            # 열 너비는 샘플 행으로 추정
+            font_metrics = QFontMetrics(self.result_table.font())
+            for col_idx, width in enumerate(self.result_model.estimate_column_widths(font_metrics)):
+                self.result_table.setColumnWidth(col_idx, width)
+            stage['rows'] = len(rows)
 
     def compare_bel(self):
         try:
+            if self.worker_thread is not None:
+                self.log_to_console("이미 BEL 비교가 진행 중입니다.")
+                return
+
             # BEL 비교를 시작할 때 콘솔 창 클리어
             self.console_output.clear()
-            
-            if self.inno_csv_path:
-                self.inno_df = utils.load_csv_with_chunksize(self.inno_csv_path, self.cached_chunksize)
-                self.log_to_console(f"Innolink CSV 파일 로드 완료: {self.inno_csv_path}")
-            else:
+
+            if not self.inno_csv_path:
                 self.log_to_console("Innolink CSV 파일 경로가 지정되지 않았습니다.")
                 return
 
-            if self.pw_csv_path:
-                self.pw_df = utils.load_csv_with_chunksize(self.pw_csv_path, self.cached_chunksize)
-                self.log_to_console(f"Pathwise CSV 파일 로드 완료: {self.pw_csv_path}")
-            else:
+            if not self.pw_csv_path:
                 self.log_to_console("Pathwise CSV 파일 경로가 지정되지 않았습니다.")
                 return
 
-            bel_input_text = self.bel_input.toPlainText().strip()
+            typed_bel_text = self.bel_input.toPlainText().strip()
+            bel_input_text = typed_bel_text or (self.loaded_bel_text or '').strip()
             if not bel_input_text:
                 self.log_to_console("BEL 값을 입력하세요.")
                 return
-            
-            # 데이터 범위 입력 값 검증 및 설정
-            start_str = self.start_input.text().strip()
-            end_str = self.end_input.text().strip()
-
-            # 기본값 설정
-            start = 0
-            end = len(self.inno_df)
-
-            # start 값 검증 및 설정
-            if start_str:
-                if start_str.isdigit():
-                    start = int(start_str)
-                    if start < 0:
-                        self.log_to_console("시작 값은 0 이상이어야 합니다.")
-                        return
-                else:
-                    self.log_to_console("시작 값은 정수여야 합니다.")
-                    return
 
-            # end 값 검증 및 설정
-            if end_str:
-                if end_str.isdigit():
-                    end = int(end_str)
-                    if end > len(self.inno_df):
-                        end = len(self.inno_df)  # 최대 값으로 설정
-                    if end < start:
-                        self.log_to_console("종료 값은 시작 값보다 크거나 같아야 합니다.")
-                        return
-                else:
-                    self.log_to_console("종료 값은 정수여야 합니다.")
-                    return
+            # 로드부터 비교까지의 파이프라인은 백그라운드 스레드에서 실행
+            self.metrics = instrumentation.Instrumentation()
+            comparison_args = {
+                'inno_csv_path': self.inno_csv_path,
+                'pw_csv_path': self.pw_csv_path,
+                'bel_input_text': bel_input_text,
+                'start_str': self.start_input.text().strip(),
+                'end_str': self.end_input.text().strip(),
+                'adjustment_factor_str': self.adjustment_input.text().strip(),
+                'default_adjustment_factor': self.adjustment_factor,
+                'chunksize': self.cached_chunksize,
+            }
+            if self.range_keys_checkbox.isChecked() and (comparison_args['start_str'] or comparison_args['end_str']):
+                # 범위의 줄만 읽고 Second 행을 범위 키로 거르는 편이 전체 키 정렬을 보관하는 것보다 빠름
+                comparison_session = None
+                comparison_args['range_keys_only'] = True
+            else:
+                if self.session is None:
+                    self.session = session.ComparisonSession()
+                comparison_session = self.session
+            store_inputs = None
+            if self.store_checkbox.isChecked():
+                store_inputs = result_store.RunInputs(
+                    self.inno_csv_path, self.pw_csv_path, "직접 입력" if typed_bel_text else self.loaded_bel_source,
+                    bel_input_text, comparison_args['start_str'], comparison_args['end_str']
+                )
+            self.worker = worker.ComparisonWorker(
+                comparison_args, comparison_session, self.metrics, os.environ.get('BEL_COMPARATOR_PROFILE'), store_inputs
+            )
+            self.worker_thread = QThread(self)
+            self.worker.moveToThread(self.worker_thread)
+            self.worker_thread.started.connect(self.worker.run)
+            self.worker.progress.connect(self.update_progress)
+            self.worker.log.connect(self.log_to_console)
+            self.worker.finished.connect(self.on_comparison_finished)
+            self.worker.finished.connect(self.worker_thread.quit)
+            self.worker_thread.finished.connect(self.worker.deleteLater)
+            self.worker_thread.finished.connect(self.worker_thread.deleteLater)
 
-            # 데이터 프레임 자르기
-            self.inno_df = self.inno_df.iloc[start:end + 1]
-            bel_values = BELComparator.parse_bel_values(bel_input_text)
-            self.inno_df.columns = [col.upper() for col in self.inno_df.columns]
-            self.pw_df.columns = [col.upper() for col in self.pw_df.columns]
-
-            # 허용오차 값 읽기 및 유효성 검사
-            adjustment_factor_str = self.adjustment_input.text().strip()
-            if adjustment_factor_str:
-                self.adjustment_factor = float(adjustment_factor_str)            
-                if self.adjustment_factor < 0.000001 or self.adjustment_factor > 1:
-                    self.log_to_console("허용오차는 0.000001 이상 1 이하의 값이어야 합니다.")
-                    return
+            self.compare_button.setEnabled(False)
+            self.cancel_button.setEnabled(True)
+            self.worker_thread.start()
+        except Exception as e:
+            self.log_to_console(f"예기치 않은 오류 발생: {str(e)}")
 
-            result = data_processing.compare_bel(
-                self.inno_df,
-                self.pw_df,
-                bel_values,
-                self.progress_bar,
-                self.log_to_console
-            )
+    def cancel_comparison(self):
+        """진행 중인 BEL 비교 또는 내보내기의 취소를 요청하는 함수"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.cancel_button.setEnabled(False)
 
-            if result is not None:
-                self.original_result_df = result.copy()
-                self.apply_filter()  # 필터를 바로 적용하여 화면에 표시
+    def update_progress(self, stage, done, total):
+        """워커가 보고한 단계별 진행 상황을 진행 표시줄에 반영하는 함수"""
+        self.progress_bar.setFormat(f"{STAGE_LABELS.get(stage, stage)} %v/%m")
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
 
-                self.pw_count_label.setText(f"Pathwise Count: {len(self.pw_df)}")
-                self.inno_count_label.setText(f"Innolink Count: {len(self.inno_df)}")
+    def on_comparison_finished(self, comparison):
+        """워커의 비교 결과를 화면에 반영하는 함수"""
+        self.worker = None
+        self.worker_thread = None
+        self.compare_button.setEnabled(True)
+        self.cancel_button.setEnabled(self.export_worker is not None)
 
-                self.log_to_console("BEL 비교 완료.")
+        if comparison is None:
+            return
+        self.show_comparison(comparison, "BEL 비교 완료.")
+
+    def show_comparison(self, comparison, message):
+        """비교 결과(ComparisonRun)와 보고서를 화면에 표시하고 message와 단계별 측정 결과를 출력하는 함수"""
+        try:
+            result = comparison.result
+            self.adjustment_factor = comparison.adjustment_factor
+            self.original_result_df = result
+            self.original_diff = data_processing.diff_array(result)
+            self.sorted_diff = None
+            self.original_loa_code = comparison.loa_code
+            if not self.summary_tables:
+                ui_setup.add_report_tabs(self)
+            self.result_model.set_result(result)
+            self.apply_filter()  # 필터를 바로 적용하여 화면에 표시
+            self.apply_tolerance_sweep()
+
+            self.pw_count_label.setText(f"Pathwise Count: {comparison.pw_count}")
+            self.inno_count_label.setText(f"Innolink Count: {comparison.inno_count}")
+            self.show_key_diagnostics(comparison.key_diagnostics)
+
+            self.log_to_console(message)
+            for line in diagnostics.format_summary(comparison.key_diagnostics):
+                self.log_to_console(line)
+            for line in instrumentation.format_summary(self.metrics.records):
+                self.log_to_console(line)
         except Exception as e:
             self.log_to_console(f"예기치 않은 오류 발생: {str(e)}")
 
+    def open_stored_run(self):
+        """결과 저장소의 실행 목록에서 선택한 실행을 다시 비교하지 않고 여는 함수"""
+        if self.worker_thread is not None:
+            self.log_to_console("BEL 비교가 진행 중입니다.")
+            return
+
+        try:
+            while True:
+                runs = result_store.list_runs()
+                if not runs:
+                    self.log_to_console(f"저장된 결과가 없습니다. (저장 위치: {result_store.get_store_dir()})")
+                    return
+                selection = ui_setup.select_stored_run(self, result_store.runs_frame(runs))
+                if selection is None:
+                    return
+                action, position = selection
+                run = runs[position]
+                if action == 'delete':
+                    result_store.delete_run(run)
+                    self.log_to_console(f"저장된 결과 삭제: {run.run_id}")
+                    continue
+                break
+
+            self.metrics = instrumentation.Instrumentation()
+            with self.metrics.measure(STAGE_OPEN_RUN) as stage:
+                comparison = result_store.open_run(run)
+                stage['rows'] = len(comparison.result)
+            self.console_output.clear()
+            metadata = run.metadata
+            self.log_to_console(f"저장된 결과 열기: {run.run_id} ({metadata['created_at']})")
+            self.log_to_console(f"  First: {metadata['first']['path']}, Second: {metadata['second']['path']}")
+            self.log_to_console(f"  BEL: {metadata['bel_source']}, 범위: {metadata['start'] or 0} ~ {metadata['end'] or '최대값'}")
+            self.adjustment_input.setText(f"{comparison.adjustment_factor:g}")
+            self.show_comparison(comparison, "저장된 결과 표시 완료.")
+        except Exception as e:
+            self.log_to_console(f"저장된 결과 열기 오류: {str(e)}")
+
+    def show_report(self, table, report, title, tab=None):
+        """보고서 DataFrame을 탭의 테이블에 표시하고 탭 제목에 행 수를 표시하는 함수 (tab은 테이블이 탭 안에 있을 때의 탭 위젯)"""
+        model = table.model()
+        model.set_result(report)
+        font_metrics = QFontMetrics(table.font())
+        for col_idx, width in enumerate(model.estimate_column_widths(font_metrics)):
+            table.setColumnWidth(col_idx, width)
+        self.result_tabs.setTabText(self.result_tabs.indexOf(tab if tab is not None else table), f"{title} ({len(report):,})")
+
+    def show_result_summary(self, result_summary):
+        """요약 통계를 컬럼별 탭에 표시하는 함수"""
+        self.result_summary = result_summary
+        for col, table in self.summary_tables.items():
+            self.show_report(table, result_summary.groups[col], f"{col}별 요약")
+
+    def show_key_diagnostics(self, key_diagnostics):
+        """키 진단 보고서를 탭별 테이블에 표시하고 탭 제목에 키 수를 표시하는 함수"""
+        self.key_diagnostics = key_diagnostics
+        for name, label in diagnostics.DIAGNOSTIC_REPORTS.items():
+            self.show_report(self.diagnostic_tables[name], getattr(key_diagnostics, name), label)
+
+    def current_report(self):
+        """보고 있는 탭이 요약 통계, 키 진단, 허용오차 스윕 탭이면 해당 보고서 DataFrame을, 아니면 None을 반환하는 함수"""
+        current_table = self.result_tabs.currentWidget()
+        if self.result_summary is not None:
+            for col, table in self.summary_tables.items():
+                if table is current_table:
+                    return self.result_summary.groups[col]
+        if self.key_diagnostics is not None:
+            for name, table in self.diagnostic_tables.items():
+                if table is current_table:
+                    return getattr(self.key_diagnostics, name)
+        if self.tolerance_sweep is not None and current_table is self.sweep_tab:
+            return self.tolerance_sweep
+        return None
+
+    def closeEvent(self, event):
+        """창을 닫을 때 진행 중인 비교 작업을 취소하고 스레드 종료를 기다립니다."""
+        if self.worker_thread is not None:
+            self.worker.cancel()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+        if self.export_thread is not None:
+            self.export_worker.cancel()
+            self.export_thread.quit()
+            self.export_thread.wait()
+        super().closeEvent(event)
+
     def export_csv(self):
+        """현재 조회 중인 결과를 선택한 형식으로 백그라운드에서 내보내는 함수"""
         try:
-            if hasattr(self, 'filtered_result_df') and not self.filtered_result_df.empty:
-                file_name, _ = QFileDialog.getSaveFileName(self, "Export CSV", "", "CSV Files (*.csv);;All Files (*)")
-                if file_name:
-                    self.filtered_result_df.to_csv(file_name, index=False)
-                    self.log_to_console(f"CSV 파일로 내보내기 완료: {file_name}")
+            if self.export_thread is not None:
+                self.log_to_console("이미 내보내기가 진행 중입니다.")
+                return
+
+            # 요약 통계, 키 진단, 허용오차 스윕 탭을 보고 있으면 해당 보고서 전체를, 아니면 현재 조회 중인 비교 결과를 내보냄
+            if self.result_tabs.currentWidget() is not self.result_table:
+                result, rows = self.current_report(), None
+                if result is None:
+                    self.log_to_console("내보낼 데이터가 없습니다. 먼저 BEL 비교를 실행하세요.")
+                    return
             else:
-                self.log_to_console("내보낼 데이터가 없습니다. 먼저 BEL 비교를 실행하세요.")
+                if self.filtered_rows is None or len(self.filtered_rows) == 0:
+                    self.log_to_console("내보낼 데이터가 없습니다. 먼저 BEL 비교를 실행하세요.")
+                    return
+                result, rows = self.original_result_df, self.filtered_rows
+
+            # 파일 형식 필터 (선택한 필터로 형식을 결정)
+            name_filters = {
+                f"{label} (*{extension})": export_format
+                for export_format, (label, extension) in export.EXPORT_FORMATS.items()
+            }
+            file_name, selected_filter = QFileDialog.getSaveFileName(
+                self, "Export Result", "", ";;".join(list(name_filters) + ["All Files (*)"]))
+            if not file_name:
+                return
+
+            # 필터링된 복사본을 만들지 않고 원본 결과와 행 위치 배열을 넘김
+            self.export_worker = worker.ExportWorker(
+                result, rows, file_name, name_filters.get(selected_filter), self.metrics
+            )
+            self.export_thread = QThread(self)
+            self.export_worker.moveToThread(self.export_thread)
+            self.export_thread.started.connect(self.export_worker.run)
+            self.export_worker.progress.connect(self.update_progress)
+            self.export_worker.log.connect(self.log_to_console)
+            self.export_worker.finished.connect(self.on_export_finished)
+            self.export_worker.finished.connect(self.export_thread.quit)
+            self.export_thread.finished.connect(self.export_worker.deleteLater)
+            self.export_thread.finished.connect(self.export_thread.deleteLater)
+
+            self.export_button.setEnabled(False)
+            self.cancel_button.setEnabled(True)
+            self.export_thread.start()
         except Exception as e:
-            self.log_to_console(f"CSV 내보내기 오류: {str(e)}")
+            self.log_to_console(f"내보내기 오류: {str(e)}")
+
+    def on_export_finished(self, record):
+        """내보내기가 끝나면 버튼 상태를 되돌리고 소요 시간을 출력하는 함수"""
+        self.export_worker = None
+        self.export_thread = None
+        self.export_button.setEnabled(True)
+        self.cancel_button.setEnabled(self.worker is not None)
+        if record:
+            self.log_to_console(instrumentation.format_record(record))
 
     def handle_header_click(self, logicalIndex):
-        self.result_table.sortItems(logicalIndex, self.sort_order)
+        self.result_model.sort(logicalIndex, self.sort_order)
+        self.result_table.horizontalHeader().setSortIndicator(logicalIndex, self.sort_order)
         self.sort_order = Qt.DescendingOrder if self.sort_order == Qt.AscendingOrder else Qt.AscendingOrder
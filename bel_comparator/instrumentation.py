@@ -0,0 +1,79 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+
+from bel_comparator.lazy import LazyModule
+from bel_comparator.progress import STAGE_LABELS
+
+utils = LazyModule('bel_comparator.utils')  # pandas를 불러오므로 처음 측정할 때 불러옴
+
+class Instrumentation:
+    """파이프라인 단계별 벽시계 시간, CPU 시간, 처리 행 수, RSS 변화량을 기록하는 클래스
+
+    sink(record)가 주어지면 단계가 끝날 때마다 기록 dict를 전달합니다.
+    """
+
+    def __init__(self, sink=None):
+        self.records = []
+        self.sink = sink
+
+    @contextmanager
+    def measure(self, stage):
+        """with 블록을 한 단계로 측정합니다. 블록 안에서 record['rows']에 처리 행 수를 지정할 수 있습니다."""
+        record = {'stage': stage, 'rows': None}
+        rss_before = utils.get_process_memory()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        yield record
+
+        rss_after = utils.get_process_memory()
+        record['wall_seconds'] = round(time.perf_counter() - wall_started, 6)
+        record['cpu_seconds'] = round(time.process_time() - cpu_started, 6)
+        record['rss_mb'] = round(rss_after, 1) if rss_after is not None else None
+        record['rss_delta_mb'] = round(rss_after - rss_before, 1) if None not in (rss_before, rss_after) else None
+        self.records.append(record)
+        if self.sink is not None:
+            self.sink(record)
+
+def format_record(record):
+    """단계 기록 하나를 콘솔 출력용 한 줄로 변환하는 함수"""
+    parts = [f"CPU {record['cpu_seconds']:.3f}s"]
+    if record['rows'] is not None:
+        parts.append(f"{record['rows']:,}행")
+    if record['rss_delta_mb'] is not None:
+        parts.append(f"RSS {record['rss_delta_mb']:+.1f}MB")
+    label = STAGE_LABELS.get(record['stage'], record['stage'])
+    return f"  {label}: {record['wall_seconds']:.3f}s ({', '.join(parts)})"
+
+def format_summary(records):
+    """단계 기록 목록을 콘솔에 출력할 요약 줄 목록으로 변환하는 함수"""
+    if not records:
+        return []
+    total_seconds = sum(record['wall_seconds'] for record in records)
+    return [f"단계별 소요 시간 (합계 {total_seconds:.3f}s):"] + [format_record(record) for record in records]
+
+def json_lines_sink(stream):
+    """단계 기록을 stream에 JSON 한 줄씩 쓰는 sink를 반환하는 함수"""
+    def sink(record):
+        stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        stream.flush()
+    return sink
+
+@contextmanager
+def profile_to(path):
+    """path가 주어지면 with 블록을 cProfile로 프로파일링하여 pstats 파일로 저장하는 함수
+
+    cProfile은 호출한 스레드만 기록하므로 측정할 작업을 실행하는 스레드 안에서 사용해야 합니다.
+    """
+    if not path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
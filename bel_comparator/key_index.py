@@ -0,0 +1,195 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# 정책 키를 구성하는 컬럼 목록
+KEY_COLUMNS = ['POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK', 'LOA_CODE']
+# 파티션 경계를 정할 때 사용할 POL_NO 샘플 수
+BOUNDARY_SAMPLE_SIZE = 100000
+
+# 합성 키 코드의 최대값 (넘으면 지금까지의 코드를 정렬 순서대로 다시 매겨 범위를 줄임)
+MAX_PACKED_KEY = np.iinfo(np.int64).max
+
+# 여러 프레임의 정책 키를 함께 인코딩한 결과
+#   keys: 프레임별 합성 키 코드(int64) 배열, 키 순서(각 컬럼 오름차순, NaN은 마지막)와 대소 관계가 같음
+#   valid: 프레임별로 키 컬럼에 NaN이 없는 행 여부
+#   columns: 컬럼별 (프레임별 사전 코드 배열, 정렬된 고유값), NaN의 사전 코드는 고유값 개수
+KeyEncoding = namedtuple('KeyEncoding', ['keys', 'valid', 'columns'])
+
+# 한 프레임의 키 정렬 정보
+#   order: 키 코드 오름차순 안정 정렬 순서
+#   first_rows: NaN이 없는 키별로 처음 등장하는 행 위치 (키 순서)
+# 컬럼별 사전 순서는 함께 인코딩한 프레임에 관계없이 같으므로 다른 프레임과 다시 인코딩해도 그대로 사용할 수 있음
+KeyOrder = namedtuple('KeyOrder', ['order', 'first_rows'])
+
+# 두 키 코드 배열의 고유 키(오름차순)별 그룹 정보
+#   left_order, right_order: 양쪽 키의 안정 정렬 순서
+#   left_start, right_start: 정렬된 배열에서 키가 시작하는 위치
+#   left_count, right_count: 키의 행 수 (없으면 0)
+KeyGroups = namedtuple('KeyGroups', ['left_order', 'left_start', 'left_count', 'right_order', 'right_start', 'right_count'])
+
+def encode_column(values_list):
+    """여러 프레임의 같은 컬럼을 하나의 사전으로 인코딩하여 (프레임별 코드 배열, 정렬된 고유값)을 반환하는 함수"""
+    # 빈 프레임의 dtype은 결과 dtype에 반영하지 않음 (키 컬럼 병합 결과와 같은 규칙)
+    values = np.concatenate([values for values in values_list if len(values)] or values_list)
+    codes, uniques = pd.factorize(values, sort=True)
+    codes[codes < 0] = len(uniques)  # NaN은 모든 값보다 뒤에 정렬
+    codes = codes.astype(np.min_scalar_type(-len(uniques) - 1), copy=False)  # 고유값 개수를 담는 가장 작은 부호 있는 정수형
+    return np.split(codes, np.cumsum([len(values) for values in values_list])[:-1]), uniques
+
+def encode_keys(frames, key_columns=KEY_COLUMNS):
+    """프레임들의 키 컬럼을 사전 인코딩하고 키 하나를 int64 코드 하나로 묶는 함수
+
+    컬럼별 사전 코드를 혼합 기수로 이어 붙이므로 같은 키는 같은 코드가 되고(NaN끼리도 같음),
+    코드 순서가 키의 사전순과 같아 코드 하나로 병합해도 키 컬럼으로 병합한 것과 행 순서가 같습니다.
+    """
+    frame_lengths = [len(df) for df in frames]
+    total_rows = sum(frame_lengths)
+    keys = np.zeros(total_rows, dtype=np.int64)
+    valid = np.ones(total_rows, dtype=bool)
+    key_radix = 1
+    columns = {}
+    for col in key_columns:
+        frame_codes, uniques = encode_column([df[col].to_numpy() for df in frames])
+        columns[col] = (frame_codes, uniques)
+        codes = np.concatenate(frame_codes)
+        radix = len(uniques) + 1
+        if key_radix * radix > MAX_PACKED_KEY:
+            # 정렬된 고유 코드의 순번으로 바꾸면 순서는 그대로이고 범위는 행 수 이하로 줄어듦
+            unique_keys, keys = np.unique(keys, return_inverse=True)
+            keys = keys.astype(np.int64, copy=False)
+            key_radix = len(unique_keys)
+        keys = keys * radix + codes
+        key_radix *= radix
+        valid &= codes != len(uniques)
+
+    splits = np.cumsum(frame_lengths)[:-1]
+    return KeyEncoding(np.split(keys, splits), np.split(valid, splits), columns)
+
+def sort_keys(keys, valid):
+    """키 코드 배열의 정렬 순서와 키별 첫 행 위치(KeyOrder)를 계산하는 함수"""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    key_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]] if len(keys) else np.zeros(0, dtype=bool)
+    first_rows = order[key_start & valid[order]]  # NaN 키는 == 비교로 일치하지 않으므로 제외
+    return KeyOrder(order, first_rows)
+
+def take_rows(values, rows, fill_value):
+    """rows 위치의 값을 고르고 -1 위치는 fill_value로 채운 배열을 반환하는 함수"""
+    taken = np.full(len(rows), fill_value, dtype=np.result_type(values.dtype, np.min_scalar_type(fill_value)))
+    present = rows >= 0
+    taken[present] = values[rows[present]]
+    return taken
+
+def group_keys(left_keys, right_keys, right_order=None):
+    """두 키 코드 배열의 고유 키별로 양쪽 정렬 위치의 시작과 행 수(KeyGroups)를 계산하는 함수
+
+    right_order(오른쪽 키의 안정 정렬 순서)가 주어지면 오른쪽 정렬을 생략합니다.
+    """
+    left_order = np.argsort(left_keys, kind='stable')
+    if right_order is None:
+        right_order = np.argsort(right_keys, kind='stable')
+    left_sorted = left_keys[left_order]
+    right_sorted = right_keys[right_order]
+
+    # 정렬된 두 배열을 이어 붙인 배열은 안정 정렬(병합)이 빠르고, 인접한 값만 비교해 중복을 제거
+    keys = np.sort(np.concatenate([left_sorted, right_sorted]), kind='stable')
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+
+    left_start = np.searchsorted(left_sorted, keys, side='left')
+    left_count = np.searchsorted(left_sorted, keys, side='right') - left_start
+    right_start = np.searchsorted(right_sorted, keys, side='left')
+    right_count = np.searchsorted(right_sorted, keys, side='right') - right_start
+    return KeyGroups(left_order, left_start, left_count, right_order, right_start, right_count)
+
+def expand_groups(groups):
+    """키 그룹을 외부 조인 결과 행별 (왼쪽 행 번호, 오른쪽 행 번호)로 펼치는 함수 (없으면 -1)"""
+    left_start, left_count = groups.left_start, groups.left_count
+    right_start, right_count = groups.right_start, groups.right_count
+
+    # 한쪽에만 있는 키는 반대쪽을 빈 행(-1) 하나로 보고 키별 결과 행 수(곱집합 크기)를 계산
+    right_width = np.maximum(right_count, 1)
+    sizes = np.maximum(left_count, 1) * right_width
+    row_start = np.cumsum(sizes) - sizes
+    left_positions = np.empty(int(sizes.sum()), dtype=np.int64)
+    right_positions = np.empty(len(left_positions), dtype=np.int64)
+
+    # 대부분인 결과 행이 하나인 키는 키 단위로 바로 채움
+    single = np.flatnonzero(sizes == 1)
+    left_positions[row_start[single]] = np.where(left_count[single] > 0, left_start[single], -1)
+    right_positions[row_start[single]] = np.where(right_count[single] > 0, right_start[single], -1)
+
+    # 중복 키만 결과 행 단위로 펼쳐서 채움 (같은 키 안에서는 왼쪽 행 순서대로 오른쪽 행들과 짝지음)
+    multiple = np.flatnonzero(sizes > 1)
+    if len(multiple):
+        key_groups = np.repeat(multiple, sizes[multiple])
+        offsets = np.arange(len(key_groups)) - np.repeat(np.cumsum(sizes[multiple]) - sizes[multiple], sizes[multiple])
+        rows = row_start[key_groups] + offsets
+        left_positions[rows] = np.where(left_count[key_groups] > 0, left_start[key_groups] + offsets // right_width[key_groups], -1)
+        right_positions[rows] = np.where(right_count[key_groups] > 0, right_start[key_groups] + offsets % right_width[key_groups], -1)
+    return take_rows(groups.left_order, left_positions, -1), take_rows(groups.right_order, right_positions, -1)
+
+def group_first_rows(groups, group_ids):
+    """키 그룹별 양쪽의 첫 행 번호 (왼쪽 행 번호, 오른쪽 행 번호)를 반환하는 함수 (없으면 -1)"""
+    first_rows = []
+    for order, start, count in ((groups.left_order, groups.left_start, groups.left_count),
+                                (groups.right_order, groups.right_start, groups.right_count)):
+        rows = np.full(len(group_ids), -1, dtype=np.int64)
+        present = count[group_ids] > 0
+        rows[present] = order[start[group_ids[present]]]  # 안정 정렬이므로 키의 첫 행
+        first_rows.append(rows)
+    return tuple(first_rows)
+
+def right_first_rows(groups, right_valid):
+    """키 그룹에서 오른쪽 키별 첫 행 위치(키 순서, NaN 키 제외)를 반환하는 함수 (sort_keys의 first_rows와 같음)"""
+    rows = groups.right_order[groups.right_start[groups.right_count > 0]]
+    return rows[right_valid[rows]]
+
+def outer_join(left_keys, right_keys, right_order=None):
+    """두 키 코드 배열을 외부 조인하여 결과 행별 (왼쪽 행 번호, 오른쪽 행 번호)를 반환하는 함수 (없으면 -1)
+
+    결과 순서는 pd.merge(how='outer')와 같이 키 코드 오름차순이고, 같은 키 안에서는 왼쪽 행 순서대로
+    각 왼쪽 행이 오른쪽 행들과 짝지어집니다. DataFrame을 만들지 않고 정렬과 이진 탐색만으로 계산합니다.
+    right_order(오른쪽 키의 안정 정렬 순서)가 주어지면 오른쪽 정렬을 생략합니다.
+    """
+    return expand_groups(group_keys(left_keys, right_keys, right_order))
+
+def merged_codes(frame_codes, pw_rows, inno_rows):
+    """병합 행별로 Second 행(없으면 First 행)의 사전 코드를 고르는 함수 (frame_codes는 (Second, First) 순서)"""
+    pw_codes, inno_codes = frame_codes
+    codes = np.empty(len(pw_rows), dtype=pw_codes.dtype)
+    from_pw = pw_rows >= 0
+    codes[from_pw] = pw_codes[pw_rows[from_pw]]
+    codes[~from_pw] = inno_codes[inno_rows[~from_pw]]
+    return codes
+
+def decode_categorical(codes, uniques):
+    """사전 코드를 사용된 값만 범주로 갖는 범주형 배열로 변환하는 함수 (NaN 코드는 결측값)"""
+    codes = np.where(codes == len(uniques), -1, codes)
+    return pd.Categorical.from_codes(codes, categories=uniques).remove_unused_categories()
+
+def build_key_index(keys, first_rows, labels):
+    """키별 첫 행 위치(키 순서)로 키 코드별 라벨 조회 테이블 (정렬된 키 코드, 라벨)을 생성하는 함수"""
+    return keys[first_rows], np.asarray(labels)[first_rows]
+
+def lookup_index(key_index, keys):
+    """조회 테이블에서 각 키 코드에 해당하는 라벨과 찾았는지 여부를 반환하는 함수"""
+    sorted_keys, labels = key_index
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return labels[positions], sorted_keys[positions] == keys
+
+def compute_boundaries(sample, bucket_count):
+    """POL_NO 샘플의 분위수로 파티션 경계 값을 계산하는 함수
+
+    해시가 아닌 POL_NO 범위로 나누므로 파티션 순서가 곧 병합 결과의 정렬 순서가 되어
+    파티션별 결과를 이어 쓰는 것만으로 메모리 내 비교와 같은 행 순서를 얻을 수 있습니다.
+    """
+    sample = pd.Series(sample).dropna().to_numpy()
+    if bucket_count <= 1 or len(sample) == 0:
+        return sample[:0]
+    sample = np.sort(sample)
+    positions = [len(sample) * i // bucket_count for i in range(1, bucket_count)]
+    return np.unique(sample[positions])
@@ -0,0 +1,24 @@
+import importlib
+import threading
+
+class LazyModule:
+    """처음 속성에 접근할 때 모듈을 불러오는 대리 객체
+
+    pandas처럼 불러오는 데 시간이 걸리는 모듈을 모듈 수준에서 이름만 정해 두고,
+    실제로 사용할 때(또는 warm_up으로 미리 불러 둔 뒤) 모듈의 속성을 그대로 돌려줍니다.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+def warm_up(load):
+    """load()를 백그라운드 스레드에서 실행하여 모듈을 미리 불러오고 스레드를 반환하는 함수"""
+    thread = threading.Thread(target=load, name='bel-comparator-warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,140 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from bel_comparator import BELComparator
+from bel_comparator.key_index import BOUNDARY_SAMPLE_SIZE, compute_boundaries
+from bel_comparator.progress import STAGE_BUCKET, ensure_reporter
+import bel_comparator.cache as cache
+import bel_comparator.diagnostics as diagnostics
+import bel_comparator.utils as utils
+
+# 워커 하나당 나눌 파티션 수 (파티션 크기 편차에 따른 부하 불균형 완화)
+PARTITIONS_PER_WORKER = 4
+
+def default_worker_count():
+    """사용 가능한 CPU 코어 수를 반환하는 함수"""
+    return os.cpu_count() or 1
+
+def split_byte_ranges(file_name, parts):
+    """헤더를 제외한 CSV 본문을 줄 경계에 맞춘 (시작, 끝) 바이트 구간들로 나누는 함수
+
+    따옴표 안에 줄바꿈이 있는 CSV는 지원하지 않습니다.
+    """
+    file_size = os.path.getsize(file_name)
+    with open(file_name, 'rb') as f:
+        header = f.readline()
+        body_start = f.tell()
+        offsets = [body_start]
+        for i in range(1, parts):
+            f.seek(max(body_start + (file_size - body_start) * i // parts, offsets[-1]))
+            f.readline()  # 다음 줄의 시작으로 이동
+            offsets.append(min(f.tell(), file_size))
+    offsets.append(file_size)
+    ranges = [(start, end) for start, end in zip(offsets, offsets[1:]) if end > start]
+    return header, ranges
+
+def parse_byte_range(file_name, header, start, end, usecols):
+    """CSV 파일의 한 바이트 구간을 파싱하여 컬럼별 배열을 반환하는 함수 (워커 프로세스에서 실행)"""
+    with open(file_name, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    read_kwargs = {}
+    if usecols is not None:
+        wanted_columns = {col.upper() for col in usecols}
+        read_kwargs['usecols'] = lambda col: col.upper() in wanted_columns
+    chunk = pd.read_csv(io.BytesIO(header + data), **read_kwargs)
+    return {col: utils.narrow_integer(chunk[col].to_numpy()) for col in chunk.columns}
+
+def load_csv_parallel(file_name, executor, workers, usecols=None, use_cache=True):
+    """CSV 파일을 로드하는 함수 (캐시에 없으면 바이트 구간으로 나누어 여러 프로세스에서 파싱)"""
+    if not use_cache:
+        return parse_csv_parallel(file_name, executor, workers, usecols)
+    return cache.load_cached(file_name, usecols, lambda: parse_csv_parallel(file_name, executor, workers, usecols))
+
+def parse_csv_parallel(file_name, executor, workers, usecols=None):
+    """CSV 파일을 바이트 구간으로 나누어 여러 프로세스에서 파싱하는 함수
+
+    결과의 컬럼 dtype은 load_csv_with_chunksize와 같은 규칙(정수 축소 후 공통 타입)으로 정해집니다.
+    """
+    header, ranges = split_byte_ranges(file_name, workers)
+    futures = [executor.submit(parse_byte_range, file_name, header, start, end, usecols) for start, end in ranges]
+    parts = [future.result() for future in futures]
+    if not parts:
+        df = pd.DataFrame(parse_byte_range(file_name, header, 0, 0, usecols))  # 헤더만 있는 파일
+        df.columns = [col.upper() for col in df.columns]
+        return df
+
+    columns = list(parts[0].keys())
+    data = {}
+    for col in columns:
+        dtype = np.result_type(*[part[col].dtype for part in parts])
+        data[col] = np.concatenate([part[col].astype(dtype, copy=False) for part in parts])
+    df = pd.DataFrame(data)
+    df.columns = [col.upper() for col in df.columns]
+    return df
+
+def compare_partition(inno_part, pw_part):
+    """한 파티션의 BEL 비교를 수행하는 함수 (워커 프로세스에서 실행)"""
+    comparator = BELComparator(inno_part, pw_part, inno_part.pop('INNOLINC_BEL').to_numpy())
+    comparator.validate_and_prepare_data()
+    result = comparator.compare_bel()
+    return result, comparator.merged_row_count, comparator.key_diagnostics, comparator.loa_code
+
+def compare_parallel(inno_df, pw_df, bel_values, executor, workers, progress=None):
+    """POL_NO 범위 파티션별로 BEL 비교를 여러 프로세스에서 수행하는 함수
+
+    파티션 순서가 병합 결과의 정렬 순서와 같으므로 파티션 결과를 순서대로 이어 붙이고
+    ROW에 앞선 파티션의 병합 행 수를 더하면 단일 프로세스 비교와 같은 결과가 됩니다.
+    (결과, 키 진단, 결과 행별 LOA_CODE)를 반환하며, 키 진단도 파티션 순서대로 합치면 단일 프로세스 진단과 같습니다.
+    """
+    progress = ensure_reporter(progress)
+
+    # 단일 프로세스 비교와 같은 방식으로 컬럼 검증 및 BEL 값 배치
+    comparator = BELComparator(inno_df, pw_df, bel_values)
+    comparator.validate_and_prepare_data()
+    inno_df, pw_df = comparator.inno_df, comparator.pw_df
+
+    pol_no = np.concatenate([inno_df['POL_NO'].to_numpy(), pw_df['POL_NO'].to_numpy()])
+    sample_step = max(len(pol_no) // BOUNDARY_SAMPLE_SIZE, 1)
+    boundaries = compute_boundaries(pol_no[::sample_step], workers * PARTITIONS_PER_WORKER)
+    inno_ids = np.searchsorted(boundaries, inno_df['POL_NO'].to_numpy(), side='right')
+    pw_ids = np.searchsorted(boundaries, pw_df['POL_NO'].to_numpy(), side='right')
+
+    partition_count = len(boundaries) + 1
+    futures = {
+        executor.submit(compare_partition, inno_df[inno_ids == i], pw_df[pw_ids == i]): i
+        for i in range(partition_count)
+    }
+    outputs = [None] * partition_count
+    for done, future in enumerate(as_completed(futures), start=1):
+        outputs[futures[future]] = future.result()
+        progress.update(STAGE_BUCKET, done, partition_count)
+
+    results = []
+    row_offset = 0
+    for result, merged_row_count, _, _ in outputs:
+        result['ROW'] += row_offset
+        result.index = result.index + row_offset
+        row_offset += merged_row_count
+        results.append(result)
+    loa_code = combine_results([pd.DataFrame({'LOA_CODE': output[3]}) for output in outputs])['LOA_CODE'].array
+    return combine_results(results), diagnostics.combine_diagnostics([output[2] for output in outputs]), loa_code
+
+def combine_results(results):
+    """파티션별 결과를 이어 붙이고 범주형 컬럼을 다시 범주형으로 맞추는 함수"""
+    categorical_columns = [col for col in results[0].columns if isinstance(results[0][col].dtype, pd.CategoricalDtype)]
+    for result in results:
+        for col in categorical_columns:
+            result[col] = result[col].astype(result[col].cat.categories.dtype)
+    combined = pd.concat(results)
+    for col in categorical_columns:
+        combined[col] = combined[col].astype('category')
+    return combined
+
+def create_executor(workers):
+    """워커 수만큼의 프로세스 풀을 생성하는 함수"""
+    return ProcessPoolExecutor(max_workers=workers)
@@ -0,0 +1,79 @@
+from contextlib import nullcontext
+
+from bel_comparator.custom_exceptions import ComparisonCancelledError
+
+# 파이프라인 단계 이름
+STAGE_LOAD_FIRST = 'load_first'
+STAGE_LOAD_SECOND = 'load_second'
+STAGE_VALIDATE = 'validate'
+STAGE_MERGE = 'merge'
+STAGE_DIAGNOSTICS = 'diagnostics'
+STAGE_INDEX = 'index'
+STAGE_PARTITION = 'partition'
+STAGE_BUCKET = 'bucket'
+STAGE_BATCH = 'batch'
+STAGE_FILTER = 'filter'
+STAGE_ERROR_COUNT = 'error_count'
+STAGE_SUMMARY = 'summary'
+STAGE_SWEEP = 'sweep'
+STAGE_RENDER = 'render'
+STAGE_EXPORT = 'export'
+STAGE_STORE = 'store'
+STAGE_OPEN_RUN = 'open_run'
+STAGE_RUN_DIFF = 'run_diff'
+
+# 진행 표시줄에 보여줄 단계별 이름
+STAGE_LABELS = {
+    STAGE_LOAD_FIRST: 'First CSV 로드',
+    STAGE_LOAD_SECOND: 'Second CSV 로드',
+    STAGE_VALIDATE: '데이터 검증',
+    STAGE_MERGE: '병합',
+    STAGE_DIAGNOSTICS: '키 진단',
+    STAGE_INDEX: '인덱스 계산',
+    STAGE_PARTITION: '파티션 분할',
+    STAGE_BUCKET: '파티션 비교',
+    STAGE_BATCH: '배치 비교',
+    STAGE_FILTER: '필터링',
+    STAGE_ERROR_COUNT: '에러 카운트',
+    STAGE_SUMMARY: '요약 통계',
+    STAGE_SWEEP: '허용오차 스윕',
+    STAGE_RENDER: '테이블 표시',
+    STAGE_EXPORT: '내보내기',
+    STAGE_STORE: '결과 저장',
+    STAGE_OPEN_RUN: '저장된 결과 열기',
+    STAGE_RUN_DIFF: '실행 비교',
+}
+
+class ProgressReporter:
+    """단계별 진행 상황을 콜백으로 전달하고 취소 요청을 확인하는 클래스 (Qt에 의존하지 않음)
+
+    callback(stage, done, total)은 진행 상황이 바뀔 때마다 호출되며,
+    is_cancelled()가 True를 반환하면 다음 보고 시점에 ComparisonCancelledError가 발생합니다.
+    metrics(Instrumentation)가 주어지면 measure(stage)로 감싼 단계의 소요 시간 등을 기록합니다.
+    """
+
+    def __init__(self, callback=None, is_cancelled=None, metrics=None):
+        self.callback = callback
+        self.is_cancelled = is_cancelled
+        self.metrics = metrics
+
+    def check_cancelled(self):
+        """취소 요청이 있으면 ComparisonCancelledError를 발생시킵니다."""
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise ComparisonCancelledError("비교 작업이 취소되었습니다.")
+
+    def update(self, stage, done, total):
+        """단계의 진행 상황(done/total)을 보고합니다."""
+        self.check_cancelled()
+        if self.callback is not None:
+            self.callback(stage, done, total)
+
+    def measure(self, stage):
+        """단계 측정용 컨텍스트 매니저를 반환합니다. (metrics가 없으면 아무 것도 기록하지 않음)"""
+        if self.metrics is None:
+            return nullcontext({})
+        return self.metrics.measure(stage)
+
+def ensure_reporter(progress):
+    """None이면 아무 것도 하지 않는 ProgressReporter를 반환하는 함수"""
+    return progress if progress is not None else ProgressReporter()
@@ -0,0 +1,135 @@
+import hashlib
+import io
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+from bel_comparator.key_index import encode_keys
+import bel_comparator.cache as cache
+import bel_comparator.utils as utils
+
+# 줄 위치 색인을 만들 때 한 번에 검사하는 바이트 수
+LINE_SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+# 캐시에 저장하는 줄 위치 색인의 종류 이름
+LINE_INDEX_KIND = 'lines'
+# 캐시에 저장하는 컬럼별 dtype 목록의 종류 이름 접두사 (읽을 컬럼 목록별로 따로 저장)
+DTYPES_KIND = 'dtypes'
+
+def build_line_starts(file_name, block_size=LINE_SCAN_BLOCK_SIZE):
+    """파일을 메모리 매핑하여 줄마다 시작 바이트 위치를 담은 int64 배열을 만드는 함수 (마지막 원소는 파일 크기)
+
+    i번째 데이터 행(헤더 다음 줄부터 0번)은 [starts[i + 1], starts[i + 2]) 구간입니다.
+    따옴표(줄바꿈이 든 필드가 있을 수 있음)나 빈 줄이 있어 줄 번호와 행 번호가 다를 수 있는 파일이면 빈 배열을 반환합니다.
+    """
+    size = os.path.getsize(file_name)
+    if size == 0:
+        return np.zeros(1, dtype=np.int64)
+
+    parts = [np.zeros(1, dtype=np.int64)]
+    with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for block_start in range(0, size, block_size):
+            block = np.frombuffer(data, dtype=np.uint8, count=min(block_size, size - block_start), offset=block_start)
+            has_quote = data.find(b'"', block_start, block_start + len(block)) >= 0
+            parts.append(np.flatnonzero(block == ord('\n')).astype(np.int64) + (block_start + 1))
+            del block  # 메모리 매핑을 닫기 전에 버퍼 참조를 해제
+            if has_quote:
+                return np.zeros(0, dtype=np.int64)
+        starts = np.concatenate(parts)
+        if starts[-1] != size:
+            starts = np.append(starts, size)  # 마지막 줄에 줄바꿈이 없는 경우
+
+        # 빈 줄("\n" 또는 "\r\n")은 pandas가 건너뛰므로 행 번호가 어긋남
+        lengths = np.diff(starts)
+        short_lines = starts[:-1][lengths <= 2]
+        if any(data[int(line_start):int(line_start) + 1] in (b'\n', b'\r') for line_start in short_lines):
+            return np.zeros(0, dtype=np.int64)
+    return starts
+
+def load_line_starts(file_name, use_cache=True):
+    """줄 위치 색인을 반환하는 함수 (use_cache가 True이면 파일 내용별로 한 번만 만들어 캐시에 저장)"""
+    if not use_cache:
+        return build_line_starts(file_name)
+    return cache.load_cached_array(file_name, LINE_INDEX_KIND, lambda: build_line_starts(file_name))
+
+def scan_column_dtypes(file_name, usecols, chunksize):
+    """파일 전체를 청크 단위로 읽어 컬럼별 dtype을 계산하고 '컬럼명\tdtype' 문자열 배열로 반환하는 함수
+
+    dtype은 load_csv_with_chunksize와 같은 규칙(청크마다 정수 축소 후 청크 간 공통 타입)으로 정하므로
+    범위만 읽은 행도 전체를 읽었을 때와 같은 타입이 됩니다. 값이 없는 행이 범위 밖에만 있어도 float이 되는 식입니다.
+    """
+    wanted_columns = {col.upper() for col in usecols}
+    dtypes = {}
+    for chunk in pd.read_csv(file_name, chunksize=chunksize, usecols=lambda col: col.upper() in wanted_columns):
+        for col in chunk.columns:
+            dtype = utils.narrow_integer(chunk[col].to_numpy()).dtype
+            dtypes[col.upper()] = np.result_type(dtypes[col.upper()], dtype) if col.upper() in dtypes else dtype
+    return np.array([f"{col}\t{dtype.str}" for col, dtype in dtypes.items()], dtype=str)
+
+def load_column_dtypes(file_name, usecols, chunksize, use_cache=True):
+    """전체 파일 기준 컬럼별 dtype을 {대문자 컬럼명: dtype} dict로 반환하는 함수
+
+    use_cache가 True이면 파일 내용과 컬럼 목록별로 한 번만 계산하여 줄 위치 색인 옆에 캐시로 저장합니다.
+    """
+    def build():
+        return scan_column_dtypes(file_name, usecols, chunksize)
+
+    if use_cache:
+        columns_key = ','.join(sorted(col.upper() for col in usecols))
+        kind = f"{DTYPES_KIND}-{hashlib.blake2b(columns_key.encode('utf-8'), digest_size=8).hexdigest()}"
+        entries = cache.load_cached_array(file_name, kind, build)
+    else:
+        entries = build()
+    return {col: np.dtype(dtype) for col, dtype in (str(entry).split('\t') for entry in entries)}
+
+def is_usable(line_starts):
+    """줄 위치 색인으로 범위를 읽을 수 있는지(줄 번호와 행 번호가 같은 파일인지) 반환하는 함수"""
+    return len(line_starts) > 0
+
+def row_count(line_starts):
+    """줄 위치 색인으로 헤더를 제외한 데이터 행 수를 계산하는 함수"""
+    return max(len(line_starts) - 2, 0)
+
+def read_row_window(file_name, line_starts, start, end, usecols=None, dtypes=None):
+    """데이터 행 [start, end] 구간의 바이트만 헤더와 함께 파싱하여 DataFrame을 반환하는 함수
+
+    인덱스는 전체 파일을 읽었을 때와 같은 행 번호(start부터)이고 컬럼명은 대문자로 바꿉니다.
+    dtypes(전체 파일 기준 컬럼별 dtype)가 주어지면 구간 값만으로 타입을 정하지 않고 그 타입으로 맞추며,
+    문자열(object) 컬럼은 구간 안 값이 모두 숫자여도 문자열로 읽습니다. 파싱한 행 수가 구간 길이와 다르면 None을 반환합니다.
+    """
+    total_rows = row_count(line_starts)
+    end = min(end, total_rows - 1)
+    with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        header = data[int(line_starts[0]):int(line_starts[1])]
+        body = data[int(line_starts[start + 1]):int(line_starts[end + 2])] if start <= end else b''
+
+    read_kwargs = {}
+    if usecols is not None:
+        wanted_columns = {col.upper() for col in usecols}
+        read_kwargs['usecols'] = lambda col: col.upper() in wanted_columns
+    if not header.endswith(b'\n'):
+        header += b'\n'  # 데이터 행 없이 헤더만 있고 줄바꿈이 없는 경우
+    dtypes = dtypes or {}
+    header_columns = pd.read_csv(io.BytesIO(header), nrows=0).columns
+    read_kwargs['dtype'] = {col: str for col in header_columns if dtypes.get(col.upper()) == np.dtype(object)}
+    df = pd.read_csv(io.BytesIO(header + body), **read_kwargs)
+
+    expected_rows = max(end - start + 1, 0)
+    if len(df) != expected_rows:
+        return None
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        dtype = dtypes.get(col.upper())
+        columns[col.upper()] = values.astype(dtype, copy=False) if dtype is not None else utils.narrow_integer(values)
+    return pd.DataFrame(columns, index=pd.RangeIndex(start, start + expected_rows))
+
+def filter_to_keys(pw_df, inno_df):
+    """Second 행 중 키가 First 행의 키와 같은 행만 원래 순서대로 남기는 함수
+
+    POL_NO로 후보를 먼저 줄인 뒤 후보와 First 행의 키만 사전 코드로 비교하므로
+    비용은 Second 행 수에 대한 isin 한 번과 후보 수에 비례합니다. NaN 키 값은 NaN과 같은 값으로 봅니다.
+    """
+    candidates = pw_df[pw_df['POL_NO'].isin(inno_df['POL_NO']).to_numpy()]
+    encoding = encode_keys([candidates, inno_df])
+    return candidates[np.isin(encoding.keys[0], encoding.keys[1])]
@@ -0,0 +1,114 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from bel_comparator.lazy import LazyModule
+
+pd = LazyModule('pandas')  # 결과를 표시할 때 처음 불러옴
+
+# 열 너비 추정 시 사용할 최대 샘플 행 수
+WIDTH_SAMPLE_SIZE = 200
+
+class ResultColumn:
+    """결과 DataFrame의 한 컬럼을 NumPy 배열로 보관하고 셀 단위로 포맷팅하는 클래스"""
+
+    def __init__(self, series):
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            # 범주형 컬럼은 코드 배열과 문자열 레이블만 보관합니다.
+            self.labels = series.cat.categories.astype(str).to_numpy(dtype=object)
+            self.values = series.cat.codes.to_numpy()
+            self.kind = 'category'
+        elif pd.api.types.is_float_dtype(dtype):
+            self.values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            self.kind = 'float'
+        elif pd.api.types.is_integer_dtype(dtype):
+            # nullable 정수 컬럼은 NaN을 포함한 float64 배열로 보관합니다.
+            self.values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            self.kind = 'int'
+        else:
+            self.values = series.to_numpy(dtype=object)
+            self.kind = 'object'
+
+    def text(self, row):
+        """주어진 행의 값을 표시용 문자열로 반환합니다."""
+        value = self.values[row]
+        if self.kind == 'category':
+            return self.labels[value] if value >= 0 else 'NaN'
+        if self.kind == 'float':
+            return 'NaN' if np.isnan(value) else f"{value:.6f}"
+        if self.kind == 'int':
+            return 'NaN' if np.isnan(value) else str(int(value))
+        if value == '' or pd.isna(value):
+            return 'NaN'
+        return str(value)
+
+    def sort_keys(self, rows):
+        """주어진 행들의 정렬 키 배열을 반환합니다."""
+        if self.kind == 'object':
+            return self.values[rows].astype(str)
+        return self.values[rows]
+
+class ResultTableModel(QAbstractTableModel):
+    """결과 DataFrame을 복사하지 않고 행 인덱스 배열로 보여주는 테이블 모델"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.columns = []
+        self.rows = np.empty(0, dtype=np.int64)
+
+    def set_result(self, result):
+        """표시할 결과 DataFrame을 설정하고 전체 행을 표시합니다."""
+        self.beginResetModel()
+        self.headers = [str(col) for col in result.columns]
+        self.columns = [ResultColumn(result[col]) for col in result.columns]
+        self.rows = np.arange(len(result), dtype=np.int64)
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        """필터링된 행 위치 배열을 표시합니다."""
+        self.beginResetModel()
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.columns[index.column()].text(self.rows[index.row()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """NumPy argsort로 현재 표시 중인 행의 순서를 정렬합니다."""
+        if not self.columns or len(self.rows) == 0:
+            return
+        self.layoutAboutToBeChanged.emit()
+        order_idx = np.argsort(self.columns[column].sort_keys(self.rows), kind='stable')
+        if order == Qt.DescendingOrder:
+            order_idx = order_idx[::-1]
+        self.rows = self.rows[order_idx]
+        self.layoutChanged.emit()
+
+    def estimate_column_widths(self, font_metrics, sample_size=WIDTH_SAMPLE_SIZE):
+        """샘플 행의 텍스트 폭으로 각 열의 너비를 추정하여 반환합니다."""
+        sample = self.rows
+        if len(sample) > sample_size:
+            sample = sample[np.linspace(0, len(sample) - 1, sample_size).astype(np.int64)]
+
+        widths = []
+        for header, column in zip(self.headers, self.columns):
+            width = font_metrics.width(header)
+            for row in sample:
+                width = max(width, font_metrics.width(column.text(row)))
+            widths.append(width + 10)
+        return widths
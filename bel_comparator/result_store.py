@@ -0,0 +1,210 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from collections import namedtuple
+
+import pandas as pd
+import bel_comparator.data_processing as data_processing
+import bel_comparator.diagnostics as diagnostics
+
+try:
+    import pyarrow.feather as feather  # 선택 의존성: 없으면 결과를 저장하지 않음
+except ImportError:
+    feather = None
+
+# 저장 형식 버전 (저장하는 컬럼이나 메타데이터 규칙이 바뀌면 올려서 이전 실행을 목록에서 제외)
+STORE_VERSION = 1
+# 저장소 최대 용량 기본값 (MB)과 실행 보관 기간 기본값 (일)
+DEFAULT_STORE_MAX_MB = 4096
+DEFAULT_STORE_MAX_DAYS = 30
+RESULT_FILE_NAME = 'result.feather'
+METADATA_FILE_NAME = 'run.json'
+
+# 비교 실행의 입력 정보 (bel_source는 화면/로그에 보여줄 BEL 값 출처, bel_text는 해시 계산용 BEL 입력 텍스트)
+RunInputs = namedtuple('RunInputs', ['first_path', 'second_path', 'bel_source', 'bel_text', 'start', 'end'])
+# 저장된 실행 (path: 실행 디렉터리, metadata: run.json 내용)
+StoredRun = namedtuple('StoredRun', ['run_id', 'path', 'metadata'])
+
+def is_available():
+    """pyarrow가 설치되어 결과를 저장할 수 있는지 반환하는 함수"""
+    return feather is not None
+
+def get_store_dir():
+    """결과 저장소 디렉터리 경로를 반환하는 함수 (BEL_COMPARATOR_STORE_DIR 환경 변수로 변경 가능)"""
+    store_dir = os.environ.get('BEL_COMPARATOR_STORE_DIR')
+    if store_dir:
+        return store_dir
+    if sys.platform == 'win32':
+        base_dir = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        base_dir = os.environ.get('XDG_DATA_HOME', os.path.join(os.path.expanduser('~'), '.local', 'share'))
+    return os.path.join(base_dir, 'bel_comparator', 'runs')
+
+def get_store_limits():
+    """(최대 용량 바이트, 최대 보관 기간 초)를 반환하는 함수
+
+    BEL_COMPARATOR_STORE_MAX_MB, BEL_COMPARATOR_STORE_MAX_DAYS 환경 변수로 변경할 수 있습니다.
+    """
+    max_mb = os.environ.get('BEL_COMPARATOR_STORE_MAX_MB')
+    max_days = os.environ.get('BEL_COMPARATOR_STORE_MAX_DAYS')
+    return (int((float(max_mb) if max_mb else DEFAULT_STORE_MAX_MB) * 1024 * 1024),
+            (float(max_days) if max_days else DEFAULT_STORE_MAX_DAYS) * 24 * 60 * 60)
+
+def file_record(file_name):
+    """입력 파일의 경로, 크기, 수정 시각을 dict로 반환하는 함수 (파일이 없으면 경로만)"""
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return {'path': os.path.abspath(file_name)}
+    return {'path': os.path.abspath(file_name), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def directory_size(path):
+    """디렉터리 안 파일 크기의 합을 반환하는 함수"""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+def new_run_id():
+    """생성 시각 순으로 정렬되는 실행 ID를 만드는 함수"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+
+def save_run(comparison, inputs, store_dir=None):
+    """비교 결과(ComparisonRun)와 입력 정보를 저장소에 저장하고 실행 ID를 반환하는 함수
+
+    결과 컬럼과 행별 LOA_CODE는 dtype(범주형, nullable 정수 포함)을 유지한 채 비압축 Feather 파일 하나에,
+    키 진단 보고서는 보고서별 Feather 파일에, 입력 정보와 요약은 run.json에 저장합니다.
+    저장 후에는 보관 기간과 최대 용량을 넘는 오래된 실행을 삭제합니다.
+    """
+    if not is_available():
+        raise ImportError("결과 저장에는 pyarrow가 필요합니다.")
+
+    store_dir = store_dir or get_store_dir()
+    os.makedirs(store_dir, exist_ok=True)
+    run_id = new_run_id()
+    path = os.path.join(store_dir, run_id)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(temp_path)
+    try:
+        # 결과의 인덱스는 ROW와 같으므로 저장하지 않고 열 때 ROW로 복원
+        frame = comparison.result.reset_index(drop=True).assign(LOA_CODE=comparison.loa_code)
+        feather.write_feather(frame, os.path.join(temp_path, RESULT_FILE_NAME), compression='uncompressed')
+        for name in diagnostics.DIAGNOSTIC_REPORTS:
+            report = getattr(comparison.key_diagnostics, name).reset_index(drop=True)
+            feather.write_feather(report, os.path.join(temp_path, f"{name}.feather"), compression='uncompressed')
+
+        diff = data_processing.diff_array(comparison.result)
+        created = time.time()
+        metadata = {
+            'version': STORE_VERSION,
+            'run_id': run_id,
+            'created': created,
+            'created_at': datetime.datetime.fromtimestamp(created).isoformat(timespec='seconds'),
+            'first': file_record(inputs.first_path),
+            'second': file_record(inputs.second_path),
+            'bel_source': inputs.bel_source,
+            'bel_hash': hashlib.blake2b(inputs.bel_text.encode('utf-8'), digest_size=16).hexdigest(),
+            'start': inputs.start,
+            'end': inputs.end,
+            'adjustment_factor': comparison.adjustment_factor,
+            'inno_count': comparison.inno_count,
+            'pw_count': comparison.pw_count,
+            'rows': len(comparison.result),
+            'errors': data_processing.count_errors(diff, comparison.adjustment_factor, False),
+            'key_diagnostics': diagnostics.summary_record(comparison.key_diagnostics),
+        }
+        with open(os.path.join(temp_path, METADATA_FILE_NAME), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    max_bytes, max_age = get_store_limits()
+    prune(store_dir, max_bytes, max_age, keep={run_id})
+    return run_id
+
+def list_runs(store_dir=None):
+    """저장된 실행 목록(StoredRun)을 최근 실행부터 반환하는 함수 (메타데이터를 읽을 수 없거나 형식 버전이 다른 실행은 제외)"""
+    store_dir = store_dir or get_store_dir()
+    try:
+        entries = [entry for entry in os.scandir(store_dir) if entry.is_dir() and not entry.name.endswith('.tmp')]
+    except OSError:
+        return []
+
+    runs = []
+    for entry in entries:
+        try:
+            with open(os.path.join(entry.path, METADATA_FILE_NAME), encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if metadata.get('version') == STORE_VERSION:
+            runs.append(StoredRun(entry.name, entry.path, metadata))
+    runs.sort(key=lambda run: run.metadata['created'], reverse=True)
+    return runs
+
+def find_run(run_id, store_dir=None):
+    """실행 ID로 저장된 실행을 찾는 함수 (없으면 None)"""
+    for run in list_runs(store_dir):
+        if run.run_id == run_id:
+            return run
+    return None
+
+def open_run(run):
+    """저장된 실행의 결과를 메모리 매핑으로 읽어 ComparisonRun으로 반환하는 함수 (다시 비교하지 않음)"""
+    if not is_available():
+        raise ImportError("저장된 결과를 열려면 pyarrow가 필요합니다.")
+
+    result = feather.read_table(os.path.join(run.path, RESULT_FILE_NAME), memory_map=True).to_pandas(split_blocks=True)
+    loa_code = result.pop('LOA_CODE').array
+    result.index = result['ROW'].to_numpy()
+
+    reports = {
+        name: feather.read_table(os.path.join(run.path, f"{name}.feather"), memory_map=True).to_pandas()
+        for name in diagnostics.DIAGNOSTIC_REPORTS
+    }
+    record = run.metadata['key_diagnostics']
+    key_diagnostics = diagnostics.KeyDiagnostics(**reports, key_count=record['key_count'], merged_rows=record['merged_rows'])
+    metadata = run.metadata
+    return data_processing.ComparisonRun(
+        result, metadata['inno_count'], metadata['pw_count'], metadata['adjustment_factor'], key_diagnostics, loa_code
+    )
+
+def delete_run(run):
+    """저장된 실행을 삭제하는 함수"""
+    shutil.rmtree(run.path, ignore_errors=True)
+
+def prune(store_dir, max_bytes, max_age, keep=()):
+    """보관 기간이 지난 실행을 삭제하고, 총 용량이 max_bytes 이하가 될 때까지 오래된 실행부터 삭제하는 함수
+
+    keep에 있는 실행 ID는 삭제하지 않으며, 삭제한 실행 수를 반환합니다.
+    """
+    now = time.time()
+    runs = list_runs(store_dir)
+    sizes = {run.run_id: directory_size(run.path) for run in runs}
+    total_bytes = sum(sizes.values())
+    removed = 0
+    for run in reversed(runs):  # 오래된 실행부터
+        if run.run_id in keep:
+            continue
+        if now - run.metadata['created'] > max_age or total_bytes > max_bytes:
+            delete_run(run)
+            total_bytes -= sizes[run.run_id]
+            removed += 1
+    return removed
+
+def runs_frame(runs):
+    """저장된 실행 목록을 화면/콘솔에 보여줄 표로 변환하는 함수"""
+    return pd.DataFrame({
+        'RUN_ID': [run.run_id for run in runs],
+        'CREATED_AT': [run.metadata['created_at'] for run in runs],
+        'FIRST': [os.path.basename(run.metadata['first']['path']) for run in runs],
+        'SECOND': [os.path.basename(run.metadata['second']['path']) for run in runs],
+        'BEL': [run.metadata['bel_source'] for run in runs],
+        'RANGE': [f"{run.metadata['start'] or 0} ~ {run.metadata['end'] or 'max'}" for run in runs],
+        'TOLERANCE': [run.metadata['adjustment_factor'] for run in runs],
+        'ROWS': [run.metadata['rows'] for run in runs],
+        'ERRORS': [run.metadata['errors'] for run in runs],
+    }, columns=['RUN_ID', 'CREATED_AT', 'FIRST', 'SECOND', 'BEL', 'RANGE', 'TOLERANCE', 'ROWS', 'ERRORS'])
@@ -0,0 +1,314 @@
+import contextlib
+import io
+import json
+import math
+import os
+import pickle
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from bel_comparator.custom_exceptions import InvalidInputError, MissingColumnsError
+from bel_comparator.key_index import encode_keys
+from bel_comparator.progress import STAGE_PARTITION, STAGE_RUN_DIFF, ensure_reporter
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.result_store as result_store
+import bel_comparator.streaming as streaming
+
+try:
+    import pyarrow as pa  # 선택 의존성: 없으면 zstd 압축 CSV, Parquet 결과와 저장된 실행을 읽을 수 없음
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    feather = None
+    pq = None
+
+# 두 실행의 행을 맞추는 키 컬럼 (INDEX는 First 행 번호, Second에만 있는 행은 NA)
+DIFF_KEY_COLUMNS = ['POL_NO', 'RIDER_PRD_CODE', 'INDEX']
+# 결과 파일에서 읽는 컬럼
+RESULT_COLUMNS = ['ROW', 'INDEX', 'POL_NO', 'RIDER_PRD_CODE', 'ANSWER_BEL', 'INPUT_BEL', 'DIFF']
+# 이전/새 실행에서 가져오는 값 컬럼
+VALUE_COLUMNS = ['ROW', 'ANSWER_BEL', 'INPUT_BEL', 'DIFF']
+# 보고서 컬럼
+REPORT_COLUMNS = [
+    'POL_NO', 'RIDER_PRD_CODE', 'INDEX', 'OLD_ROW', 'NEW_ROW', 'OLD_ANSWER_BEL', 'NEW_ANSWER_BEL',
+    'OLD_INPUT_BEL', 'NEW_INPUT_BEL', 'OLD_DIFF', 'NEW_DIFF', 'DIFF_DELTA'
+]
+# 보고서 이름 (파일명은 보고서 이름 + 형식별 확장자)
+#   newly_failing: 이전 실행에서는 통과, 새 실행에서는 에러인 행
+#   newly_passing: 이전 실행에서는 에러, 새 실행에서는 통과인 행
+#   changed: 두 실행의 DIFF 차이(DIFF_DELTA)가 허용오차를 넘거나 한쪽만 N/A인 행
+#   only_old, only_new: 한쪽 실행에만 있는 행
+RUN_DIFF_REPORTS = ['newly_failing', 'newly_passing', 'changed', 'only_old', 'only_new']
+SUMMARY_FILE_NAME = 'run_diff.json'
+# 파티션 수와 읽기 청크 크기를 정할 때 사용하는 결과 행 하나의 메모리 크기 추정치 (바이트)
+ESTIMATED_ROW_BYTES = 200
+
+# 비교할 실행 하나 (path: 결과 파일 경로, run: 저장된 실행이면 StoredRun, 아니면 None)
+RunSource = namedtuple('RunSource', ['label', 'path', 'run'])
+# 실행 비교 결과 (counts: 보고서별 행 수와 전체 행 수, paths: 쓴 파일 경로 목록)
+RunDiff = namedtuple('RunDiff', ['counts', 'max_abs_delta', 'paths'])
+
+def resolve_source(source, store_dir=None):
+    """결과 파일 경로 또는 저장된 실행 ID를 RunSource로 변환하는 함수"""
+    if os.path.exists(source):
+        return RunSource(source, source, None)
+    run = result_store.find_run(source, store_dir)
+    if run is None:
+        raise InvalidInputError(f"결과 파일 또는 저장된 실행을 찾을 수 없습니다: {source}")
+    return RunSource(f"저장된 실행: {run.run_id}", os.path.join(run.path, result_store.RESULT_FILE_NAME), run)
+
+def read_csv_chunks(path, chunk_rows):
+    """내보낸 CSV 결과(gzip, zstd 압축과 Excel용 CSV 포함)를 청크 단위로 읽는 제너레이터"""
+    export_format = export.detect_format(path)
+    read_kwargs = {'chunksize': chunk_rows, 'dtype': {'POL_NO': str, 'RIDER_PRD_CODE': str}}
+    if export_format == export.FORMAT_CSV_ZSTD:
+        if pa is None:
+            raise ImportError("zstd 압축 CSV를 읽으려면 pyarrow가 필요합니다.")
+        with pa.OSFile(path, 'rb') as raw, pa.CompressedInputStream(raw, 'zstd') as stream:
+            yield from pd.read_csv(io.TextIOWrapper(stream, encoding='utf-8'), **read_kwargs)
+    elif export_format == export.FORMAT_CSV_GZIP:
+        yield from pd.read_csv(path, compression='gzip', encoding='utf-8', **read_kwargs)
+    else:
+        # Excel용 CSV의 BOM은 utf-8-sig로 제거
+        yield from pd.read_csv(path, encoding='utf-8-sig', **read_kwargs)
+
+def read_result_chunks(source, chunk_rows):
+    """결과 파일 또는 저장된 실행을 청크 단위 DataFrame으로 읽는 제너레이터"""
+    if source.run is not None or export.detect_format(source.path) == export.FORMAT_PARQUET:
+        if pa is None:
+            raise ImportError("Parquet 결과나 저장된 실행을 읽으려면 pyarrow가 필요합니다.")
+        if source.run is not None:
+            batches = feather.read_table(source.path, memory_map=True).to_batches(max_chunksize=chunk_rows)
+        else:
+            batches = pq.ParquetFile(source.path).iter_batches(batch_size=chunk_rows)
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        yield from read_csv_chunks(source.path, chunk_rows)
+
+def key_strings(values):
+    """키 컬럼을 결과 표시와 같은 문자열 object 배열로 변환하는 함수 (NaN은 'nan', Excel용 CSV의 ="..."는 벗김)
+
+    저장된 실행과 Parquet의 범주형 컬럼은 배치마다 전체 사전이 붙어 있으므로 청크에 쓰인 범주만 변환하여 코드로 펼칩니다.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        used_codes, inverse = np.unique(values.cat.codes.to_numpy(), return_inverse=True)
+        categories = values.cat.categories.take(used_codes[used_codes >= 0]).astype(str).to_numpy(dtype=object)
+        if len(used_codes) and used_codes[0] < 0:
+            categories = np.insert(categories, 0, 'nan')  # NaN의 코드 -1은 가장 앞
+        return categories[inverse.reshape(-1)]
+
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        # 숫자로 저장된 키(Parquet)는 결과 표시와 같이 str()로 변환 (NaN은 'nan')
+        strings = values.to_numpy().astype(str).astype(object)
+    else:
+        strings = values.to_numpy(dtype=object, na_value='nan')
+    texts = pd.Series(strings)
+    wrapped = (texts.str.startswith('="') & texts.str.endswith('"')).to_numpy(dtype=bool)
+    if wrapped.any():
+        unwrapped = texts[wrapped].str.slice(2, -1)
+        strings[wrapped] = unwrapped.where(unwrapped != 'NaN', 'nan').to_numpy(dtype=object)  # 내보낸 빈 키 ="NaN"
+    return strings
+
+def normalize_chunk(chunk, label):
+    """결과 청크를 형식과 관계없이 같은 dtype(키는 문자열, INDEX와 값은 float64, ROW는 int64)으로 맞추는 함수
+
+    NaN 키는 결과 표시와 같이 'nan' 문자열로 두어 NaN끼리도 같은 키로 맞춥니다.
+    """
+    chunk.columns = [str(col).upper() for col in chunk.columns]
+    missing_columns = [col for col in RESULT_COLUMNS if col not in chunk.columns]
+    if missing_columns:
+        raise MissingColumnsError(f"{label}에 필수 컬럼이 없습니다: {', '.join(missing_columns)}")
+
+    normalized = {}
+    for col in ['POL_NO', 'RIDER_PRD_CODE']:
+        normalized[col] = key_strings(chunk[col])
+    for col in ['INDEX', 'ANSWER_BEL', 'INPUT_BEL', 'DIFF']:
+        normalized[col] = pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    normalized['ROW'] = pd.to_numeric(chunk['ROW']).astype(np.int64)
+    return pd.DataFrame(normalized, columns=RESULT_COLUMNS).reset_index(drop=True)
+
+def hash_buckets(chunk, bucket_count):
+    """키 컬럼의 해시로 행마다 파티션 번호를 계산하는 함수 (같은 키는 두 실행에서 같은 파티션)"""
+    hashes = pd.util.hash_pandas_object(chunk[DIFF_KEY_COLUMNS], index=False).to_numpy()
+    return (hashes % np.uint64(bucket_count)).astype(np.int64)
+
+def partition_source(source, chunk_rows, bucket_count, bucket_paths, progress):
+    """실행 하나를 청크 단위로 읽어 키 해시 파티션 파일에 나누어 쓰고 (행 수, 메모리에 둔 청크 목록)을 반환하는 함수
+
+    파티션이 하나뿐이면 파일에 쓰지 않고 청크를 메모리에 둡니다.
+    """
+    row_count = 0
+    in_memory = []
+    for chunk in read_result_chunks(source, chunk_rows):
+        chunk = normalize_chunk(chunk, source.label)
+        row_count += len(chunk)
+        if bucket_count == 1:
+            in_memory.append(chunk)
+        else:
+            bucket_ids = hash_buckets(chunk, bucket_count)
+            for bucket_id in np.unique(bucket_ids):
+                with open(bucket_paths[bucket_id], 'ab') as f:
+                    pickle.dump(chunk[bucket_ids == bucket_id], f, protocol=pickle.HIGHEST_PROTOCOL)
+        progress.update(STAGE_PARTITION, row_count, row_count)
+    return row_count, in_memory
+
+def occurrence_codes(key_codes):
+    """같은 키 안에서 몇 번째 행인지(ROW 순서, 0부터)를 계산하는 함수 (병합 팬아웃으로 키가 중복되는 행 구분)"""
+    return pd.Series(key_codes).groupby(key_codes, sort=False).cumcount().to_numpy()
+
+def join_bucket(old_part, new_part):
+    """한 파티션의 두 실행 행을 키로 해시 조인하여 (ROW 순 이전 파티션, ROW 순 새 파티션, 새 행별 이전 행 위치, 이전 행별 매칭 여부)를 반환하는 함수
+
+    키를 encode_keys로 int64 코드 하나로 묶고, 중복 키는 등장 순번을 붙여 다시 인코딩한 뒤
+    이전 실행 코드의 해시 테이블(pd.Index)에서 새 실행 코드를 찾습니다. 매칭되지 않은 위치는 -1입니다.
+    """
+    old_part = old_part.sort_values('ROW', kind='stable', ignore_index=True)
+    new_part = new_part.sort_values('ROW', kind='stable', ignore_index=True)
+    encoding = encode_keys([old_part, new_part], DIFF_KEY_COLUMNS)
+    frames = [
+        pd.DataFrame({'KEY': keys, 'OCCURRENCE': occurrence_codes(keys)}) for keys in encoding.keys
+    ]
+    old_codes, new_codes = encode_keys(frames, ['KEY', 'OCCURRENCE']).keys
+    old_positions = pd.Index(old_codes).get_indexer(new_codes)
+    old_matched = np.zeros(len(old_part), dtype=bool)
+    old_matched[old_positions[old_positions >= 0]] = True
+    return old_part, new_part, old_positions, old_matched
+
+def report_frame(keys, old_values, new_values):
+    """키 컬럼과 이전/새 실행 값으로 보고서 DataFrame을 만드는 함수 (없는 쪽 값은 NaN/NA)"""
+    length = len(keys)
+    columns = {col: keys[col].to_numpy() for col in ['POL_NO', 'RIDER_PRD_CODE']}
+    columns['INDEX'] = pd.array(keys['INDEX'].to_numpy(), dtype='Int64')
+    for prefix, values in (('OLD_', old_values), ('NEW_', new_values)):
+        for col in VALUE_COLUMNS:
+            column = values[col].to_numpy(dtype=np.float64) if values is not None else np.full(length, np.nan)
+            columns[prefix + col] = pd.array(column, dtype='Int64') if col == 'ROW' else column
+    columns['DIFF_DELTA'] = columns['NEW_DIFF'] - columns['OLD_DIFF']
+    return pd.DataFrame(columns, columns=REPORT_COLUMNS)
+
+def diff_bucket(old_part, new_part, adjustment_factor, exclude_na):
+    """한 파티션의 두 실행을 비교하여 보고서별 DataFrame(dict)을 반환하는 함수"""
+    old_part, new_part, old_positions, old_matched = join_bucket(old_part, new_part)
+    matched = old_positions >= 0
+    old_rows = old_part.iloc[old_positions[matched]].reset_index(drop=True)
+    new_rows = new_part[matched].reset_index(drop=True)
+    both = report_frame(new_rows, old_rows, new_rows)
+
+    old_diff = both['OLD_DIFF'].to_numpy()
+    new_diff = both['NEW_DIFF'].to_numpy()
+    old_error = data_processing.error_mask(old_diff, adjustment_factor, exclude_na)
+    new_error = data_processing.error_mask(new_diff, adjustment_factor, exclude_na)
+    with np.errstate(invalid='ignore'):
+        changed = (np.abs(both['DIFF_DELTA'].to_numpy()) > adjustment_factor) | (np.isnan(old_diff) != np.isnan(new_diff))
+
+    only_old = old_part[~old_matched].reset_index(drop=True)
+    only_new = new_part[~matched].reset_index(drop=True)
+    return {
+        'newly_failing': both[~old_error & new_error],
+        'newly_passing': both[old_error & ~new_error],
+        'changed': both[changed],
+        'only_old': report_frame(only_old, only_old, None),
+        'only_new': report_frame(only_new, None, only_new),
+    }, len(both), both['DIFF_DELTA'].abs().max()
+
+def estimate_bucket_count(sources, memory_limit_bytes):
+    """두 실행의 파일 크기와 메모리 한도로 파티션 수를 계산하는 함수 (스트리밍 비교와 같은 규칙)"""
+    total_bytes = sum(os.path.getsize(source.path) for source in sources)
+    return max(math.ceil(streaming.MEMORY_EXPANSION_FACTOR * total_bytes / memory_limit_bytes), 1)
+
+def run_diff(old_source, new_source, output_dir, adjustment_factor, exclude_na=False, log_to_console=print,
+             memory_limit_mb=streaming.DEFAULT_MEMORY_LIMIT_MB, work_dir=None, progress=None, export_format=None,
+             store_dir=None):
+    """두 비교 실행(결과 파일 또는 저장된 실행 ID)을 키로 맞추어 상태가 바뀐 행과 DIFF 변화를 보고서로 쓰는 함수
+
+    두 실행을 키 해시로 같은 파티션 파일에 나눈 뒤 파티션마다 해시 조인하므로, 메모리에는 파티션 하나만 올라갑니다.
+    보고서 행은 파티션 순서로, 파티션 안에서는 새 실행(only_old는 이전 실행)의 ROW 순서로 쓰입니다.
+    """
+    progress = ensure_reporter(progress)
+    sources = [resolve_source(old_source, store_dir), resolve_source(new_source, store_dir)]
+    memory_limit_bytes = memory_limit_mb * 1024 * 1024
+    bucket_count = estimate_bucket_count(sources, memory_limit_bytes)
+    chunk_rows = max(memory_limit_bytes // (streaming.MEMORY_EXPANSION_FACTOR * 2 * ESTIMATED_ROW_BYTES), 1000)
+
+    os.makedirs(output_dir, exist_ok=True)
+    extension = export.EXPORT_FORMATS[export_format or export.FORMAT_CSV][1]
+    paths = {name: os.path.join(output_dir, f"{name}{extension}") for name in RUN_DIFF_REPORTS}
+    counts = dict.fromkeys(RUN_DIFF_REPORTS, 0)
+    matched_rows = 0
+    max_abs_delta = np.nan
+
+    with tempfile.TemporaryDirectory(prefix='bel_comparator_', dir=work_dir) as temp_dir:
+        # 1단계: 두 실행을 키 해시 파티션으로 분할
+        bucket_paths = [[os.path.join(temp_dir, f'{side}_{i}.pkl') for i in range(bucket_count)] for side in ('old', 'new')]
+        in_memory = []
+        row_counts = []
+        with progress.measure(STAGE_PARTITION) as stage:
+            for source, side_paths in zip(sources, bucket_paths):
+                row_count, chunks = partition_source(source, chunk_rows, bucket_count, side_paths, progress)
+                row_counts.append(row_count)
+                in_memory.append(chunks)
+                log_to_console(f"실행 읽기 완료: {source.label} ({row_count:,}행)")
+            stage['rows'] = sum(row_counts)
+
+        # 2단계: 파티션마다 해시 조인하여 보고서에 이어 씀
+        dtypes = {col: np.dtype(object) if col in ('POL_NO', 'RIDER_PRD_CODE') else
+                  np.dtype(np.int64) if col == 'ROW' else np.dtype(np.float64) for col in RESULT_COLUMNS}
+        with progress.measure(STAGE_RUN_DIFF) as stage, contextlib.ExitStack() as stack:
+            writers = {name: stack.enter_context(export.ResultWriter(paths[name], export_format)) for name in RUN_DIFF_REPORTS}
+            for bucket_id in range(bucket_count):
+                if bucket_count == 1:
+                    parts = [pd.concat(chunks, ignore_index=True) if chunks else streaming.empty_frame(RESULT_COLUMNS, dtypes)
+                             for chunks in in_memory]
+                    in_memory = []
+                else:
+                    parts = [streaming.read_bucket(side_paths[bucket_id], RESULT_COLUMNS, dtypes)
+                             for side_paths in bucket_paths]
+                reports, bucket_matched, bucket_max_delta = diff_bucket(*parts, adjustment_factor, exclude_na)
+                matched_rows += bucket_matched
+                max_abs_delta = np.fmax(max_abs_delta, bucket_max_delta)
+                for name, report in reports.items():
+                    if len(report):
+                        writers[name].write(report)
+                        counts[name] += len(report)
+                progress.update(STAGE_RUN_DIFF, bucket_id + 1, bucket_count)
+
+            for name, writer in writers.items():
+                if writer.row_count == 0:
+                    # 행이 없어도 헤더(또는 스키마)는 쓰도록 빈 보고서를 한 번 씀
+                    writer.write(report_frame(streaming.empty_frame(RESULT_COLUMNS, dtypes), None, None))
+            stage['rows'] = sum(row_counts)
+
+    counts.update({'old_rows': row_counts[0], 'new_rows': row_counts[1], 'matched_rows': matched_rows})
+    max_abs_delta = None if np.isnan(max_abs_delta) else float(max_abs_delta)
+    summary_path = os.path.join(output_dir, SUMMARY_FILE_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'old': sources[0].label if sources[0].run is not None else os.path.abspath(sources[0].path),
+            'new': sources[1].label if sources[1].run is not None else os.path.abspath(sources[1].path),
+            'adjustment_factor': adjustment_factor,
+            'exclude_na': exclude_na,
+            'counts': counts,
+            'max_abs_diff_delta': max_abs_delta,
+        }, f, ensure_ascii=False, indent=2)
+    return RunDiff(counts, max_abs_delta, list(paths.values()) + [summary_path])
+
+def format_summary(run_diff_result):
+    """실행 비교 결과 요약을 콘솔에 출력할 문자열 목록으로 반환하는 함수"""
+    counts = run_diff_result.counts
+    max_abs_delta = run_diff_result.max_abs_delta
+    return [
+        f"Old Rows: {counts['old_rows']}",
+        f"New Rows: {counts['new_rows']}",
+        f"Matched Rows: {counts['matched_rows']}",
+        f"Newly Failing: {counts['newly_failing']}",
+        f"Newly Passing: {counts['newly_passing']}",
+        f"Changed: {counts['changed']}",
+        f"Only Old: {counts['only_old']}",
+        f"Only New: {counts['only_new']}",
+        f"Max |DIFF_DELTA|: {'N/A' if max_abs_delta is None else f'{max_abs_delta:.6f}'}",
+    ]
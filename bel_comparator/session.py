@@ -0,0 +1,189 @@
+import os
+
+import numpy as np
+import pandas as pd
+from bel_comparator import BELComparator
+from bel_comparator.key_index import KEY_COLUMNS, decode_categorical, encode_keys, merged_codes, outer_join, take_rows
+from bel_comparator.progress import (
+    STAGE_LOAD_FIRST, STAGE_LOAD_SECOND, STAGE_VALIDATE, STAGE_MERGE, STAGE_DIAGNOSTICS, STAGE_INDEX, ensure_reporter
+)
+import bel_comparator.data_processing as data_processing
+import bel_comparator.diagnostics as diagnostics
+
+def session_file_signature(file_name):
+    """파일 경로, 크기, 수정 시각으로 세션에서 파일 변경 여부를 판단할 값을 반환하는 함수 (내용 해시는 cache.file_fingerprint)"""
+    stat = os.stat(file_name)
+    return os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns
+
+class ComparisonSession:
+    """두 CSV 파일의 키 정렬(병합) 결과를 보관하여 BEL 값, 범위만 바뀐 재비교를 빠르게 수행하는 클래스
+
+    전체 First 파일과 Second 파일을 한 번 외부 병합해 두고, 범위 [start, end]에 대한 병합 결과는
+    키 그룹 단위로 범위 밖의 First 행을 제외하여 만듭니다. 결과는 run_comparison과 같습니다.
+    """
+
+    def __init__(self):
+        self.signatures = None  # (First, Second) 파일 서명
+        self.inno_row_count = 0
+        self.pw_row_count = 0
+        self.aligned = None  # 전체 병합 결과의 POL_NO, RIDER_PRD_CODE, LOA_CODE(범주형), BEL 컬럼
+        self.inno_rows = None  # 병합 행별 First 파일 행 번호 (없으면 -1)
+        self.groups = None  # 병합 행별 키 그룹 번호 (병합 결과 순서대로 증가)
+        self.group_count = 0
+        self.valid_keys = None  # 병합 행의 키에 NaN이 없는지 여부
+        self.first_of_pw = None  # Second 행이 병합 결과에 처음 나타나는 행인지 여부
+        self.group_codes = None  # 키 그룹별 키 컬럼 사전 코드 {컬럼: (코드 배열, 정렬된 고유값)}
+        self.group_second_counts = None  # 키 그룹별 Second 행 수
+        self.key_dtypes = None  # 결과 키 컬럼별 (Second, First) 배열 dtype
+
+    def load(self, inno_csv_path, pw_csv_path, chunksize, log_to_console, progress=None):
+        """파일 서명이 바뀐 경우에만 두 CSV를 다시 읽고 키 정렬을 다시 계산합니다."""
+        progress = ensure_reporter(progress)
+        signatures = (session_file_signature(inno_csv_path), session_file_signature(pw_csv_path))
+        if signatures == self.signatures:
+            log_to_console("CSV 파일 변경 없음: 이전 로드 결과를 사용합니다.")
+            return
+
+        with progress.measure(STAGE_LOAD_FIRST) as stage:
+            inno_df = data_processing.load_input_csv(inno_csv_path, chunksize, progress, STAGE_LOAD_FIRST, KEY_COLUMNS, None, 1)
+            stage['rows'] = len(inno_df)
+        log_to_console(f"Innolink CSV 파일 로드 완료: {inno_csv_path}")
+        with progress.measure(STAGE_LOAD_SECOND) as stage:
+            pw_df = data_processing.load_input_csv(pw_csv_path, chunksize, progress, STAGE_LOAD_SECOND, KEY_COLUMNS + ['BEL'], None, 1)
+            stage['rows'] = len(pw_df)
+        log_to_console(f"Pathwise CSV 파일 로드 완료: {pw_csv_path}")
+        with progress.measure(STAGE_VALIDATE):
+            BELComparator(inno_df, pw_df, []).validate_columns()
+
+        self.signatures = None  # 정렬 계산이 끝나기 전에 취소되면 다음 비교에서 다시 로드
+        with progress.measure(STAGE_MERGE) as stage:
+            self.align(inno_df, pw_df, progress)
+            stage['rows'] = len(self.inno_rows)
+        self.signatures = signatures
+
+    def align(self, inno_df, pw_df, progress):
+        """전체 First 행과 Second 행을 키로 외부 병합하여 행 번호 대응을 계산합니다."""
+        progress.update(STAGE_MERGE, 0, len(pw_df))
+        encoding = encode_keys([pw_df, inno_df])
+        pw_rows, inno_rows = outer_join(encoding.keys[0], encoding.keys[1])
+
+        # 외부 병합 결과는 키 코드 순서로 정렬되므로 같은 키의 행은 연속해 있습니다.
+        keys = merged_codes(encoding.keys, pw_rows, inno_rows)
+        groups = np.cumsum(np.r_[False, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype=np.int64)
+        self.first_of_pw = (pw_rows >= 0) & np.r_[True, pw_rows[1:] != pw_rows[:-1]]
+        self.inno_rows = inno_rows
+        self.groups = groups
+        self.group_count = int(groups[-1]) + 1 if len(groups) else 0
+        self.valid_keys = merged_codes(encoding.valid, pw_rows, inno_rows)
+        group_start = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype=np.int64)
+        self.group_codes = {
+            col: (merged_codes(encoding.columns[col][0], pw_rows[group_start], inno_rows[group_start]), encoding.columns[col][1])
+            for col in KEY_COLUMNS
+        }
+        self.group_second_counts = np.bincount(groups[self.first_of_pw], minlength=self.group_count)
+        self.aligned = pd.DataFrame({
+            col: decode_categorical(merged_codes(encoding.columns[col][0], pw_rows, inno_rows), encoding.columns[col][1])
+            for col in ['POL_NO', 'RIDER_PRD_CODE', 'LOA_CODE']
+        }).assign(BEL=take_rows(pw_df['BEL'].to_numpy(dtype=np.float64, na_value=np.nan), pw_rows, np.nan))
+        self.key_dtypes = {
+            col: (pw_df[col].iloc[:0].to_numpy().dtype, inno_df[col].iloc[:0].to_numpy().dtype)
+            for col in ['POL_NO', 'RIDER_PRD_CODE', 'LOA_CODE']
+        }
+        self.inno_row_count = len(inno_df)
+        self.pw_row_count = len(pw_df)
+        progress.update(STAGE_MERGE, len(pw_rows), len(pw_rows))
+
+    def compare(self, bel_input_text, start_str, end_str, adjustment_factor_str, default_adjustment_factor, progress=None):
+        """보관한 키 정렬로 범위와 BEL 값에 대한 비교 결과(ComparisonRun)를 계산합니다."""
+        progress = ensure_reporter(progress)
+        with progress.measure(STAGE_INDEX) as stage:
+            comparison = self.compare_range(bel_input_text, start_str, end_str, adjustment_factor_str, default_adjustment_factor)
+            stage['rows'] = len(comparison.result)
+        with progress.measure(STAGE_DIAGNOSTICS) as stage:
+            key_diagnostics = self.diagnose_range(start_str, end_str)
+            stage['rows'] = key_diagnostics.key_count
+        return comparison._replace(key_diagnostics=key_diagnostics)
+
+    def diagnose_range(self, start_str, end_str):
+        """범위 [start, end]의 First 행과 전체 Second 행에 대한 키 진단 결과(KeyDiagnostics)를 계산합니다."""
+        start, end = data_processing.resolve_range(start_str, end_str, self.inno_row_count)
+        range_end = min(end + 1, self.inno_row_count)
+        in_range = (self.inno_rows >= start) & (self.inno_rows < range_end)
+
+        # 병합 행에는 First 행이 같은 키의 Second 행 수만큼 반복되어 있음
+        second_counts = self.group_second_counts
+        first_counts = np.bincount(self.groups[in_range], minlength=self.group_count) // np.maximum(second_counts, 1)
+        first_rows = np.full(self.group_count, np.iinfo(np.int64).max)
+        np.minimum.at(first_rows, self.groups[in_range], self.inno_rows[in_range])
+        first_rows[first_rows == np.iinfo(np.int64).max] = -1
+
+        def describe(group_ids):
+            column_codes = {col: (codes[group_ids], uniques) for col, (codes, uniques) in self.group_codes.items()}
+            return diagnostics.key_frame(column_codes, first_rows[group_ids])
+
+        return diagnostics.diagnose_keys(second_counts, first_counts, describe)
+
+    def compare_range(self, bel_input_text, start_str, end_str, adjustment_factor_str, default_adjustment_factor):
+        """범위의 병합 행 선택, BEL 값 배치, 인덱스 조회를 벡터 연산으로 수행합니다."""
+        start, end = data_processing.resolve_range(start_str, end_str, self.inno_row_count)
+        range_end = min(end + 1, self.inno_row_count)
+        inno_count = max(range_end - start, 0)
+        adjustment_factor = data_processing.parse_adjustment_factor(adjustment_factor_str, default_adjustment_factor)
+        bel_values = BELComparator.parse_bel_values(bel_input_text)
+
+        inno_rows = self.inno_rows
+        in_range = (inno_rows >= start) & (inno_rows < range_end)
+        group_in_range = np.zeros(self.group_count, dtype=bool)
+        group_in_range[self.groups[in_range]] = True
+
+        # 범위 안에 같은 키의 First 행이 없는 Second 행은 한 번만, 매칭 없는 행으로 남음
+        unmatched = (inno_rows >= 0) & ~group_in_range[self.groups] & self.first_of_pw
+        keep = in_range | (inno_rows < 0) | unmatched
+        row_numbers = np.cumsum(keep) - 1
+
+        answer_bel = self.aligned['BEL'].to_numpy(dtype=np.float64, na_value=np.nan)
+        selected = np.flatnonzero(keep & ~np.isnan(answer_bel))
+        matched = in_range[selected]
+
+        # 범위 내 위치에 해당하는 BEL 값 (부족한 부분은 NaN)
+        input_bel = np.full(len(selected), np.nan)
+        offsets = inno_rows[selected[matched]] - start
+        input_bel[np.flatnonzero(matched)[offsets < len(bel_values)]] = bel_values[offsets[offsets < len(bel_values)]]
+
+        # 키 그룹별 범위 내 첫 First 행 번호 (NaN 키는 조회하지 않음)
+        first_rows = np.full(self.group_count, np.iinfo(np.int64).max)
+        np.minimum.at(first_rows, self.groups[in_range], inno_rows[in_range])
+        index = first_rows[self.groups[selected]]
+        index_na = (index == np.iinfo(np.int64).max) | ~self.valid_keys[selected]
+
+        result = pd.DataFrame({
+            'ROW': row_numbers[selected],
+            'INDEX': pd.arrays.IntegerArray(np.where(index_na, 0, index), index_na),
+            'POL_NO': self.key_categorical('POL_NO', selected, inno_count),
+            'RIDER_PRD_CODE': self.key_categorical('RIDER_PRD_CODE', selected, inno_count),
+            'ANSWER_BEL': answer_bel[selected],
+            'INPUT_BEL': input_bel,
+            'DIFF': answer_bel[selected] - input_bel,
+        }, index=row_numbers[selected])
+        loa_code = self.key_categorical('LOA_CODE', selected, inno_count)
+        return data_processing.ComparisonRun(result, inno_count, self.pw_row_count, adjustment_factor, None, loa_code)
+
+    def key_categorical(self, col, selected, inno_count):
+        """병합 행 selected의 키 컬럼을 run_comparison과 같은 범주 dtype의 범주형 배열로 반환합니다.
+
+        compare_bel은 Second와 범위의 First 키 컬럼 중 비어 있지 않은 것만 이어 붙여 사전을 만들므로,
+        범주 dtype은 전체 First가 아니라 범위가 비었는지에 따라 정해집니다. (예: 빈 범위에서는 Second의 정수형)
+        """
+        values = self.aligned[col].array.take(selected).remove_unused_categories()
+        pw_dtype, inno_dtype = self.key_dtypes[col]
+        dtypes = [dtype for dtype, rows in ((pw_dtype, self.pw_row_count), (inno_dtype, inno_count)) if rows]
+        dtype = np.result_type(*(dtypes or [pw_dtype, inno_dtype]))
+        if values.categories.dtype != dtype:
+            values = pd.Categorical.from_codes(values.codes, categories=values.categories.astype(dtype))
+        return values
+
+    def run(self, inno_csv_path, pw_csv_path, bel_input_text, start_str, end_str,
+            adjustment_factor_str, default_adjustment_factor, chunksize, log_to_console, progress=None):
+        """run_comparison과 같은 인자로 필요한 경우에만 파일을 다시 읽고 비교를 수행합니다."""
+        self.load(inno_csv_path, pw_csv_path, chunksize, log_to_console, progress)
+        return self.compare(bel_input_text, start_str, end_str, adjustment_factor_str, default_adjustment_factor, progress)
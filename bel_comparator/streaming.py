@@ -0,0 +1,213 @@
+import math
+import os
+import pickle
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from bel_comparator import BELComparator
+from bel_comparator.key_index import KEY_COLUMNS, BOUNDARY_SAMPLE_SIZE, compute_boundaries
+from bel_comparator.progress import (
+    STAGE_LOAD_FIRST, STAGE_LOAD_SECOND, STAGE_PARTITION, STAGE_BUCKET, ensure_reporter
+)
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.utils as utils
+
+# 스트리밍 비교의 기본 메모리 한도 (MB)
+DEFAULT_MEMORY_LIMIT_MB = 1024
+# 병합 등 처리 과정에서 CSV 텍스트 크기 대비 필요한 메모리 배수 (추정치)
+MEMORY_EXPANSION_FACTOR = 4
+
+# 스트리밍 비교의 실행 결과
+StreamingRun = namedtuple('StreamingRun', ['result_rows', 'error_count', 'inno_count', 'pw_count', 'adjustment_factor'])
+
+# 한 파일의 스캔 결과 (헤더 컬럼, 컬럼별 dtype, 행 수, POL_NO 샘플)
+CsvScan = namedtuple('CsvScan', ['columns', 'dtypes', 'row_count', 'pol_no_sample'])
+
+def read_chunks(file_name, usecols, chunksize):
+    """필요한 컬럼만 대문자 컬럼명으로 청크 단위로 읽는 제너레이터"""
+    wanted_columns = {col.upper() for col in usecols}
+    for chunk in pd.read_csv(file_name, chunksize=chunksize, usecols=lambda col: col.upper() in wanted_columns):
+        chunk.columns = [col.upper() for col in chunk.columns]
+        yield chunk
+
+def scan_csv(file_name, usecols, chunksize, sample_step, progress, stage):
+    """CSV 파일을 한 번 읽어 컬럼별 dtype, 행 수, POL_NO 샘플을 수집하는 함수
+
+    dtype은 load_csv_with_chunksize와 같은 규칙(정수 축소 후 청크 간 공통 타입)으로 정해지므로
+    파티션별로 읽어도 메모리 내 비교와 같은 타입으로 병합됩니다.
+    """
+    wanted_columns = {col.upper() for col in usecols}
+    header = pd.read_csv(file_name, nrows=0).columns
+    columns = [col.upper() for col in header if col.upper() in wanted_columns]
+    dtypes = {}
+    samples = []
+    row_count = 0
+    total_rows = utils.count_csv_rows(file_name)
+    progress.update(stage, 0, total_rows)
+
+    for chunk in read_chunks(file_name, usecols, chunksize):
+        for col in chunk.columns:
+            dtype = utils.narrow_integer(chunk[col].to_numpy()).dtype
+            dtypes[col] = np.result_type(dtypes[col], dtype) if col in dtypes else dtype
+        if 'POL_NO' in chunk.columns:
+            samples.append(chunk['POL_NO'].to_numpy()[::sample_step])
+        row_count += len(chunk)
+        progress.update(stage, row_count, max(total_rows, row_count))
+
+    for col in columns:
+        dtypes.setdefault(col, np.dtype(object))  # 헤더만 있는 파일
+    sample = np.concatenate(samples) if samples else np.empty(0)
+    return CsvScan(columns, dtypes, row_count, sample)
+
+def empty_frame(columns, dtypes):
+    """주어진 컬럼과 dtype으로 빈 DataFrame을 생성하는 함수"""
+    return pd.DataFrame({col: np.empty(0, dtype=dtypes[col]) for col in columns})
+
+def append_to_buckets(chunk, boundaries, bucket_paths):
+    """청크를 POL_NO 범위에 따라 나누어 각 파티션 파일 뒤에 추가하는 함수"""
+    bucket_ids = np.searchsorted(boundaries, chunk['POL_NO'].to_numpy(), side='right')
+    for bucket_id in np.unique(bucket_ids):
+        with open(bucket_paths[bucket_id], 'ab') as f:
+            pickle.dump(chunk[bucket_ids == bucket_id], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def read_bucket(path, columns, dtypes):
+    """파티션 파일에 추가된 청크들을 읽어 하나의 DataFrame으로 반환하는 함수"""
+    parts = []
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    parts.append(pickle.load(f))
+                except EOFError:
+                    break
+    return pd.concat(parts) if parts else empty_frame(columns, dtypes)
+
+def partition_inno_csv(file_name, scan, chunksize, start, end, bel_values, boundaries, bucket_paths, progress):
+    """First CSV의 [start, end] 범위 행에 BEL 값을 붙여 파티션 파일로 나누는 함수"""
+    position = 0
+    for chunk in read_chunks(file_name, KEY_COLUMNS, chunksize):
+        chunk = chunk.astype(scan.dtypes)
+        chunk.index = pd.RangeIndex(position, position + len(chunk))  # 파일 내 행 번호 = INDEX
+        position += len(chunk)
+
+        chunk = chunk[(chunk.index >= start) & (chunk.index <= end)]
+        if len(chunk):
+            # 범위 내 위치에 해당하는 BEL 값 (부족한 부분은 NaN)
+            offsets = chunk.index.to_numpy() - start
+            bel = np.full(len(chunk), np.nan)
+            in_range = offsets < len(bel_values)
+            bel[in_range] = bel_values[offsets[in_range]]
+            chunk = chunk.assign(INNOLINC_BEL=bel)
+            append_to_buckets(chunk, boundaries, bucket_paths)
+        progress.update(STAGE_PARTITION, position, scan.row_count)
+
+def partition_pw_csv(file_name, scan, chunksize, boundaries, bucket_paths, progress):
+    """Second CSV를 파티션 파일로 나누는 함수"""
+    position = 0
+    for chunk in read_chunks(file_name, KEY_COLUMNS + ['BEL'], chunksize):
+        position += len(chunk)
+        append_to_buckets(chunk.astype(scan.dtypes), boundaries, bucket_paths)
+        progress.update(STAGE_PARTITION, position, scan.row_count)
+
+def find_oversized_pol_nos(sample, total_bytes, memory_limit_bytes):
+    """POL_NO 샘플에서 한 값의 행만으로 추정 메모리가 한도를 넘는 POL_NO 목록을 반환하는 함수
+
+    파티션은 POL_NO 범위로 나누므로 같은 POL_NO(빈 값 포함)의 행은 항상 한 파티션에 들어가
+    파티션 수를 늘려도 한도 안으로 나눌 수 없습니다.
+    """
+    shares = pd.Series(sample).value_counts(normalize=True, dropna=False)
+    estimated_bytes = shares * MEMORY_EXPANSION_FACTOR * total_bytes
+    return list(estimated_bytes[estimated_bytes > memory_limit_bytes].index)
+
+def estimate_chunksize(file_name, row_count_hint, memory_limit_bytes):
+    """메모리 한도 안에서 한 번에 읽을 행 수를 평균 행 길이로 추정하는 함수"""
+    average_row_bytes = max(os.path.getsize(file_name) / max(row_count_hint, 1), 1)
+    return max(int(memory_limit_bytes / (MEMORY_EXPANSION_FACTOR * 2 * average_row_bytes)), 1000)
+
+def run_streaming_comparison(inno_csv_path, pw_csv_path, bel_input_text, start_str, end_str,
+                             adjustment_factor_str, default_adjustment_factor, output_path,
+                             diff_only, exclude_na, log_to_console,
+                             memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, work_dir=None, progress=None, export_format=None):
+    """두 CSV를 POL_NO 범위 파티션으로 디스크에 나누어 파티션별로 비교하고 결과를 CSV로 스트리밍하는 함수
+
+    결과 파일(형식은 export_format 또는 확장자로 결정)은 메모리 내 비교(run_comparison + export_result)로 만든 파일과 같으며,
+    최대 메모리는 memory_limit_mb에 맞춰 파티션 수와 청크 크기를 조절해 제한합니다.
+    한 POL_NO의 행만으로 한도를 넘으면 그 파티션은 한도를 넘으므로 경고를 기록합니다.
+    """
+    progress = ensure_reporter(progress)
+    memory_limit_bytes = memory_limit_mb * 1024 * 1024
+    bel_values = BELComparator.parse_bel_values(bel_input_text)
+    adjustment_factor = data_processing.parse_adjustment_factor(adjustment_factor_str, default_adjustment_factor)
+
+    # 1단계: 두 파일을 훑어 dtype, 행 수, 파티션 경계용 샘플 수집
+    inno_rows_hint = utils.count_csv_rows(inno_csv_path)
+    pw_rows_hint = utils.count_csv_rows(pw_csv_path)
+    inno_chunksize = estimate_chunksize(inno_csv_path, inno_rows_hint, memory_limit_bytes)
+    pw_chunksize = estimate_chunksize(pw_csv_path, pw_rows_hint, memory_limit_bytes)
+    sample_step = max((inno_rows_hint + pw_rows_hint) // BOUNDARY_SAMPLE_SIZE, 1)
+
+    with progress.measure(STAGE_LOAD_FIRST) as stage:
+        inno_scan = scan_csv(inno_csv_path, KEY_COLUMNS, inno_chunksize, sample_step, progress, STAGE_LOAD_FIRST)
+        stage['rows'] = inno_scan.row_count
+    log_to_console(f"Innolink CSV 파일 스캔 완료: {inno_csv_path}")
+    with progress.measure(STAGE_LOAD_SECOND) as stage:
+        pw_scan = scan_csv(pw_csv_path, KEY_COLUMNS + ['BEL'], pw_chunksize, sample_step, progress, STAGE_LOAD_SECOND)
+        stage['rows'] = pw_scan.row_count
+    log_to_console(f"Pathwise CSV 파일 스캔 완료: {pw_csv_path}")
+
+    # 필수 컬럼은 헤더만으로 먼저 검증
+    BELComparator(empty_frame(inno_scan.columns, inno_scan.dtypes),
+                  empty_frame(pw_scan.columns, pw_scan.dtypes), bel_values[:0]).validate_and_prepare_data()
+
+    start, end = data_processing.resolve_range(start_str, end_str, inno_scan.row_count)
+    inno_count = max(min(end + 1, inno_scan.row_count) - start, 0)
+
+    total_bytes = os.path.getsize(inno_csv_path) + os.path.getsize(pw_csv_path)
+    bucket_count = max(math.ceil(MEMORY_EXPANSION_FACTOR * total_bytes / memory_limit_bytes), 1)
+    pol_no_sample = np.concatenate([inno_scan.pol_no_sample, pw_scan.pol_no_sample])
+    boundaries = compute_boundaries(pol_no_sample, bucket_count)
+    oversized = find_oversized_pol_nos(pol_no_sample, total_bytes, memory_limit_bytes)
+    if oversized:
+        log_to_console(f"주의: POL_NO {', '.join(map(str, oversized))}의 행이 많아 파티션으로 나눌 수 없으므로 "
+                       f"메모리 한도({memory_limit_mb}MB)를 넘을 수 있습니다.")
+
+    with tempfile.TemporaryDirectory(prefix='bel_comparator_', dir=work_dir) as temp_dir:
+        # 2단계: POL_NO 범위별 파티션 파일로 분할
+        inno_paths = [os.path.join(temp_dir, f'first_{i}.pkl') for i in range(len(boundaries) + 1)]
+        pw_paths = [os.path.join(temp_dir, f'second_{i}.pkl') for i in range(len(boundaries) + 1)]
+        with progress.measure(STAGE_PARTITION) as stage:
+            partition_inno_csv(inno_csv_path, inno_scan, inno_chunksize, start, end, bel_values,
+                               boundaries, inno_paths, progress)
+            partition_pw_csv(pw_csv_path, pw_scan, pw_chunksize, boundaries, pw_paths, progress)
+            stage['rows'] = inno_scan.row_count + pw_scan.row_count
+        log_to_console(f"파티션 분할 완료: {len(inno_paths)}개")
+
+        # 3단계: 파티션 순서대로 비교하여 결과를 이어 씀
+        result_rows = 0
+        error_count = 0
+        row_offset = 0
+        with progress.measure(STAGE_BUCKET) as stage, export.ResultWriter(output_path, export_format) as writer:
+            for bucket_id, (inno_path, pw_path) in enumerate(zip(inno_paths, pw_paths)):
+                inno_part = read_bucket(inno_path, inno_scan.columns + ['INNOLINC_BEL'],
+                                        {**inno_scan.dtypes, 'INNOLINC_BEL': np.dtype(np.float64)})
+                pw_part = read_bucket(pw_path, pw_scan.columns, pw_scan.dtypes)
+
+                comparator = BELComparator(inno_part, pw_part, inno_part.pop('INNOLINC_BEL').to_numpy())
+                comparator.validate_and_prepare_data()
+                result = comparator.compare_bel()
+                result['ROW'] += row_offset
+                row_offset += comparator.merged_row_count
+
+                diff = data_processing.diff_array(result)
+                mask = data_processing.filter_mask(diff, diff_only, exclude_na, adjustment_factor)
+                filtered = data_processing.filter_result(result, mask)
+                error_count += data_processing.count_errors(diff[mask], adjustment_factor, exclude_na)
+                writer.write(filtered)
+                result_rows += len(filtered)
+                progress.update(STAGE_BUCKET, bucket_id + 1, len(inno_paths))
+            stage['rows'] = result_rows
+
+    return StreamingRun(result_rows, error_count, inno_count, pw_scan.row_count, adjustment_factor)
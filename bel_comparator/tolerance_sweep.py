@@ -0,0 +1,77 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from bel_comparator.custom_exceptions import InvalidInputError
+import bel_comparator.data_processing as data_processing
+
+# 스윕할 허용오차를 입력하지 않았을 때 사용할 기본 허용오차 목록
+DEFAULT_SWEEP = '0.000001,0.00001,0.0001,0.001,0.01,0.1,1'
+# 범위 입력(시작:종료:간격)으로 만들 수 있는 최대 허용오차 수
+MAX_SWEEP_POINTS = 100000
+
+# 허용오차 스윕용으로 한 번 정렬해 둔 DIFF
+#   abs_diff: N/A가 아닌 행의 |DIFF| 오름차순 배열, na_count: N/A 행 수
+SortedDiff = namedtuple('SortedDiff', ['abs_diff', 'na_count'])
+
+def parse_tolerance(text):
+    """허용오차 값 하나를 parse_adjustment_factor와 같은 범위로 검증하여 반환하는 함수"""
+    try:
+        tolerance = data_processing.parse_adjustment_factor(text, None)
+    except ValueError:
+        tolerance = None
+    if tolerance is None or np.isnan(tolerance):
+        raise InvalidInputError(f"허용오차 값이 올바르지 않습니다: {text}")
+    return tolerance
+
+def parse_tolerances(text):
+    """쉼표로 구분한 허용오차 값 또는 범위(시작:종료:간격, 종료 포함)를 오름차순 고유 허용오차 배열로 반환하는 함수"""
+    values = []
+    for token in (token.strip() for token in text.split(',')):
+        if not token:
+            continue
+        if ':' not in token:
+            values.append(parse_tolerance(token))
+            continue
+
+        parts = token.split(':')
+        if len(parts) != 3:
+            raise InvalidInputError(f"허용오차 범위는 시작:종료:간격 형식이어야 합니다: {token}")
+        start, stop = parse_tolerance(parts[0]), parse_tolerance(parts[1])
+        try:
+            step = float(parts[2])
+        except ValueError:
+            raise InvalidInputError(f"허용오차 범위의 간격이 올바르지 않습니다: {token}")
+        if not step > 0 or stop < start:
+            raise InvalidInputError(f"허용오차 범위는 시작 ≤ 종료, 간격 > 0이어야 합니다: {token}")
+
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1  # 부동소수점 오차로 종료 값이 빠지지 않도록 보정
+        if len(values) + count > MAX_SWEEP_POINTS:
+            raise InvalidInputError(f"허용오차는 최대 {MAX_SWEEP_POINTS:,}개까지 스윕할 수 있습니다.")
+        values.extend(np.round(start + step * np.arange(count), 12))
+
+    if not values:
+        raise InvalidInputError("스윕할 허용오차를 입력하세요.")
+    if len(values) > MAX_SWEEP_POINTS:
+        raise InvalidInputError(f"허용오차는 최대 {MAX_SWEEP_POINTS:,}개까지 스윕할 수 있습니다.")
+    return np.unique(np.asarray(values, dtype=np.float64))
+
+def sort_diff(diff):
+    """DIFF 배열의 N/A가 아닌 |DIFF|를 한 번 정렬하여 SortedDiff로 반환하는 함수"""
+    valid = ~np.isnan(diff)
+    abs_diff = np.abs(diff[valid])
+    abs_diff.sort()
+    return SortedDiff(abs_diff, len(diff) - len(abs_diff))
+
+def sweep_error_counts(sorted_diff, tolerances):
+    """허용오차별 에러 수(N/A 포함/제외) 표를 반환하는 함수
+
+    에러는 count_errors와 같은 기준(|DIFF| > 허용오차)이고, 정렬한 |DIFF|에 대한 searchsorted로
+    허용오차 하나당 이진 탐색 한 번씩 계산하므로 결과 행을 다시 훑지 않습니다.
+    """
+    over_tolerance = len(sorted_diff.abs_diff) - np.searchsorted(sorted_diff.abs_diff, tolerances, side='right')
+    return pd.DataFrame({
+        'TOLERANCE': tolerances,
+        'ERRORS': over_tolerance + sorted_diff.na_count,
+        'ERRORS_EXCLUDE_NA': over_tolerance,
+    })
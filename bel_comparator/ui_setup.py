@@ -1,9 +1,10 @@
 from PyQt5.QtWidgets import (
-    QVBoxLayout, QLabel, QPushButton, QTextEdit, QTableWidget,
+    QVBoxLayout, QLabel, QPushButton, QTextEdit, QTableView,
     QProgressBar, QHBoxLayout, QAbstractItemView, QLineEdit,
-    QRadioButton, QButtonGroup, QCheckBox
+    QRadioButton, QButtonGroup, QCheckBox, QHeaderView, QTabWidget, QWidget, QDialog
 )
 from PyQt5.QtCore import Qt
+from bel_comparator.result_model import ResultTableModel
 
 def init_ui(app_instance):
     """UI를 초기화하는 함수"""
@@ -19,9 +20,20 @@ def init_ui(app_instance):
     app_instance.pw_button.clicked.connect(app_instance.load_pw_csv)
     layout.addWidget(app_instance.pw_button)
 
-    # BEL 값 입력란
-    layout.addWidget(QLabel("BEL 값 입력"))
+    # BEL 값 입력란 (대량의 값은 입력란을 거치지 않고 파일/클립보드에서 바로 불러오기)
+    bel_label_layout = QHBoxLayout()
+    bel_label_layout.addWidget(QLabel("BEL 값 입력"))
+    bel_label_layout.addStretch()
+    app_instance.bel_file_button = QPushButton('BEL 파일 불러오기')
+    app_instance.bel_file_button.clicked.connect(app_instance.load_bel_file)
+    bel_label_layout.addWidget(app_instance.bel_file_button)
+    app_instance.bel_clipboard_button = QPushButton('클립보드에서 불러오기')
+    app_instance.bel_clipboard_button.clicked.connect(app_instance.load_bel_clipboard)
+    bel_label_layout.addWidget(app_instance.bel_clipboard_button)
+    layout.addLayout(bel_label_layout)
+
     app_instance.bel_input = QTextEdit()
+    app_instance.bel_input.textChanged.connect(app_instance.on_bel_input_changed)
     layout.addWidget(app_instance.bel_input)
 
     # 데이터 범위 설정 입력란과 라디오 버튼, 체크박스 그룹을 같은 행에 배치
@@ -40,6 +52,10 @@ def init_ui(app_instance):
     app_instance.end_input.setPlaceholderText("종료 (기본값: 최대값)")
     range_layout.addWidget(app_instance.end_input)
 
+    # 범위 밖 Second 전용 행을 제외하고 범위 안 First 행의 키만 비교 (큰 파일의 작은 범위를 빠르게 비교)
+    app_instance.range_keys_checkbox = QCheckBox("범위 키만 비교")
+    range_layout.addWidget(app_instance.range_keys_checkbox)
+
     range_and_options_layout.addLayout(range_layout, stretch=6)
 
     # 라디오 버튼 및 체크박스 레이아웃 추가
@@ -80,17 +96,31 @@ def init_ui(app_instance):
     app_instance.compare_button.clicked.connect(app_instance.compare_bel)
     compare_button_layout.addWidget(app_instance.compare_button)
 
+    app_instance.cancel_button = QPushButton('취소')
+    app_instance.cancel_button.setEnabled(False)
+    app_instance.cancel_button.clicked.connect(app_instance.cancel_comparison)
+    compare_button_layout.addWidget(app_instance.cancel_button)
+
     adjustment_and_button_layout.addLayout(compare_button_layout, stretch=4)
 
     layout.addLayout(adjustment_and_button_layout)
 
-    layout.addWidget(QLabel("비교 결과"))
-    app_instance.result_table = QTableWidget()
+    # 비교 결과, 요약 통계, 키 진단 보고서를 탭으로 구분하여 표시
+    app_instance.result_tabs = QTabWidget()
+    app_instance.result_model = ResultTableModel(app_instance)
+    app_instance.result_table = QTableView()
+    app_instance.result_table.setModel(app_instance.result_model)
     app_instance.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    app_instance.result_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)  # 행 높이 계산 생략
     app_instance.result_table.horizontalHeader().setSectionsClickable(True)
     app_instance.result_table.horizontalHeader().setSortIndicatorShown(True)
     app_instance.result_table.horizontalHeader().sectionClicked.connect(app_instance.handle_header_click)
-    layout.addWidget(app_instance.result_table)
+    app_instance.result_tabs.addTab(app_instance.result_table, "비교 결과")
+    app_instance.summary_tables = {}  # 요약 통계와 키 진단 탭은 첫 비교 결과를 표시할 때 추가 (add_report_tabs)
+    app_instance.diagnostic_tables = {}
+    app_instance.sweep_tab = None  # 허용오차 스윕 탭 (입력란과 표, add_report_tabs에서 추가)
+    app_instance.sweep_table = None
+    layout.addWidget(app_instance.result_tabs)
 
     layout.addWidget(QLabel("콘솔 출력"))
     app_instance.console_output = QTextEdit()
@@ -112,7 +142,16 @@ def init_ui(app_instance):
     app_instance.error_count_label = QLabel("Errors: 0")
     bottom_layout.addWidget(app_instance.error_count_label, alignment=Qt.AlignRight)
 
-    app_instance.export_button = QPushButton('CSV 내보내기')
+    # 체크하면 비교 결과를 결과 저장소(BEL_COMPARATOR_STORE_DIR)에 저장 (기본값: 저장하지 않음)
+    app_instance.store_checkbox = QCheckBox("결과 저장")
+    app_instance.store_checkbox.setToolTip("비교 결과를 결과 저장소에 저장하여 '저장된 결과 열기'로 다시 열 수 있게 합니다.")
+    bottom_layout.addWidget(app_instance.store_checkbox, alignment=Qt.AlignRight)
+
+    app_instance.open_run_button = QPushButton('저장된 결과 열기')
+    app_instance.open_run_button.clicked.connect(app_instance.open_stored_run)
+    bottom_layout.addWidget(app_instance.open_run_button, alignment=Qt.AlignRight)
+
+    app_instance.export_button = QPushButton('결과 내보내기')
     app_instance.export_button.clicked.connect(app_instance.export_csv)
     bottom_layout.addWidget(app_instance.export_button, alignment=Qt.AlignRight)
 
@@ -148,6 +187,90 @@ def adjust_window_size(app_instance):
 
     app_instance.resize(window_width, window_height)
 
+def add_report_tabs(app_instance):
+    """요약 통계, 키 진단 보고서, 허용오차 스윕 탭을 추가하는 함수 (비교 엔진을 불러온 뒤 한 번 호출)"""
+    from bel_comparator.aggregation import GROUP_COLUMNS
+    from bel_comparator.diagnostics import DIAGNOSTIC_REPORTS
+
+    for col in GROUP_COLUMNS:
+        app_instance.summary_tables[col] = add_report_tab(app_instance, f"{col}별 요약")
+    for name, label in DIAGNOSTIC_REPORTS.items():
+        app_instance.diagnostic_tables[name] = add_report_tab(app_instance, label)
+    add_sweep_tab(app_instance)
+
+def create_report_table(app_instance):
+    """정렬 가능한 보고서 테이블을 만드는 함수 (모델은 table.model())"""
+    table = QTableView()
+    table.setModel(ResultTableModel(app_instance))
+    table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    table.setSortingEnabled(True)
+    return table
+
+def add_report_tab(app_instance, label):
+    """정렬 가능한 보고서 테이블 탭을 추가하고 테이블을 반환하는 함수"""
+    table = create_report_table(app_instance)
+    app_instance.result_tabs.addTab(table, label)
+    return table
+
+def add_sweep_tab(app_instance):
+    """허용오차 목록 입력란과 허용오차별 에러 수 표로 이루어진 탭을 추가하는 함수"""
+    from bel_comparator.tolerance_sweep import DEFAULT_SWEEP
+
+    app_instance.sweep_tab = QWidget()
+    tab_layout = QVBoxLayout(app_instance.sweep_tab)
+
+    input_layout = QHBoxLayout()
+    input_layout.addWidget(QLabel("허용오차 (쉼표로 구분하거나 시작:종료:간격)"))
+    app_instance.sweep_input = QLineEdit(DEFAULT_SWEEP)
+    app_instance.sweep_input.returnPressed.connect(app_instance.apply_tolerance_sweep)
+    input_layout.addWidget(app_instance.sweep_input)
+    sweep_button = QPushButton('스윕')
+    sweep_button.clicked.connect(app_instance.apply_tolerance_sweep)
+    input_layout.addWidget(sweep_button)
+    tab_layout.addLayout(input_layout)
+
+    app_instance.sweep_table = create_report_table(app_instance)
+    tab_layout.addWidget(app_instance.sweep_table)
+    app_instance.result_tabs.addTab(app_instance.sweep_tab, "허용오차 스윕")
+
+def select_stored_run(app_instance, runs):
+    """저장된 실행 목록 대화 상자를 띄우고 (동작 'open' 또는 'delete', runs의 행 위치) 또는 None을 반환하는 함수"""
+    dialog = QDialog(app_instance)
+    dialog.setWindowTitle('저장된 결과')
+    dialog.resize(int(app_instance.width() * 0.9), int(app_instance.height() * 0.6))
+    layout = QVBoxLayout(dialog)
+
+    table = create_report_table(app_instance)
+    table.setSelectionBehavior(QAbstractItemView.SelectRows)
+    table.setSelectionMode(QAbstractItemView.SingleSelection)
+    table.model().set_result(runs)
+    table.selectRow(0)
+    layout.addWidget(table)
+
+    selection = {}
+
+    def finish(action):
+        rows = table.selectionModel().selectedRows()
+        if rows:
+            # 정렬된 화면의 행 번호를 목록의 행 위치로 변환
+            selection['result'] = (action, int(table.model().rows[rows[0].row()]))
+            dialog.accept()
+
+    button_layout = QHBoxLayout()
+    for label, action in (('열기', 'open'), ('삭제', 'delete')):
+        button = QPushButton(label)
+        button.clicked.connect(lambda checked, action=action: finish(action))
+        button_layout.addWidget(button)
+    close_button = QPushButton('닫기')
+    close_button.clicked.connect(dialog.reject)
+    button_layout.addWidget(close_button)
+    layout.addLayout(button_layout)
+    table.doubleClicked.connect(lambda index: finish('open'))
+
+    dialog.exec_()
+    return selection.get('result')
+
 def center(app_instance):
     """화면 중앙에 윈도우를 배치하는 함수"""
     qr = app_instance.frameGeometry()
@@ -1,9 +1,19 @@
 import pandas as pd
+import numpy as np
 import ctypes
+import os
+import re
+import subprocess
+import sys
 import time
+from bel_comparator.progress import STAGE_LOAD_FIRST, ensure_reporter
+import bel_comparator.cache as cache
 
-def get_system_memory_info():
-    """시스템 메모리 정보를 MB 단위로 반환하는 함수"""
+# 숫자 변환 시 한 번에 처리할 줄 수 (변환에 실패한 블록만 줄 단위로 처리)
+FLOAT_PARSE_BLOCK_SIZE = 4096
+
+def get_windows_available_memory():
+    """Windows의 사용 가능한 물리 메모리를 MB 단위로 반환하는 함수"""
     kernel32 = ctypes.windll.kernel32
     c_ulonglong = ctypes.c_ulonglong
 
@@ -25,6 +35,117 @@ def get_system_memory_info():
     available_memory_mb = memory_status.ullAvailPhys / (1024 * 1024)  # MB 단위로 변환
     return available_memory_mb
 
+def read_int_file(path):
+    """파일의 첫 번째 정수 값을 읽어 반환하는 함수 (없거나 'max'이면 None)"""
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+def get_linux_available_memory():
+    """Linux의 사용 가능한 메모리를 MB 단위로 반환하는 함수 (cgroup 메모리 제한 반영)"""
+    available_bytes = None
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    available_bytes = int(line.split()[1]) * 1024  # kB 단위
+                    break
+    except OSError:
+        pass
+
+    # 컨테이너 환경에서는 cgroup 제한이 실제 한도가 됨 (v2, v1 순으로 확인)
+    for limit_path, usage_path in (
+        ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory.current'),
+        ('/sys/fs/cgroup/memory/memory.limit_in_bytes', '/sys/fs/cgroup/memory/memory.usage_in_bytes'),
+    ):
+        limit = read_int_file(limit_path)
+        usage = read_int_file(usage_path)
+        if limit is not None and usage is not None:
+            cgroup_available = max(limit - usage, 0)
+            if available_bytes is None or cgroup_available < available_bytes:
+                available_bytes = cgroup_available
+            break
+
+    return available_bytes / (1024 * 1024) if available_bytes is not None else None
+
+def get_macos_available_memory():
+    """macOS의 사용 가능한 메모리(free + inactive + speculative 페이지)를 MB 단위로 반환하는 함수"""
+    try:
+        output = subprocess.run(['vm_stat'], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    page_size_match = re.search(r'page size of (\d+) bytes', output)
+    if not page_size_match:
+        return None
+    page_size = int(page_size_match.group(1))
+
+    pages = 0
+    for name in ('Pages free', 'Pages inactive', 'Pages speculative'):
+        match = re.search(rf'{name}:\s+(\d+)', output)
+        if match:
+            pages += int(match.group(1))
+    return pages * page_size / (1024 * 1024)
+
+def get_system_memory_info():
+    """시스템의 사용 가능한 메모리 정보를 MB 단위로 반환하는 함수 (확인할 수 없으면 None)"""
+    try:
+        if sys.platform == 'win32':
+            return get_windows_available_memory()
+        if sys.platform == 'darwin':
+            return get_macos_available_memory()
+        if sys.platform.startswith('linux'):
+            return get_linux_available_memory()
+        # 기타 POSIX 시스템
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+def get_windows_process_memory():
+    """Windows에서 현재 프로세스의 작업 집합(RSS) 크기를 MB 단위로 반환하는 함수"""
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", ctypes.c_ulong),
+            ("PageFaultCount", ctypes.c_ulong),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+    get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+    get_current_process.restype = ctypes.c_void_p  # 64비트 핸들이 잘리지 않도록 지정
+    get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+    get_process_memory_info.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong]
+    if not get_process_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize / (1024 * 1024)
+
+def get_process_memory():
+    """현재 프로세스의 상주 메모리(RSS)를 MB 단위로 반환하는 함수 (확인할 수 없으면 None)
+
+    macOS는 현재 값을 표준 라이브러리로 얻을 수 없어 최대 RSS를 반환합니다.
+    """
+    try:
+        if sys.platform == 'win32':
+            return get_windows_process_memory()
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)  # macOS는 바이트 단위
+    except (AttributeError, ImportError, OSError, ValueError, IndexError):
+        return None
+
 def calculate_dynamic_chunksize(last_memory_check_time, cached_chunksize, base_chunksize=10000, cache_duration=20):
     """시스템 메모리 정보를 기반으로 동적으로 chunksize를 계산하는 함수"""
     current_time = time.time()
@@ -32,6 +153,9 @@ def calculate_dynamic_chunksize(last_memory_check_time, cached_chunksize, base_c
         return cached_chunksize, last_memory_check_time  # 캐시된 chunksize 값을 반환
 
     available_memory_mb = get_system_memory_info()
+    if available_memory_mb is None:
+        return base_chunksize, current_time  # 메모리 정보를 알 수 없으면 기본 chunksize 사용
+
     target_memory_usage_mb = available_memory_mb * 0.05
     estimated_memory_per_row_mb = 0.001
 
@@ -40,12 +164,122 @@ def calculate_dynamic_chunksize(last_memory_check_time, cached_chunksize, base_c
     last_memory_check_time = current_time
     return cached_chunksize, last_memory_check_time
 
-def load_csv_with_chunksize(file_name, chunksize):
-    """동적으로 계산된 chunksize를 사용하여 CSV 파일을 로드하는 함수"""
-    chunks = pd.read_csv(file_name, chunksize=chunksize)
-    df = pd.concat(chunk for chunk in chunks)
+def count_csv_rows(file_name, block_size=1024 * 1024):
+    """헤더를 제외한 CSV 파일의 행 수를 줄바꿈 개수로 추정하는 함수"""
+    line_count = 0
+    last_block = b''
+    with open(file_name, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            line_count += block.count(b'\n')
+            last_block = block
+    if last_block and not last_block.endswith(b'\n'):
+        line_count += 1  # 마지막 줄에 줄바꿈이 없는 경우
+    return max(line_count - 1, 0)
+
+def narrow_integer(values):
+    """정수 배열을 값 범위에 맞는 가장 작은 정수형으로 변환하는 함수"""
+    if values.dtype.kind in 'iu' and len(values) > 0:
+        return pd.to_numeric(values, downcast='integer')
+    return values
+
+def fit_buffer(buffer, dtype, length):
+    """버퍼가 dtype 값을 담을 수 있고 length 이상의 길이가 되도록 필요할 때만 재할당하는 함수"""
+    if buffer is None:
+        return np.empty(length, dtype=dtype)
+
+    new_dtype = np.result_type(buffer.dtype, dtype)
+    if new_dtype == buffer.dtype and len(buffer) >= length:
+        return buffer
+
+    # 행 수를 적게 추정한 경우에는 두 배씩 늘려 재할당 횟수를 줄임
+    new_length = len(buffer) if len(buffer) >= length else max(length, len(buffer) * 2)
+    resized = np.empty(new_length, dtype=new_dtype)
+    resized[:len(buffer)] = buffer
+    return resized
+
+def load_csv_with_chunksize(file_name, chunksize, progress=None, stage=STAGE_LOAD_FIRST, usecols=None, use_cache=True):
+    """CSV 파일을 로드하는 함수 (같은 내용의 파일을 이전에 읽었다면 컬럼형 캐시에서 바로 읽음)
+
+    반환되는 DataFrame의 컬럼명은 대문자로 변환되어 있습니다.
+    """
+    progress = ensure_reporter(progress)
+    if not use_cache:
+        return parse_csv_with_chunksize(file_name, chunksize, progress, stage, usecols)
+
+    df = cache.load_cached(
+        file_name, usecols, lambda: parse_csv_with_chunksize(file_name, chunksize, progress, stage, usecols)
+    )
+    progress.update(stage, len(df), len(df))
     return df
 
+def parse_csv_with_chunksize(file_name, chunksize, progress=None, stage=STAGE_LOAD_FIRST, usecols=None):
+    """chunksize 단위로 CSV 파일을 읽어 미리 할당한 컬럼 배열에 채우는 함수 (청크마다 진행 상황 보고)
+
+    청크를 모아 pd.concat 하지 않으므로 최대 메모리는 결과 배열과 청크 하나 크기로 제한됩니다.
+    usecols를 지정하면 대소문자 구분 없이 해당 컬럼만 읽고, 정수 컬럼은 값 범위에 맞게 축소합니다.
+    """
+    progress = ensure_reporter(progress)
+    total_rows = count_csv_rows(file_name)
+    progress.update(stage, 0, total_rows)
+
+    read_kwargs = {}
+    if usecols is not None:
+        wanted_columns = {col.upper() for col in usecols}
+        read_kwargs['usecols'] = lambda col: col.upper() in wanted_columns
+
+    columns = None
+    buffers = {}
+    rows_parsed = 0
+    for chunk in pd.read_csv(file_name, chunksize=chunksize, **read_kwargs):
+        if columns is None:
+            columns = list(chunk.columns)
+
+        end = rows_parsed + len(chunk)
+        for col in columns:
+            values = narrow_integer(chunk[col].to_numpy())
+            buffers[col] = fit_buffer(buffers.get(col), values.dtype, max(total_rows, end))
+            buffers[col][rows_parsed:end] = values
+        rows_parsed = end
+        progress.update(stage, rows_parsed, max(total_rows, rows_parsed))
+
+    if columns is None:
+        df = pd.read_csv(file_name, **read_kwargs)  # 헤더만 있는 파일
+    else:
+        df = pd.DataFrame({col: buffers[col][:rows_parsed] for col in columns}, copy=False)  # 버퍼를 복사하지 않고 그대로 사용
+    df.columns = [col.upper() for col in df.columns]
+    return df
+
+def parse_float_lines(text, block_size=FLOAT_PARSE_BLOCK_SIZE):
+    """한 줄에 숫자 하나씩 있는 텍스트를 float64 배열로 변환하는 함수 (빈 줄은 건너뛰고 변환이 안 되는 줄은 NaN)
+
+    모든 줄이 숫자이면 NumPy 파서로 한 번에 변환하고, 그렇지 않으면 블록 단위로 변환하여
+    변환에 실패한 블록만 줄 단위로 처리합니다.
+    """
+    # 공백/탭이 없으면 NumPy 파서가 구분하는 값 하나가 곧 한 줄
+    if ' ' not in text and '\t' not in text:
+        try:
+            return np.fromstring(text, dtype=np.float64, sep='\n')
+        except ValueError:
+            pass  # 숫자가 아닌 줄이 있음
+
+    lines = np.array([line for line in text.splitlines() if line and not line.isspace()], dtype=str)
+    values = np.full(len(lines), np.nan)
+    for start in range(0, len(lines), block_size):
+        block = lines[start:start + block_size]
+        try:
+            values[start:start + block_size] = block.astype(np.float64)
+        except ValueError:
+            values[start:start + block_size] = [float(line) if is_valid_float(line) else np.nan for line in block]
+    return values
+
+def read_text_file(file_name):
+    """텍스트 파일을 읽어 반환하는 함수 (UTF-8 BOM 허용)"""
+    with open(file_name, encoding='utf-8-sig') as f:
+        return f.read()
+
 def is_valid_float(value):
     """값이 유효한 float으로 변환 가능한지 확인하는 함수"""
     try:
@@ -0,0 +1,105 @@
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.instrumentation as instrumentation
+import bel_comparator.result_store as result_store
+from bel_comparator.custom_exceptions import (
+    MissingColumnsError, InvalidBELValuesError, InvalidInputError, ComparisonCancelledError
+)
+from bel_comparator.progress import ProgressReporter, STAGE_EXPORT, STAGE_STORE
+
+class ComparisonWorker(QObject):
+    """백그라운드 스레드에서 비교 파이프라인을 실행하고 결과를 시그널로 전달하는 클래스"""
+
+    progress = pyqtSignal(str, int, int)  # 단계, 처리한 행 수, 전체 행 수
+    log = pyqtSignal(str)
+    finished = pyqtSignal(object)  # 성공 시 ComparisonRun, 실패/취소 시 None
+
+    def __init__(self, comparison_args, session=None, metrics=None, profile_path=None, store_inputs=None):
+        super().__init__()
+        self.comparison_args = comparison_args
+        self.session = session  # 주어지면 이전 로드/키 정렬 결과를 재사용하는 ComparisonSession
+        self.metrics = metrics  # 단계별 측정 결과를 기록할 Instrumentation
+        self.profile_path = profile_path  # 주어지면 이 경로에 cProfile 결과 저장
+        self.store_inputs = store_inputs  # 주어지면 비교 결과를 이 입력 정보(RunInputs)와 함께 결과 저장소에 저장
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """진행 중인 비교 작업의 취소를 요청합니다."""
+        self.cancel_event.set()
+
+    def run(self):
+        """비교 파이프라인을 실행합니다."""
+        reporter = ProgressReporter(self.progress.emit, self.cancel_event.is_set, self.metrics)
+        comparison = None
+        try:
+            run = self.session.run if self.session is not None else data_processing.run_comparison
+            with instrumentation.profile_to(self.profile_path):
+                comparison = run(
+                    **self.comparison_args,
+                    log_to_console=self.log.emit,
+                    progress=reporter
+                )
+            if self.profile_path:
+                self.log.emit(f"프로파일 저장 완료: {self.profile_path}")
+            if comparison is not None and self.store_inputs is not None:
+                self.store(comparison, reporter)
+        except ComparisonCancelledError as e:
+            self.log.emit(str(e))
+        except (InvalidInputError, InvalidBELValuesError) as e:
+            self.log.emit(str(e))
+        except MissingColumnsError as e:
+            self.log.emit(f"오류 발생: {str(e)}")
+        except Exception as e:
+            self.log.emit(f"예기치 않은 오류 발생: {str(e)}")
+        self.finished.emit(comparison)
+
+    def store(self, comparison, reporter):
+        """비교 결과를 결과 저장소에 저장합니다. (저장에 실패해도 비교 결과는 그대로 표시)"""
+        if not result_store.is_available():
+            self.log.emit("결과 저장에는 pyarrow가 필요합니다. 결과를 저장하지 않았습니다.")
+            return
+        try:
+            with reporter.measure(STAGE_STORE) as stage:
+                run_id = result_store.save_run(comparison, self.store_inputs)
+                stage['rows'] = len(comparison.result)
+            self.log.emit(f"결과 저장 완료: {run_id} (저장 위치: {result_store.get_store_dir()})")
+        except Exception as e:
+            self.log.emit(f"결과 저장 실패: {str(e)}")
+
+class ExportWorker(QObject):
+    """백그라운드 스레드에서 비교 결과를 청크 단위로 파일에 내보내는 클래스"""
+
+    progress = pyqtSignal(str, int, int)  # 단계, 내보낸 행 수, 전체 행 수
+    log = pyqtSignal(str)
+    finished = pyqtSignal(object)  # 성공 시 단계 측정 기록 dict, 실패/취소 시 None
+
+    def __init__(self, result, rows, path, export_format=None, metrics=None):
+        super().__init__()
+        self.result = result  # 숫자형 비교 결과 (복사하지 않고 청크 단위로 읽음)
+        self.rows = rows  # 내보낼 행 위치 배열 (None이면 전체)
+        self.path = path
+        self.export_format = export_format
+        self.metrics = metrics
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """진행 중인 내보내기 작업의 취소를 요청합니다."""
+        self.cancel_event.set()
+
+    def run(self):
+        """내보내기를 실행합니다."""
+        reporter = ProgressReporter(self.progress.emit, self.cancel_event.is_set, self.metrics)
+        record = None
+        try:
+            with reporter.measure(STAGE_EXPORT) as stage:
+                stage['rows'] = export.export_result(self.result, self.path, self.rows, self.export_format, reporter)
+            record = stage
+            self.log.emit(f"결과 파일로 내보내기 완료: {self.path}")
+        except ComparisonCancelledError:
+            self.log.emit("내보내기가 취소되었습니다.")
+        except Exception as e:
+            self.log.emit(f"내보내기 오류: {str(e)}")
+        self.finished.emit(record)
@@ -0,0 +1,40 @@
+# 워커 수(1, 2, 4, 8)에 따른 병렬 비교 속도 향상을 측정하는 벤치마크 스크립트
+#
+#   python benchmarks/bench_parallel.py --rows 2000000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generators
+import bel_comparator.data_processing as data_processing
+import bel_comparator.utils as utils
+
+def main():
+    parser = argparse.ArgumentParser(description='병렬 비교 워커 수별 소요 시간 측정')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = generators.write_inputs(directory, args.rows)
+        bel_text = utils.read_text_file(inputs.bel_path)
+        print(f"rows={args.rows} cpu_count={os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+
+        baseline = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            data_processing.run_comparison(
+                inputs.first_path, inputs.second_path, bel_text, '', '', '', 0.001, 100000,
+                lambda message: None, workers=workers, use_cache=False
+            )
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.2f} {baseline / elapsed:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+# 비교 파이프라인의 단계별(로드, 검증, 병합, 인덱스, 포맷팅, 필터, 에러 카운트, 요약 통계, 내보내기) 소요 시간과
+# 최대 메모리를 측정하여 JSON으로 저장하고, 이전 결과와 비교해 성능 저하를 검사하는 벤치마크 스크립트
+#
+#   python benchmarks/bench_stages.py --rows 10000 100000 1000000 --output after.json --baseline before.json
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generators
+import bel_comparator.aggregation as aggregation
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.formatting as formatting
+import bel_comparator.tolerance_sweep as tolerance_sweep
+import bel_comparator.utils as utils
+from bel_comparator import BELComparator
+from bel_comparator.key_index import KEY_COLUMNS
+from bel_comparator.progress import ProgressReporter, STAGE_MERGE, STAGE_INDEX
+
+CHUNKSIZE = 100000
+ADJUSTMENT_FACTOR = 0.001
+# 이보다 짧은 단계는 측정 오차가 커서 성능 저하 검사에서 제외 (초)
+MIN_COMPARED_SECONDS = 0.1
+
+def measure(stages, name, func, *args):
+    """func(*args)의 소요 시간과 실행 중 최대 메모리(MB)를 stages[name]에 기록하고 결과를 반환하는 함수"""
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    result = func(*args)
+    stages[name] = {'seconds': time.perf_counter() - started}
+    if tracing:
+        stages[name]['peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    return result
+
+def record_stage_times(times):
+    """진행 상황 보고 시각을 단계별 (처음, 마지막) 시각으로 기록하는 콜백을 반환하는 함수"""
+    def callback(stage, done, total):
+        now = time.perf_counter()
+        times.setdefault(stage, [now, now])[1] = now
+    return callback
+
+def measure_table(stages, result):
+    """PyQt5가 있으면 결과 테이블 모델 설정, 열 너비 추정, 화면 한 페이지 분량의 셀 조회 시간을 측정하는 함수"""
+    try:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtGui import QFont, QFontMetrics
+        from bel_comparator.result_model import ResultTableModel
+    except ImportError:
+        return
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841 (QFontMetrics에 필요)
+    model = ResultTableModel()
+
+    def show_table():
+        model.set_result(result)
+        model.estimate_column_widths(QFontMetrics(QFont()))
+        for row in range(min(model.rowCount(), 50)):
+            for col in range(model.columnCount()):
+                model.data(model.index(row, col))
+
+    measure(stages, 'table', show_table)
+
+def run_pipeline(directory, inputs):
+    """생성된 입력으로 비교 파이프라인을 한 번 실행하며 단계별로 측정하는 함수"""
+    stages = {}
+
+    inno_df = measure(stages, 'load_first', utils.load_csv_with_chunksize,
+                      inputs.first_path, CHUNKSIZE, None, None, KEY_COLUMNS, False)
+    pw_df = measure(stages, 'load_second', utils.load_csv_with_chunksize,
+                    inputs.second_path, CHUNKSIZE, None, None, KEY_COLUMNS + ['BEL'], False)
+    bel_values = measure(stages, 'parse_bel', BELComparator.parse_bel_values, utils.read_text_file(inputs.bel_path))
+
+    comparator = BELComparator(inno_df, pw_df, bel_values)
+    measure(stages, 'validate', comparator.validate_and_prepare_data)
+
+    times = {}
+    result = measure(stages, 'compare', comparator.compare_bel, ProgressReporter(record_stage_times(times)))
+    merge_end = times[STAGE_MERGE][1]
+    stages['merge'] = {'seconds': merge_end - times[STAGE_MERGE][0]}
+    stages['index'] = {'seconds': times.get(STAGE_INDEX, [merge_end, merge_end])[1] - merge_end}
+
+    diff = measure(stages, 'diff', data_processing.diff_array, result)
+    mask = measure(stages, 'filter_mask', data_processing.filter_mask, diff, True, False, ADJUSTMENT_FACTOR)
+    filtered = measure(stages, 'filter_result', data_processing.filter_result, result, mask)
+    error_count = measure(stages, 'error_count', data_processing.count_errors, diff[mask], ADJUSTMENT_FACTOR, False)
+    measure(stages, 'summary', aggregation.summarize_result, result, comparator.loa_code, ADJUSTMENT_FACTOR, False)
+    sorted_diff = measure(stages, 'sweep_sort', tolerance_sweep.sort_diff, diff)
+    measure(stages, 'sweep', tolerance_sweep.sweep_error_counts, sorted_diff,
+            tolerance_sweep.parse_tolerances(tolerance_sweep.DEFAULT_SWEEP))
+    measure(stages, 'format', formatting.format_result, result)
+    measure(stages, 'export', export.export_result, result, os.path.join(directory, 'result.csv'))
+    measure_table(stages, result)
+    return stages, len(result), len(filtered), error_count
+
+def run_case(directory, rows, duplicate_rate, missing_rate, na_rate, seed, repeat):
+    """한 가지 입력 조건에 대해 repeat번 측정하여 단계별 최소 소요 시간을 담은 결과 dict를 반환하는 함수"""
+    inputs = generators.write_inputs(directory, rows, duplicate_rate, missing_rate, na_rate, seed)
+    stages = None
+    for _ in range(repeat):
+        run_stages, result_rows, filtered_rows, error_count = run_pipeline(directory, inputs)
+        if stages is None:
+            stages = run_stages
+            continue
+        for name, stage in run_stages.items():
+            stages[name]['seconds'] = min(stages[name]['seconds'], stage['seconds'])
+            if 'peak_mb' in stage:
+                stages[name]['peak_mb'] = max(stages[name]['peak_mb'], stage['peak_mb'])
+
+    return {
+        'case': case_key(rows, duplicate_rate, missing_rate, na_rate),
+        'rows': rows,
+        'duplicate_rate': duplicate_rate,
+        'missing_rate': missing_rate,
+        'na_rate': na_rate,
+        'result_rows': result_rows,
+        'filtered_rows': filtered_rows,
+        'error_count': error_count,
+        'total_seconds': sum(stage['seconds'] for name, stage in stages.items() if name not in ('merge', 'index')),
+        'max_rss_mb': max_rss_mb(),
+        'stages': stages,
+    }
+
+def max_rss_mb():
+    """프로세스 시작 이후 최대 상주 메모리(MB)를 반환하는 함수 (resource 모듈이 없는 Windows에서는 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024 if sys.platform != 'darwin' else max_rss / (1024 * 1024)  # Linux는 KB, macOS는 바이트
+
+def case_key(rows, duplicate_rate, missing_rate, na_rate):
+    """결과 비교 시 같은 입력 조건을 찾기 위한 키를 만드는 함수"""
+    return f"rows={rows},dup={duplicate_rate},missing={missing_rate},na={na_rate}"
+
+def git_revision():
+    """현재 소스의 git 커밋 해시를 반환하는 함수 (git 저장소가 아니면 None)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def find_regressions(results, baseline, threshold):
+    """baseline보다 threshold 비율 이상 느려진 (조건, 단계) 목록을 반환하는 함수"""
+    baseline_cases = {case['case']: case for case in baseline['cases']}
+    regressions = []
+    for case in results['cases']:
+        previous = baseline_cases.get(case['case'])
+        if previous is None:
+            continue
+        for name, stage in case['stages'].items():
+            before = previous['stages'].get(name, {}).get('seconds')
+            after = stage['seconds']
+            if before is None or max(before, after) < MIN_COMPARED_SECONDS:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append((case['case'], name, before, after))
+    return regressions
+
+def print_case(case):
+    """한 조건의 단계별 측정 결과를 표로 출력하는 함수"""
+    max_rss = f"{case['max_rss_mb']:.0f}MB" if case['max_rss_mb'] is not None else '-'
+    print(f"\n{case['case']}  result_rows={case['result_rows']}  total={case['total_seconds']:.3f}s  max_rss={max_rss}")
+    print(f"{'stage':>14} {'seconds':>10} {'peak_mb':>10}")
+    for name, stage in case['stages'].items():
+        peak = f"{stage['peak_mb']:.1f}" if 'peak_mb' in stage else '-'
+        print(f"{name:>14} {stage['seconds']:>10.3f} {peak:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description='비교 파이프라인 단계별 소요 시간 및 최대 메모리 측정')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='First 행 수 (여러 개 지정 가능, 예: 10000 100000 1000000 10000000)')
+    parser.add_argument('--duplicate-rate', type=float, nargs='+', default=[0.01], help='키가 중복되는 First 행 비율')
+    parser.add_argument('--missing-rate', type=float, nargs='+', default=[0.01], help='First에 없는 키로 바뀌는 Second 행 비율')
+    parser.add_argument('--na-rate', type=float, nargs='+', default=[0.01], help='BEL 값이 비어 있는 행 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='조건별 반복 측정 횟수 (단계별 최소 시간을 기록)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='tracemalloc으로 단계별 최대 메모리 측정 (측정 부하로 소요 시간이 늘어나므로 시간 비교와 분리해서 사용)')
+    parser.add_argument('--output', help='결과 JSON 파일 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON 파일 경로')
+    parser.add_argument('--threshold', type=float, default=0.2, help='성능 저하로 판단할 소요 시간 증가 비율 (기본값: 0.2)')
+    args = parser.parse_args()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    results = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'memory_traced': args.trace_memory,
+        'repeat': max(args.repeat, 1),
+        'cases': [],
+    }
+    for rows in args.rows:
+        for duplicate_rate in args.duplicate_rate:
+            for missing_rate in args.missing_rate:
+                for na_rate in args.na_rate:
+                    with tempfile.TemporaryDirectory(prefix='bel_bench_') as directory:
+                        case = run_case(directory, rows, duplicate_rate, missing_rate, na_rate, args.seed, max(args.repeat, 1))
+                    results['cases'].append(case)
+                    print_case(case)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for case, name, before, after in regressions:
+            print(f"성능 저하: {case} {name} {before:.3f}s -> {after:.3f}s ({after / before - 1:+.0%})")
+        if regressions:
+            return 1
+        print(f"성능 저하 없음 (기준: {baseline.get('revision')}, 허용 증가율: {args.threshold:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# GUI 시작 시간(창이 뜰 때까지, 비교 엔진을 모두 불러올 때까지)과 CLI 도움말 출력 시간을 새 프로세스에서 측정하고,
+# 창이 뜨기 전에 pandas를 불러오지 않는지와 창 표시 시간이 예산 안인지 검사하는 벤치마크 스크립트
+#
+#   python benchmarks/bench_startup.py --repeat 5 --budget 1.0 --output startup.json
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정용 자식 프로세스에서 실행할 코드 (창 표시 시각, 엔진 로드 완료 시각, 창 표시 시점의 pandas 로드 여부를 JSON으로 출력)
+GUI_PROBE = '''
+import json, sys, time
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+app = QApplication(sys.argv)
+import bel_comparator.gui as gui
+window = gui.BELComparatorApp()
+window.show()
+pandas_loaded = 'pandas' in sys.modules  # 백그라운드 로드는 이벤트 루프에서 시작하므로 그 전에 확인
+app.processEvents()
+shown = time.time()
+
+def wait_engine():
+    if 'bel_comparator.worker' in sys.modules and 'bel_comparator.session' in sys.modules:
+        print(json.dumps({'shown': shown, 'engine_ready': time.time(), 'pandas_before_show': pandas_loaded}))
+        app.quit()
+    else:
+        QTimer.singleShot(5, wait_engine)
+
+QTimer.singleShot(0, wait_engine)
+app.exec_()
+'''
+
+def run_gui_probe():
+    """새 프로세스에서 GUI를 띄워 (창 표시까지 초, 엔진 로드까지 초, 창 표시 전 pandas 로드 여부)를 반환하는 함수"""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    started = time.time()
+    output = subprocess.run(
+        [sys.executable, '-c', GUI_PROBE], capture_output=True, text=True, check=True, cwd=ROOT_DIR, env=env
+    ).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+    return probe['shown'] - started, probe['engine_ready'] - started, probe['pandas_before_show']
+
+def run_cli_help():
+    """새 프로세스에서 CLI 도움말을 출력하는 데 걸린 시간(초)을 반환하는 함수"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'bel_comparator', '--help'], capture_output=True, check=True, cwd=ROOT_DIR)
+    return time.perf_counter() - started
+
+def run_interpreter():
+    """비교 기준으로 빈 파이썬 프로세스의 시작 시간(초)을 반환하는 함수"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description='GUI/CLI 시작 시간 측정')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 측정 횟수 (항목별 최소 시간을 기록)')
+    parser.add_argument('--budget', type=float, default=1.0, help='창이 뜰 때까지의 허용 시간 (초, 기본값: 1.0)')
+    parser.add_argument('--output', help='결과 JSON 파일 경로')
+    args = parser.parse_args()
+
+    repeat = max(args.repeat, 1)
+    shown, engine_ready, pandas_before_show = [], [], False
+    for _ in range(repeat):
+        shown_seconds, engine_seconds, pandas_loaded = run_gui_probe()
+        shown.append(shown_seconds)
+        engine_ready.append(engine_seconds)
+        pandas_before_show = pandas_before_show or pandas_loaded
+
+    results = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'budget_seconds': args.budget,
+        'interpreter_seconds': min(run_interpreter() for _ in range(repeat)),
+        'window_shown_seconds': min(shown),
+        'engine_ready_seconds': min(engine_ready),
+        'cli_help_seconds': min(run_cli_help() for _ in range(repeat)),
+        'pandas_before_show': pandas_before_show,
+    }
+    for name in ['interpreter_seconds', 'window_shown_seconds', 'engine_ready_seconds', 'cli_help_seconds']:
+        print(f"{name:>22} {results[name]:>8.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    failed = False
+    if pandas_before_show:
+        print("시작 시간 검사 실패: 창이 뜨기 전에 pandas를 불러왔습니다.")
+        failed = True
+    if results['window_shown_seconds'] > args.budget:
+        print(f"시작 시간 검사 실패: 창 표시 {results['window_shown_seconds']:.3f}s > 예산 {args.budget:.3f}s")
+        failed = True
+    if failed:
+        return 1
+    print(f"시작 시간 검사 통과 (예산: {args.budget:.3f}s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
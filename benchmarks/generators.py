@@ -0,0 +1,105 @@
+# 벤치마크용 First/Second 모델 포인트 CSV와 BEL 값 파일을 생성하는 모듈
+#
+#   python benchmarks/generators.py --rows 1000000 --out-dir /tmp/bel_bench
+import argparse
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# 생성된 입력 파일 경로
+GeneratedInputs = namedtuple('GeneratedInputs', ['first_path', 'second_path', 'bel_path'])
+
+LOA_CODES = np.array([201912, 201913, 202001, 202006])
+RIDER_PRD_CODES = 5006000 + np.arange(12)
+# 입력 BEL 값 중 허용오차를 넘게 어긋나는 비율
+MISMATCH_RATE = 0.01
+
+def generate_first(rows, duplicate_rate, rng):
+    """First(Innolink) 모델 포인트를 생성하는 함수 (duplicate_rate 비율의 행은 앞선 행과 키가 같음)"""
+    first = pd.DataFrame({
+        'LOA_CODE': rng.choice(LOA_CODES, rows),
+        'POL_NO': 200000000000 + np.arange(rows, dtype=np.int64) * 10,
+        'RIDER_PRD_CODE': rng.choice(RIDER_PRD_CODES, rows),
+        'INIT_V_CHECK': rng.integers(0, 2, rows, dtype=np.int8),
+        'ENTRY_AGE': rng.integers(20, 70, rows, dtype=np.int8),
+        'SEX': rng.integers(1, 3, rows, dtype=np.int8),
+        'PAY_TERM': rng.choice([10, 20, 30], rows),
+        'PREMIUM': rng.lognormal(11, 1, rows).round(0),
+    })
+
+    # 중복 키: 임의의 행에 그보다 앞선 행의 키를 복사
+    duplicates = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    duplicates = duplicates[duplicates > 0]
+    if len(duplicates):
+        sources = (rng.random(len(duplicates)) * duplicates).astype(np.int64)
+        for col in ['LOA_CODE', 'POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK']:
+            values = first[col].to_numpy().copy()
+            values[duplicates] = values[sources]
+            first[col] = values
+    return first
+
+def generate_second(first, missing_rate, na_rate, rng):
+    """Second(Pathwise) 결과를 생성하는 함수
+
+    First 행을 섞은 뒤 missing_rate 비율의 키를 First에 없는 키로 바꾸고,
+    na_rate 비율의 BEL 값을 비웁니다. 각 행이 만들어진 First 행 번호(없으면 -1)를 함께 반환합니다.
+    """
+    rows = len(first)
+    order = rng.permutation(rows)
+    second = first.iloc[order][['LOA_CODE', 'POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK']].reset_index(drop=True)
+    second['BEL'] = rng.normal(0, 10000, rows).round(7)
+
+    missing = rng.random(rows) < missing_rate
+    pol_no = second['POL_NO'].to_numpy().copy()
+    pol_no[missing] += 5  # First의 POL_NO는 10의 배수이므로 First에 없는 키가 됨
+    second['POL_NO'] = pol_no
+    second.loc[rng.random(rows) < na_rate, 'BEL'] = np.nan
+    return second, np.where(missing, -1, order)
+
+def generate_bel_values(first_rows, second, first_row_of_second, na_rate, rng):
+    """First 행 순서의 입력 BEL 값을 생성하는 함수 (대부분 Second BEL과 같고 일부만 어긋남)"""
+    values = rng.normal(0, 10000, first_rows).round(7)
+    matched = first_row_of_second >= 0
+    values[first_row_of_second[matched]] = second['BEL'].to_numpy()[matched]
+
+    mismatched = rng.random(first_rows) < MISMATCH_RATE
+    values[mismatched] += rng.choice([-1, 1], mismatched.sum()) * rng.uniform(0.01, 100, mismatched.sum())
+    values[rng.random(first_rows) < na_rate] = np.nan
+    return values
+
+def write_inputs(directory, rows, duplicate_rate=0.0, missing_rate=0.0, na_rate=0.0, seed=0):
+    """First/Second CSV와 BEL 값 파일을 directory에 생성하고 경로를 반환하는 함수"""
+    rng = np.random.default_rng(seed)
+    first = generate_first(rows, duplicate_rate, rng)
+    second, first_row_of_second = generate_second(first, missing_rate, na_rate, rng)
+    bel_values = generate_bel_values(rows, second, first_row_of_second, na_rate, rng)
+
+    inputs = GeneratedInputs(
+        os.path.join(directory, 'first.csv'),
+        os.path.join(directory, 'second.csv'),
+        os.path.join(directory, 'bel.csv'),
+    )
+    first.to_csv(inputs.first_path, index=False)
+    second.to_csv(inputs.second_path, index=False)
+    pd.DataFrame({'BEL': bel_values}).to_csv(inputs.bel_path, index=False, na_rep='N/A', float_format='%.7f')
+    return inputs
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 모델 포인트 CSV와 BEL 값 파일 생성')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.01, help='키가 중복되는 First 행 비율')
+    parser.add_argument('--missing-rate', type=float, default=0.01, help='First에 없는 키로 바뀌는 Second 행 비율')
+    parser.add_argument('--na-rate', type=float, default=0.01, help='BEL 값이 비어 있는 행 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', required=True)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    inputs = write_inputs(args.out_dir, args.rows, args.duplicate_rate, args.missing_rate, args.na_rate, args.seed)
+    for path in inputs:
+        print(path)
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,6 @@
 import sys
-import os
-
-# 현재 디렉터리를 Python 모듈 경로에 추가
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# 창 모듈은 PyQt5와 가벼운 모듈만 불러오고, pandas와 비교 엔진은 창이 뜬 뒤 백그라운드에서 불러옵니다.
 from bel_comparator.gui import BELComparatorApp
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
@@ -0,0 +1,35 @@
+# 새 프로세스에서 코드를 실행하여 최대 RSS 증가량을 측정하는 테스트 도우미
+#
+# ru_maxrss는 fork/exec 시 부모 프로세스의 값을 물려받으므로, Linux에서 /proc/self/clear_refs로 최대 RSS(VmHWM)를
+# 초기화한 뒤 측정합니다. 다른 플랫폼에서는 측정하는 테스트를 건너뜁니다.
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 자식 프로세스 코드 앞에 붙이는 함수 정의 (reset_peak_rss()로 초기화하고 peak_rss_mb()로 측정)
+PRELUDE = '''
+def reset_peak_rss():
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+def peak_rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+'''
+
+def require_peak_rss():
+    """최대 RSS를 초기화할 수 없는 플랫폼이면 테스트를 건너뛰는 함수"""
+    if not os.path.exists('/proc/self/clear_refs'):
+        pytest.skip('최대 RSS(VmHWM) 초기화는 Linux에서만 지원됩니다.')
+
+def run_child(script, *args):
+    """새 프로세스에서 PRELUDE와 script를 실행하고 마지막 줄의 공백 구분 숫자들을 반환하는 함수"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get('PYTHONPATH')])))
+    output = subprocess.run([sys.executable, '-c', PRELUDE + script, *map(str, args)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return [float(value) for value in output.strip().splitlines()[-1].split()]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import bel_comparator.aggregation as aggregation
+import bel_comparator.data_processing as data_processing
+
+def write_csv(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_summarize_empty_result(tmp_path):
+    """Second CSV에 행이 없어 결과가 비어 있어도 요약 통계가 0과 NaN으로 계산되는지 확인"""
+    first = write_csv(tmp_path / 'first.csv', 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,201913\n2,10,0,201913\n')
+    second = write_csv(tmp_path / 'second.csv', 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n')
+    comparison = data_processing.run_comparison(first, second, '1\n2', '', '', '', 0.001, 1000, lambda message: None,
+                                                use_cache=False)
+    assert len(comparison.result) == 0
+
+    for rows in (None, np.zeros(0, dtype=np.intp)):
+        summary = aggregation.summarize_result(comparison.result, comparison.loa_code, 0.001, False, rows)
+        assert summary.total['COUNT'] == 0
+        assert summary.total['ERRORS'] == 0
+        assert np.isnan(summary.total['MAX_ABS_DIFF'])
+        assert all(len(frame) == 0 for frame in summary.groups.values())
+        assert aggregation.summary_record(summary)['total']['MAX_ABS_DIFF'] is None
+
+def test_summarize_all_na_result():
+    """모든 DIFF가 N/A인 결과의 |DIFF| 통계는 NaN이고 N/A 행은 에러로 집계되는지 확인"""
+    result = pd.DataFrame({
+        'RIDER_PRD_CODE': pd.Categorical(['A', 'B']),
+        'ANSWER_BEL': [1.0, 2.0],
+        'DIFF': [np.nan, np.nan],
+    })
+    summary = aggregation.summarize_result(result, pd.Categorical(['L1', 'L1']), 0.001, False)
+    assert summary.total['COUNT'] == 2
+    assert summary.total['NA_COUNT'] == 2
+    assert summary.total['ERRORS'] == 2
+    assert np.isnan(summary.total['MAX_ABS_DIFF'])
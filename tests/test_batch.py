@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.batch as batch
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+from bel_comparator.custom_exceptions import InvalidInputError
+
+FIRST_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n2,10,0,1\n3,10,0,1\n4,10,0,1\n'
+SECOND_CSVS = {
+    'a.csv': 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n1,10,0,1,0.5\n2,10,0,1,0.3\n9,10,0,1,0.5\n',
+    'b.csv': 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n3,10,0,1,0.125\n4,10,0,1,\n1,10,0,1,2\n',
+    'broken.csv': 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n',  # BEL 컬럼 없음
+}
+BEL_TEXT = '0.5\n0.25\n0.25\n0.125\n1'
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(tmp_path / 'cache'))
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSV, encoding='utf-8')
+    second_dir = tmp_path / 'second'
+    second_dir.mkdir()
+    for name, text in SECOND_CSVS.items():
+        (second_dir / name).write_text(text, encoding='utf-8')
+    return str(first), str(second_dir)
+
+def run_batch(first, second_dir, output_dir, workers=1, diff_only=False):
+    return batch.run_batch_comparison(first, batch.resolve_second_paths(second_dir), BEL_TEXT, '', '', '', 0.001,
+                                      str(output_dir), diff_only, False, 1000, lambda message: None, workers=workers)
+
+@pytest.mark.parametrize('diff_only', [False, True])
+def test_batch_matches_single_comparisons(tmp_path, inputs, diff_only):
+    """파일별 결과 파일과 요약 값이 같은 두 파일로 run_comparison을 실행한 결과와 같고, 실패한 파일은 요약에 기록되는지 확인"""
+    first, second_dir = inputs
+    run = run_batch(first, second_dir, tmp_path / 'out', diff_only=diff_only)
+    assert run.inno_count == 5
+    assert [os.path.basename(summary.second_csv) for summary in run.summaries] == ['a.csv', 'b.csv', 'broken.csv']
+
+    for summary in run.summaries[:2]:
+        comparison = data_processing.run_comparison(first, summary.second_csv, BEL_TEXT, '', '', '', 0.001, 1000,
+                                                    lambda message: None)
+        diff = data_processing.diff_array(comparison.result)
+        mask = data_processing.filter_mask(diff, diff_only, False, 0.001)
+        expected_path = tmp_path / 'expected.csv'
+        export.export_result(comparison.result, str(expected_path), mask)
+        with open(summary.output_path, 'rb') as f:
+            assert f.read() == expected_path.read_bytes()
+
+        assert summary.error is None
+        assert summary.pw_count == comparison.pw_count
+        assert summary.result_rows == int(mask.sum())
+        assert summary.error_count == data_processing.count_errors(diff[mask], 0.001, False)
+        assert summary.na_count == int(np.isnan(diff).sum())
+        assert summary.max_abs_diff == np.nanmax(np.abs(diff))
+        assert summary.unmatched_second_keys == len(comparison.key_diagnostics.second_only)
+        assert summary.unmatched_first_keys == len(comparison.key_diagnostics.first_only)
+
+    broken = run.summaries[2]
+    assert broken.error and broken.output_path is None
+
+    summary_frame = pd.read_csv(run.summary_path)
+    assert list(summary_frame.columns) == batch.SUMMARY_COLUMNS
+    errors = summary_frame['ERRORS'].astype('Int64')
+    assert errors[:2].tolist() == [summary.error_count for summary in run.summaries[:2]] and pd.isna(errors[2])
+    assert summary_frame['ERROR'].fillna('').tolist() == ['', '', broken.error]
+
+def test_batch_workers_write_same_files(tmp_path, inputs):
+    """여러 워커 프로세스로 비교해도 결과 파일과 요약 파일이 같은지 확인"""
+    first, second_dir = inputs
+    serial = run_batch(first, second_dir, tmp_path / 'serial')
+    parallel = run_batch(first, second_dir, tmp_path / 'parallel', workers=2)
+    for name in ['a_result.csv', 'b_result.csv', batch.SUMMARY_FILE_NAME]:
+        serial_text = (tmp_path / 'serial' / name).read_text(encoding='utf-8')
+        assert (tmp_path / 'parallel' / name).read_text(encoding='utf-8') == serial_text.replace('serial', 'parallel')
+
+def test_output_paths_reject_duplicate_names(tmp_path):
+    """확장자만 다른 Second 파일처럼 결과 파일 이름이 겹치면 비교 전에 오류를 내는지 확인"""
+    with pytest.raises(InvalidInputError):
+        batch.output_paths_for(['x/a.csv', 'y/a.csv'], str(tmp_path), None)
+    assert batch.output_paths_for(['x/a.csv'], 'out', export.FORMAT_PARQUET) == ['out/a_result.parquet']
+    with pytest.raises(InvalidInputError):
+        batch.resolve_second_paths(str(tmp_path / '*.csv'))
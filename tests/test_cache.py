@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.cache as cache
+import bel_comparator.utils as utils
+
+pytestmark = pytest.mark.skipif(not cache.is_available(), reason='캐시에는 pyarrow가 필요합니다.')
+
+ROWS = 40000  # 캐시 항목 하나가 약 0.3MB
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(path))
+    return path
+
+def write_csv(path, seed):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({'POL_NO': rng.integers(0, 2 ** 40, ROWS), 'BEL': rng.random(ROWS)}).to_csv(path, index=False)
+    return str(path)
+
+def cached_sources(cache_dir):
+    """인덱스에 기록된 캐시 항목의 원본 파일 이름 집합을 반환하는 함수"""
+    with open(cache_dir / cache.INDEX_FILE_NAME, encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+    assert {name for name in os.listdir(cache_dir) if name.endswith(cache.ENTRY_SUFFIXES)} == set(entries)
+    return {os.path.basename(entry['source']) for entry in entries.values() if 'source' in entry}
+
+def load(file_name):
+    return utils.load_csv_with_chunksize(file_name, 10000)
+
+def test_cache_hit_returns_same_frame(tmp_path, cache_dir):
+    """두 번째 로드는 캐시에서 읽고 결과가 처음 파싱한 것과 같은지 확인"""
+    file_name = write_csv(tmp_path / 'a.csv', 0)
+    parsed = load(file_name)
+    cached = load(file_name)
+    pd.testing.assert_frame_equal(cached, parsed)
+    assert cached_sources(cache_dir) == {'a.csv'}
+
+def test_evicts_least_recently_used_to_fit_cap(tmp_path, cache_dir, monkeypatch):
+    """용량 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제하고 최근 사용한 항목은 남기는지 확인"""
+    files = {name: write_csv(tmp_path / f'{name}.csv', seed) for seed, name in enumerate('abc')}
+    load(files['a'])
+    entry_bytes = sum(os.path.getsize(cache_dir / name) for name in os.listdir(cache_dir) if name.endswith('.feather'))
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_MAX_MB', str(2.5 * entry_bytes / 2 ** 20))  # 항목 두 개까지
+
+    load(files['b'])
+    time.sleep(0.01)
+    load(files['a'])  # a를 b보다 최근에 사용
+    time.sleep(0.01)
+    load(files['c'])
+    assert cached_sources(cache_dir) == {'a.csv', 'c.csv'}
+
+    total_bytes = sum(os.path.getsize(cache_dir / name) for name in os.listdir(cache_dir) if name.endswith('.feather'))
+    assert total_bytes <= cache.get_cache_max_bytes()
+
+def test_evicts_files_missing_from_index(tmp_path, cache_dir, monkeypatch):
+    """인덱스에 기록되지 않은 캐시 파일도 용량에 포함되어 오래된 순서로 삭제되는지 확인"""
+    load(write_csv(tmp_path / 'a.csv', 0))
+    entry_bytes = sum(os.path.getsize(cache_dir / name) for name in os.listdir(cache_dir) if name.endswith('.feather'))
+    orphan = cache_dir / 'v1_0123456789abcdef_0123456789abcdef.feather'
+    orphan.write_bytes(b'\0' * entry_bytes)
+    os.utime(orphan, (0, 0))  # 가장 오래 전에 사용한 것으로 취급
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_MAX_MB', str(2.5 * entry_bytes / 2 ** 20))  # 항목 두 개까지
+
+    load(write_csv(tmp_path / 'b.csv', 1))
+    assert not orphan.exists()
+    assert cached_sources(cache_dir) == {'a.csv', 'b.csv'}
+
+def test_concurrent_loads_keep_every_entry(tmp_path, cache_dir):
+    """여러 프로세스가 동시에 캐시에 저장해도 인덱스에서 항목이 빠지지 않는지 확인"""
+    files = [write_csv(tmp_path / f'{i}.csv', i) for i in range(8)]
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(load, files))
+    assert cached_sources(cache_dir) == {os.path.basename(file_name) for file_name in files}
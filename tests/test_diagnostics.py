@@ -0,0 +1,94 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.diagnostics as diagnostics
+import bel_comparator.parallel as parallel
+from bel_comparator.key_index import KEY_COLUMNS
+
+# 키 컬럼의 NaN을 대신하는 값 (모든 키 값보다 커서 NaN과 같이 마지막에 정렬)
+NAN_KEY = 99.0
+
+def random_frames(seed):
+    """값 범위가 좁아 중복, NaN, 한쪽에만 있는 키가 섞인 First/Second DataFrame을 만드는 함수"""
+    rng = np.random.default_rng(seed)
+
+    def random_frame(length):
+        df = pd.DataFrame({col: rng.integers(0, 3, length).astype(np.float64) for col in KEY_COLUMNS})
+        return df.mask(rng.random(df.shape) < 0.05)
+
+    inno_df = random_frame(80)
+    inno_df.index = pd.RangeIndex(5, 85)  # 범위로 자른 First의 파일 내 행 번호
+    pw_df = random_frame(70).assign(BEL=rng.normal(size=70))
+    return inno_df, pw_df
+
+def key_counts(df):
+    """키별 행 수와 첫 행 번호 (NaN은 NAN_KEY로 바꾼 키 기준)"""
+    keys = df[KEY_COLUMNS].fillna(NAN_KEY)
+    grouped = keys.groupby(KEY_COLUMNS)
+    return grouped.size(), pd.Series(df.index, index=pd.MultiIndex.from_frame(keys)).groupby(level=KEY_COLUMNS).first()
+
+def report_keys(report):
+    """보고서를 (키 튜플, FIRST_COUNT, SECOND_COUNT) 목록으로 변환하는 함수"""
+    keys = pd.DataFrame({col: report[col].astype(np.float64) for col in KEY_COLUMNS}).fillna(NAN_KEY)
+    return list(zip(map(tuple, keys.to_numpy()), report['FIRST_COUNT'], report['SECOND_COUNT']))
+
+def compare(inno_df, pw_df, executor=None):
+    _, key_diagnostics, _ = data_processing.compare_bel(inno_df, pw_df, np.arange(len(inno_df)) / 8, None,
+                                                        lambda message: None, executor, 2)
+    return key_diagnostics
+
+@pytest.mark.parametrize('seed', range(3))
+def test_diagnostics_match_groupby_counts(seed):
+    """보고서별 키와 행 수, 고유 키 수, 병합 행 수가 groupby와 pd.merge로 센 값과 같은지 확인"""
+    inno_df, pw_df = random_frames(seed)
+    key_diagnostics = compare(inno_df.copy(), pw_df.copy())
+
+    first_counts, first_rows = key_counts(inno_df)
+    second_counts, _ = key_counts(pw_df)
+    counts = pd.DataFrame({'FIRST': first_counts, 'SECOND': second_counts}).fillna(0).astype(int).sort_index()
+
+    def expected(mask):
+        return [(key, row.FIRST, row.SECOND) for key, row in counts[mask].iterrows()]
+
+    assert report_keys(key_diagnostics.first_duplicates) == expected(counts['FIRST'] > 1)
+    assert report_keys(key_diagnostics.second_duplicates) == expected(counts['SECOND'] > 1)
+    assert report_keys(key_diagnostics.first_only) == expected(counts['SECOND'] == 0)
+    assert report_keys(key_diagnostics.second_only) == expected(counts['FIRST'] == 0)
+    assert key_diagnostics.key_count == len(counts)
+    # pd.merge도 NaN 키끼리 병합
+    assert key_diagnostics.merged_rows == len(pd.merge(pw_df[KEY_COLUMNS], inno_df[KEY_COLUMNS], how='outer'))
+
+    report = key_diagnostics.first_duplicates
+    keys = [key for key, _, _ in report_keys(report)]
+    assert report['FIRST_INDEX'].tolist() == [first_rows[key] for key in keys]
+    assert key_diagnostics.second_only['FIRST_INDEX'].isna().all()
+
+def test_parallel_diagnostics_match_single_process():
+    """POL_NO 범위 파티션별로 진단하여 합친 결과가 단일 프로세스 진단과 같은지 확인"""
+    inno_df, pw_df = random_frames(0)
+    expected = compare(inno_df.copy(), pw_df.copy())
+    with parallel.create_executor(2) as executor:
+        combined = compare(inno_df.copy(), pw_df.copy(), executor)
+    for name in diagnostics.DIAGNOSTIC_REPORTS:
+        assert report_keys(getattr(combined, name)) == report_keys(getattr(expected, name))
+        assert getattr(combined, name)['FIRST_INDEX'].tolist() == getattr(expected, name)['FIRST_INDEX'].tolist()
+    assert (combined.key_count, combined.merged_rows) == (expected.key_count, expected.merged_rows)
+
+def test_write_reports_summary(tmp_path):
+    """보고서 파일과 요약 JSON의 키 수, 행 수가 진단 결과와 같은지 확인"""
+    inno_df, pw_df = random_frames(1)
+    key_diagnostics = compare(inno_df, pw_df)
+    paths = diagnostics.write_reports(key_diagnostics, str(tmp_path / 'diagnostics'))
+    assert len(paths) == len(diagnostics.DIAGNOSTIC_REPORTS) + 1
+
+    with open(paths[-1], encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary['key_count'] == key_diagnostics.key_count
+    assert summary['fanout_factor'] == round(key_diagnostics.merged_rows / key_diagnostics.key_count, 6)
+    for name, path in zip(diagnostics.DIAGNOSTIC_REPORTS, paths):
+        report = pd.read_csv(path)
+        assert len(report) == summary[name]['keys'] == len(getattr(key_diagnostics, name))
+        assert report['FIRST_COUNT'].sum() == summary[name]['first_rows']
+        assert report['SECOND_COUNT'].sum() == summary[name]['second_rows']
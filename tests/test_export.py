@@ -0,0 +1,122 @@
+import gzip
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.formatting as formatting
+import bel_comparator.run_diff as run_diff
+from bel_comparator.custom_exceptions import ComparisonCancelledError
+from bel_comparator.progress import ProgressReporter
+
+FIRST_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n,10,0,1\n3,,0,1\n'
+SECOND_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n1,10,0,1,0.5\n,10,0,1,0.25\n3,,0,1,1\n4,11,0,1,1\n'
+
+def compare_inputs(tmp_path):
+    """테스트 입력으로 비교한 숫자형 결과를 반환하는 함수"""
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSV, encoding='utf-8')
+    second = tmp_path / 'second.csv'
+    second.write_text(SECOND_CSV, encoding='utf-8')
+    return data_processing.run_comparison(str(first), str(second), '0.5\n0.25\n1', '', '', '', 0.001, 1000,
+                                          lambda message: None, use_cache=False).result
+
+def expected_csv(result):
+    """export의 CSV 결과가 같아야 하는 DataFrame.to_csv 결과"""
+    return formatting.format_result(result).to_csv(index=False).encode('utf-8')
+
+def test_format_text_writes_nan():
+    """범주형/문자열 키의 빈 값이 INDEX, DIFF와 같이 'NaN'으로 표시되는지 확인"""
+    assert list(formatting.format_text(pd.Categorical(['A', np.nan, 'B']))) == ['A', 'NaN', 'B']
+    assert list(formatting.format_text(pd.Series(['A', None], dtype=object))) == ['A', 'NaN']
+    assert list(formatting.format_text(pd.Series([1.5, np.nan]), na_rep='')) == ['1.5', '']
+
+def test_export_writes_nan_keys(tmp_path):
+    """빈 POL_NO, RIDER_PRD_CODE가 내보낸 CSV에 'NaN'으로 쓰이고 실행 비교에서 다시 NaN 키로 읽히는지 확인"""
+    result = compare_inputs(tmp_path)
+
+    output = tmp_path / 'result.csv'
+    export.export_result(result, str(output))
+    assert output.read_text(encoding='utf-8').splitlines() == [
+        'ROW,INDEX,POL_NO,RIDER_PRD_CODE,ANSWER_BEL,INPUT_BEL,DIFF',
+        '0,0,1.0,10.0,0.500000,0.500000,0.000000',
+        '1,NaN,3.0,NaN,1.000000,1.000000,0.000000',
+        '2,NaN,4.0,11.0,1.000000,,NaN',
+        '3,NaN,NaN,10.0,0.250000,0.250000,0.000000',
+    ]
+
+    excel_output = tmp_path / 'result.excel.csv'
+    export.export_result(result, str(excel_output), export_format=export.FORMAT_EXCEL_CSV)
+    expected = list(run_diff.key_strings(result['POL_NO']))
+    for path, encoding in ((output, 'utf-8'), (excel_output, 'utf-8-sig')):
+        assert list(run_diff.key_strings(pd.read_csv(path, encoding=encoding)['POL_NO'])) == expected
+
+@pytest.mark.parametrize('chunk_rows', [1, export.EXPORT_CHUNK_ROWS])
+def test_csv_formats_round_trip(tmp_path, chunk_rows):
+    """CSV, gzip/zstd 압축 CSV가 청크 크기와 관계없이 to_csv와 같은 내용을 쓰는지 확인"""
+    result = compare_inputs(tmp_path)
+    expected = expected_csv(result)
+
+    export.export_result(result, str(tmp_path / 'result.csv'), chunk_rows=chunk_rows)
+    assert (tmp_path / 'result.csv').read_bytes() == expected
+    export.export_result(result, str(tmp_path / 'result.csv.gz'), chunk_rows=chunk_rows)
+    assert gzip.decompress((tmp_path / 'result.csv.gz').read_bytes()) == expected
+    if export.pa is not None:
+        export.export_result(result, str(tmp_path / 'result.csv.zst'), chunk_rows=chunk_rows)
+        with export.pa.CompressedInputStream(str(tmp_path / 'result.csv.zst'), 'zstd') as stream:
+            assert stream.read() == expected
+
+def test_excel_csv_keeps_keys_as_text(tmp_path):
+    """Excel용 CSV가 BOM, CRLF 줄바꿈과 키 컬럼의 텍스트 수식으로 쓰이는지 확인"""
+    result = compare_inputs(tmp_path)
+    output = tmp_path / 'result.csv'
+    export.export_result(result, str(output), export_format=export.FORMAT_EXCEL_CSV)
+    data = output.read_bytes()
+    assert data.startswith(b'\xef\xbb\xbf')
+    lines = data[3:].decode('utf-8').split('\r\n')
+    assert lines[0] == 'ROW,INDEX,POL_NO,RIDER_PRD_CODE,ANSWER_BEL,INPUT_BEL,DIFF'
+    assert lines[1] == '0,0,"=""1.0""","=""10.0""",0.500000,0.500000,0.000000'
+    assert lines[-1] == ''
+
+def test_parquet_round_trip(tmp_path):
+    """Parquet은 여러 청크로 써도 숫자형 결과를 그대로 다시 읽을 수 있는지 확인 (숫자 범주형 키는 숫자 컬럼으로 읽힘)"""
+    if export.pa is None:
+        pytest.skip('Parquet 내보내기에는 pyarrow가 필요합니다.')
+    result = compare_inputs(tmp_path)
+    output = tmp_path / 'result.parquet'
+    assert export.export_result(result, str(output), chunk_rows=1) == len(result)
+    expected = result.reset_index(drop=True)
+    for col in ['POL_NO', 'RIDER_PRD_CODE']:
+        expected[col] = expected[col].astype(expected[col].cat.categories.dtype)
+    pd.testing.assert_frame_equal(pd.read_parquet(output), expected)
+
+def test_export_selected_rows(tmp_path):
+    """rows로 위치 배열이나 bool 마스크를 주면 해당 행만 순서대로 내보내는지 확인"""
+    result = compare_inputs(tmp_path)
+    mask = np.array([True, False, True, False])
+    output = tmp_path / 'result.csv'
+    assert export.export_result(result, str(output), rows=mask) == 2
+    assert output.read_bytes() == expected_csv(result[mask])
+    assert export.export_result(result, str(output), rows=[]) == 0
+    assert output.read_bytes() == expected_csv(result.iloc[:0])
+
+@pytest.mark.parametrize('name', ['result.csv', 'result.csv.gz', 'result.parquet'])
+def test_cancelled_export_removes_partial_file(tmp_path, name):
+    """내보내기 도중 취소되면 일부만 쓴 파일을 남기지 않는지 확인"""
+    if name.endswith('.parquet') and export.pa is None:
+        pytest.skip('Parquet 내보내기에는 pyarrow가 필요합니다.')
+    result = compare_inputs(tmp_path)
+    updates = []
+    progress = ProgressReporter(callback=lambda stage, done, total: updates.append(done),
+                                is_cancelled=lambda: len(updates) >= 2)
+    output = tmp_path / name
+    with pytest.raises(ComparisonCancelledError):
+        export.export_result(result, str(output), progress=progress, chunk_rows=1)
+    assert not os.path.exists(output)
+
+def test_unknown_format_is_rejected(tmp_path):
+    """지원하지 않는 형식은 파일을 만들기 전에 거부하는지 확인"""
+    with pytest.raises(ValueError):
+        export.ResultWriter(str(tmp_path / 'result.xlsx'), 'xlsx')
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,50 @@
+import os
+import time
+import pytest
+
+pytest.importorskip('PyQt5')
+pytest.importorskip('pyarrow')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+import bel_comparator.gui as gui  # noqa: E402
+import bel_comparator.result_store as result_store  # noqa: E402
+
+FIRST_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n'
+SECOND_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n1,10,0,1,0.5\n2,10,0,1,0.25\n'
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def run_gui_comparison(app, tmp_path, store):
+    """GUI에서 비교를 실행하고 워커가 끝날 때까지 이벤트 루프를 돌리는 함수"""
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSV, encoding='utf-8')
+    second = tmp_path / 'second.csv'
+    second.write_text(SECOND_CSV, encoding='utf-8')
+
+    window = gui.BELComparatorApp()
+    window.inno_csv_path = str(first)
+    window.pw_csv_path = str(second)
+    window.cached_chunksize = 1000  # 파일 선택 시 정해지는 청크 크기
+    window.bel_input.setPlainText('0.5\n0.25')
+    window.store_checkbox.setChecked(store)
+    window.compare_bel()
+    deadline = time.time() + 30
+    while window.worker_thread is not None and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert window.worker_thread is None
+    assert window.error_count_label.text() == 'Errors: 0'
+    window.close()
+
+@pytest.mark.parametrize('store', [False, True])
+def test_store_is_opt_in(app, tmp_path, monkeypatch, store):
+    """'결과 저장'을 체크하지 않으면 GUI 비교 결과를 저장하지 않고, 체크하면 저장하는지 확인"""
+    monkeypatch.setenv('BEL_COMPARATOR_STORE_DIR', str(tmp_path / 'runs'))
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(tmp_path / 'cache'))
+    assert not gui.BELComparatorApp().store_checkbox.isChecked()  # 기본값: 저장하지 않음
+
+    run_gui_comparison(app, tmp_path, store)
+    assert len(result_store.list_runs()) == (1 if store else 0)
@@ -0,0 +1,46 @@
+import io
+import json
+import bel_comparator.cli as cli
+import bel_comparator.instrumentation as instrumentation
+from bel_comparator.progress import STAGE_MERGE, STAGE_LOAD_FIRST, STAGE_LOAD_SECOND, STAGE_EXPORT
+
+FIRST_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n3,10,0,1\n'
+SECOND_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n1,10,0,1,0.5\n2,10,0,1,0.25\n9,10,0,1,0.5\n'
+BEL_TEXT = '0.5\n0.5\n0.125\n'
+
+def test_measure_records_stage_and_calls_sink():
+    """measure가 블록에서 지정한 행 수와 시간, RSS를 기록하고 sink에도 같은 기록을 전달하는지 확인"""
+    stream = io.StringIO()
+    metrics = instrumentation.Instrumentation(instrumentation.json_lines_sink(stream))
+    with metrics.measure(STAGE_MERGE) as record:
+        sum(range(100000))
+        record['rows'] = 42
+    with metrics.measure(STAGE_EXPORT):
+        pass
+
+    merge, export = metrics.records
+    assert merge['stage'] == STAGE_MERGE and merge['rows'] == 42
+    assert merge['wall_seconds'] >= 0 and merge['cpu_seconds'] >= 0
+    assert {'rss_mb', 'rss_delta_mb'} <= set(merge)
+    assert export['rows'] is None
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == metrics.records
+
+    summary = instrumentation.format_summary(metrics.records)
+    assert len(summary) == 3 and '42행' in summary[1]
+    assert instrumentation.format_summary([]) == []
+
+def test_cli_metrics_writes_json_lines_per_stage(tmp_path):
+    """CLI --metrics FILE이 각 단계의 기록을 JSON 한 줄씩 쓰고 로드 단계의 행 수가 파일 행 수와 같은지 확인"""
+    paths = {}
+    for name, text in [('first.csv', FIRST_CSV), ('second.csv', SECOND_CSV), ('bel.txt', BEL_TEXT)]:
+        paths[name] = tmp_path / name
+        paths[name].write_text(text, encoding='utf-8')
+    metrics_path = tmp_path / 'metrics.jsonl'
+    exit_code = cli.main([str(paths['first.csv']), str(paths['second.csv']), str(paths['bel.txt']),
+                          '-o', str(tmp_path / 'result.csv'), '--no-cache', '--metrics', str(metrics_path)])
+    assert exit_code == 0
+
+    records = {record['stage']: record for record in map(json.loads, metrics_path.read_text(encoding='utf-8').splitlines())}
+    assert {STAGE_LOAD_FIRST, STAGE_LOAD_SECOND, STAGE_MERGE, STAGE_EXPORT} <= set(records)
+    assert records[STAGE_LOAD_FIRST]['rows'] == 3
+    assert records[STAGE_LOAD_SECOND]['rows'] == 3
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.key_index as key_index
+from bel_comparator import BELComparator
+
+KEY_COLUMNS = ['POL_NO', 'RIDER_PRD_CODE', 'INIT_V_CHECK', 'LOA_CODE']
+
+def baseline_calculate_index(inno_df, row):
+    """개선 전 BELComparator.calculate_index (행마다 Innolink 전체에서 같은 키의 첫 행을 찾음)"""
+    matching_indices = inno_df.index[
+        (inno_df['POL_NO'] == row['POL_NO']) &
+        (inno_df['RIDER_PRD_CODE'] == row['RIDER_PRD_CODE']) &
+        (inno_df['INIT_V_CHECK'] == row['INIT_V_CHECK']) &
+        (inno_df['LOA_CODE'] == row['LOA_CODE'])
+    ]
+    return matching_indices[0] if not matching_indices.empty else None
+
+def baseline_compare(inno_df, pw_df, bel_values):
+    """개선 전 compare_bel의 병합과 INDEX/ROW 계산 (포맷팅 전 값)"""
+    inno_df = inno_df.assign(INNOLINC_BEL=bel_values)
+    merged_df = pd.merge(pw_df, inno_df[KEY_COLUMNS + ['INNOLINC_BEL']], on=KEY_COLUMNS, how='outer')
+    merged_df = merged_df[merged_df['BEL'].notna()]
+    merged_df['DIFF'] = merged_df['BEL'] - merged_df['INNOLINC_BEL']
+    merged_df['INDEX'] = merged_df.apply(lambda row: baseline_calculate_index(inno_df, row), axis=1)
+    merged_df['ROW'] = merged_df.index
+    return merged_df
+
+def compare(inno_df, pw_df, bel_values):
+    comparator = BELComparator(inno_df.copy(), pw_df.copy(), bel_values)
+    comparator.validate_and_prepare_data()
+    return comparator.compare_bel()
+
+def assert_same_as_baseline(inno_df, pw_df):
+    bel_values = np.arange(len(inno_df), dtype=np.float64) / 8
+    expected = baseline_compare(inno_df, pw_df, bel_values)
+    result = compare(inno_df, pw_df, bel_values)
+
+    assert result['ROW'].tolist() == expected['ROW'].tolist()
+    expected_index = [None if pd.isna(value) else int(value) for value in expected['INDEX']]
+    assert [None if pd.isna(value) else int(value) for value in result['INDEX']] == expected_index
+    assert result['POL_NO'].astype(str).tolist() == expected['POL_NO'].astype(str).tolist()
+    np.testing.assert_array_equal(result['DIFF'].to_numpy(), expected['DIFF'].to_numpy(dtype=np.float64))
+
+def frame(rows, bel=None):
+    df = pd.DataFrame(rows, columns=KEY_COLUMNS)
+    if bel is not None:
+        df['BEL'] = bel
+    return df
+
+def test_duplicate_keys():
+    """First와 Second 양쪽에 중복된 키는 병합 행으로 펼쳐지고 INDEX는 First의 첫 행인지 확인"""
+    inno_df = frame([[1, 10, 0, 1], [1, 10, 0, 1], [2, 10, 0, 1], [1, 10, 0, 1], [3, 20, 1, 2]])
+    pw_df = frame([[1, 10, 0, 1], [2, 10, 0, 1], [1, 10, 0, 1], [3, 20, 1, 2], [3, 20, 1, 2]], [1.0, 2.0, 3.0, 4.0, 5.0])
+    assert_same_as_baseline(inno_df, pw_df)
+
+def test_nan_keys():
+    """키 컬럼에 NaN이 있는 행은 병합되지만 INDEX는 NaN(== 비교로 일치하지 않음)인지 확인"""
+    inno_df = frame([[1.0, 10, 0, 1], [np.nan, 10, 0, 1], [2.0, np.nan, 0, 1], [np.nan, 10, 0, 1]])
+    pw_df = frame([[np.nan, 10, 0, 1], [1.0, 10, 0, 1], [2.0, np.nan, 0, 1], [np.nan, 10, 0, 1]], [1.0, 2.0, 3.0, 4.0])
+    assert_same_as_baseline(inno_df, pw_df)
+
+def test_missing_keys_and_offset_index():
+    """한쪽에만 있는 키(Second 전용은 INDEX NaN, First 전용은 BEL이 없어 제외)와 범위로 자른 First의 행 번호를 확인"""
+    inno_df = frame([[9, 9, 9, 9], [1, 10, 0, 1], [4, 10, 0, 1], [2, 10, 0, 1], [5, 30, 0, 1]]).iloc[1:]
+    pw_df = frame([[2, 10, 0, 1], [7, 10, 0, 1], [1, 10, 0, 1], [6, 30, 0, 1]], [1.0, np.nan, 3.0, 4.0])
+    assert_same_as_baseline(inno_df, pw_df)
+
+def test_string_keys():
+    """문자열 키도 같은 결과인지 확인"""
+    inno_df = frame([['A1', 'R1', 0, 'L'], ['B2', 'R1', 0, 'L'], ['A1', 'R2', 0, 'L'], ['A1', 'R1', 0, 'L']])
+    pw_df = frame([['A1', 'R1', 0, 'L'], ['C3', 'R1', 0, 'L'], ['A1', 'R2', 0, 'L']], [1.0, 2.0, 3.0])
+    assert_same_as_baseline(inno_df, pw_df)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_keys(seed):
+    """값 범위가 좁아 중복, NaN, 한쪽에만 있는 키가 섞인 무작위 데이터에서 같은 결과인지 확인"""
+    rng = np.random.default_rng(seed)
+
+    def random_frame(length):
+        df = pd.DataFrame({col: rng.integers(0, 4, length).astype(np.float64) for col in KEY_COLUMNS})
+        df = df.mask(rng.random(df.shape) < 0.05)
+        return df
+
+    inno_df = random_frame(60)
+    pw_df = random_frame(50).assign(BEL=rng.normal(size=50))
+    pw_df.loc[rng.random(50) < 0.1, 'BEL'] = np.nan
+    assert_same_as_baseline(inno_df, pw_df)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_radix_overflow(monkeypatch, seed):
+    """합성 키 코드가 int64 범위를 넘어 다시 매기는 경우에도 같은 결과인지 확인 (한도를 낮춰 매 컬럼마다 다시 매김)"""
+    monkeypatch.setattr(key_index, 'MAX_PACKED_KEY', 7)
+    rng = np.random.default_rng(seed)
+    inno_df = pd.DataFrame({col: rng.integers(0, 6, 80) for col in KEY_COLUMNS})
+    pw_df = pd.DataFrame({col: rng.integers(0, 6, 60) for col in KEY_COLUMNS}).assign(BEL=rng.normal(size=60))
+    inno_df.loc[rng.random(80) < 0.05, 'POL_NO'] = np.nan
+    assert_same_as_baseline(inno_df, pw_df)
+
+def test_encode_keys_real_int64_overflow():
+    """고유값이 많은 네 컬럼으로 실제 int64 범위를 넘는 경우 키 코드가 키의 사전순과 같은 순서인지 확인"""
+    length = 60000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({col: rng.permutation(length) for col in KEY_COLUMNS})
+    assert np.prod([float(length + 1)] * len(KEY_COLUMNS)) > np.iinfo(np.int64).max
+
+    keys = key_index.encode_keys([df.iloc[:40000], df.iloc[40000:]]).keys
+    codes = np.concatenate(keys)
+    expected_order = np.lexsort([df[col].to_numpy() for col in reversed(KEY_COLUMNS)])
+    assert (np.diff(codes[expected_order]) > 0).all()
+
+def test_encode_keys_shares_codes_across_frames():
+    """같은 키는 프레임이 달라도 같은 코드이고(NaN 키끼리도 같음), NaN은 각 컬럼에서 모든 값보다 뒤에 정렬되는지 확인"""
+    pw_df = frame([[2.0, 10, 0, 1], [np.nan, 10, 0, 1], [1.0, 20, 0, 1]])
+    inno_df = frame([[1.0, 20, 0, 1], [np.nan, 10, 0, 1], [2.0, 10, 0, 1], [2.0, 10, 1, 1]])
+    encoding = key_index.encode_keys([pw_df, inno_df])
+    pw_keys, inno_keys = encoding.keys
+
+    assert inno_keys[0] == pw_keys[2] and inno_keys[1] == pw_keys[1] and inno_keys[2] == pw_keys[0]
+    assert pw_keys[2] < pw_keys[0] < inno_keys[3] < pw_keys[1]
+    assert encoding.valid[0].tolist() == [True, False, True]
+    assert encoding.valid[1].tolist() == [True, False, True, True]
+
+    frame_codes, uniques = encoding.columns['POL_NO']
+    assert list(uniques) == [1.0, 2.0]
+    assert frame_codes[0].tolist() == [1, 2, 0]  # NaN은 고유값 개수
+    decoded = key_index.decode_categorical(np.concatenate(frame_codes), uniques)
+    assert decoded.isna().tolist() == [False, True, False, False, True, False, False]
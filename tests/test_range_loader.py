@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.range_loader as range_loader
+import bel_comparator.export as export
+
+SECOND_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n1,10,0,1,0.5\n2,10,0,1,0.25\n9,10,0,1,0.5\n'
+BEL_TEXT = '0.5\n0.25\n0.125\n0.5\n0.5'
+
+# 범위 밖 행에만 빈 키(NaN)나 숫자가 아닌 키, 소수 키가 있는 First 파일
+FIRST_CSVS = {
+    'nan_outside': 'pol_no,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n3,10,0,1\n4,10,0,1\n,10,0,1\n',
+    'text_outside': 'pol_no,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n3,10,0,1\nA7,10,0,1\n',
+    'float_outside': 'pol_no,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n3,10,0,1\n4.5,10,0,1\n',
+    'wide_int_outside': 'pol_no,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n1,10,0,1\n2,10,0,1\n3,10,0,1\n200000000000,10,0,1\n',
+}
+
+def run(first, second, start, end, use_cache):
+    return data_processing.run_comparison(first, second, BEL_TEXT, start, end, '', 0.001, 1000, lambda message: None,
+                                          use_cache=use_cache)
+
+def exported_text(result, path):
+    export.export_result(result, str(path))
+    return path.read_text(encoding='utf-8')
+
+@pytest.mark.parametrize('name', sorted(FIRST_CSVS))
+def test_window_matches_full_load(tmp_path, monkeypatch, name):
+    """범위만 읽은 비교 결과가 전체 파일을 읽어 자른 비교 결과와 dtype, 내보낸 CSV까지 같은지 확인"""
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(tmp_path / 'cache'))
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSVS[name], encoding='utf-8')
+    second = tmp_path / 'second.csv'
+    second.write_text(SECOND_CSV, encoding='utf-8')
+
+    line_starts = range_loader.load_line_starts(str(first), True)
+    assert range_loader.is_usable(line_starts)
+    windowed = [run(str(first), str(second), '0', '2', True) for _ in range(2)]  # 두 번째는 캐시 적중
+
+    # 줄 위치 색인을 쓰지 않으면 전체 파일을 읽어 자르는 경로로 비교
+    monkeypatch.setattr(range_loader, 'is_usable', lambda line_starts: False)
+    full = run(str(first), str(second), '0', '2', True)
+
+    for comparison in windowed:
+        pd.testing.assert_frame_equal(comparison.result, full.result)
+        assert exported_text(comparison.result, tmp_path / 'windowed.csv') == exported_text(full.result, tmp_path / 'full.csv')
+
+def test_no_cache_reads_full_file(tmp_path, monkeypatch):
+    """캐시를 쓰지 않으면 줄 위치 색인과 dtype을 구하지 않고 전체 파일을 읽어 자르며, 결과는 범위 읽기와 같은지 확인"""
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(tmp_path / 'cache'))
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSVS['nan_outside'], encoding='utf-8')
+    second = tmp_path / 'second.csv'
+    second.write_text(SECOND_CSV, encoding='utf-8')
+    windowed = run(str(first), str(second), '0', '2', True)
+
+    def fail(*args):
+        raise AssertionError('캐시 없이 범위 읽기 경로를 사용함')
+    monkeypatch.setattr(range_loader, 'load_line_starts', fail)
+    monkeypatch.setattr(range_loader, 'load_column_dtypes', fail)
+    full = run(str(first), str(second), '0', '2', False)
+    pd.testing.assert_frame_equal(full.result, windowed.result)
+
+def test_window_uses_full_file_dtypes(tmp_path):
+    """범위 안 값이 모두 정수여도 전체 파일 기준 dtype(float, object)으로 읽는지 확인"""
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSVS['nan_outside'], encoding='utf-8')
+    line_starts = range_loader.build_line_starts(str(first))
+    dtypes = range_loader.load_column_dtypes(str(first), ['POL_NO'], 1000, use_cache=False)
+    window = range_loader.read_row_window(str(first), line_starts, 0, 1, ['POL_NO'], dtypes)
+    assert window['POL_NO'].dtype == np.float64
+
+    first.write_text(FIRST_CSVS['text_outside'], encoding='utf-8')
+    line_starts = range_loader.build_line_starts(str(first))
+    dtypes = range_loader.load_column_dtypes(str(first), ['POL_NO'], 1000, use_cache=False)
+    window = range_loader.read_row_window(str(first), line_starts, 0, 1, ['POL_NO'], dtypes)
+    assert list(window['POL_NO']) == ['1', '2']
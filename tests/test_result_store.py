@@ -0,0 +1,100 @@
+import json
+import os
+import time
+import pandas as pd
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.diagnostics as diagnostics
+import bel_comparator.result_store as result_store
+
+pytestmark = pytest.mark.skipif(not result_store.is_available(), reason='결과 저장에는 pyarrow가 필요합니다.')
+
+FIRST_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\nA1,10,0,201901\n2,10,0,201901\n2,10,0,201901\n,11,0,201902\n'
+SECOND_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\nA1,10,0,201901,0.5\n2,10,0,201901,0.3\n9,12,0,201903,1\n'
+BEL_TEXT = '0.5\n0.25\n0.25\nN/A'
+
+@pytest.fixture
+def comparison(tmp_path):
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSV, encoding='utf-8')
+    second = tmp_path / 'second.csv'
+    second.write_text(SECOND_CSV, encoding='utf-8')
+    inputs = result_store.RunInputs(str(first), str(second), 'bel.txt', BEL_TEXT, '', '')
+    return data_processing.run_comparison(str(first), str(second), BEL_TEXT, '', '', '', 0.001, 1000,
+                                          lambda message: None, use_cache=False), inputs
+
+def set_created(run, created):
+    """저장된 실행의 생성 시각을 바꾸는 함수"""
+    metadata_path = os.path.join(run.path, result_store.METADATA_FILE_NAME)
+    metadata = dict(run.metadata, created=created)
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f)
+
+def without_empty_categories(report):
+    """범주가 없는(값이 모두 NaN인) 범주형 컬럼을 object로 바꾸는 함수
+
+    빈 문자열 사전은 Feather에서 str이 아닌 object 범주로 읽히므로 이런 컬럼은 값만 비교합니다.
+    """
+    return report.assign(**{col: report[col].astype(object) for col in report.columns
+                            if isinstance(report[col].dtype, pd.CategoricalDtype) and len(report[col].cat.categories) == 0})
+
+def test_open_run_restores_comparison(tmp_path, comparison):
+    """저장한 실행을 열면 결과, dtype, 행별 LOA_CODE, 키 진단과 요약이 저장 전과 같은지 확인"""
+    comparison, inputs = comparison
+    store_dir = str(tmp_path / 'runs')
+    run_id = result_store.save_run(comparison, inputs, store_dir)
+    run = result_store.find_run(run_id, store_dir)
+    assert [stored.run_id for stored in result_store.list_runs(store_dir)] == [run_id]
+    assert run.metadata['rows'] == len(comparison.result)
+    assert run.metadata['errors'] == data_processing.calculate_error_count(comparison.result, 0.001, False)
+    assert run.metadata['first']['size'] == len(FIRST_CSV)
+
+    opened = result_store.open_run(run)
+    pd.testing.assert_frame_equal(opened.result, comparison.result)
+    pd.testing.assert_extension_array_equal(opened.loa_code, comparison.loa_code)
+    assert (opened.inno_count, opened.pw_count, opened.adjustment_factor) == (
+        comparison.inno_count, comparison.pw_count, comparison.adjustment_factor)
+    for name in diagnostics.DIAGNOSTIC_REPORTS:
+        pd.testing.assert_frame_equal(without_empty_categories(getattr(opened.key_diagnostics, name)),
+                                      without_empty_categories(getattr(comparison.key_diagnostics, name)))
+    assert opened.key_diagnostics.merged_rows == comparison.key_diagnostics.merged_rows
+
+def test_list_runs_skips_partial_and_old_versions(tmp_path, comparison, monkeypatch):
+    """저장 중 실패한 실행은 남지 않고, 임시 디렉터리와 다른 형식 버전의 실행은 목록에서 제외하는지 확인"""
+    comparison, inputs = comparison
+    store_dir = tmp_path / 'runs'
+    run = result_store.find_run(result_store.save_run(comparison, inputs, str(store_dir)), str(store_dir))
+    with open(os.path.join(run.path, result_store.METADATA_FILE_NAME), 'w', encoding='utf-8') as f:
+        json.dump(dict(run.metadata, version=result_store.STORE_VERSION - 1), f)
+    (store_dir / 'partial.123.tmp').mkdir()
+    assert result_store.list_runs(str(store_dir)) == []
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(result_store.feather, 'write_feather', fail)
+    with pytest.raises(OSError):
+        result_store.save_run(comparison, inputs, str(store_dir))
+    assert sorted(os.listdir(store_dir)) == sorted([run.run_id, 'partial.123.tmp'])
+
+def test_prune_removes_expired_then_oldest_runs(tmp_path, comparison):
+    """보관 기간이 지난 실행과 용량을 넘는 오래된 실행부터 삭제하고 keep의 실행은 남기는지 확인"""
+    comparison, inputs = comparison
+    store_dir = str(tmp_path / 'runs')
+    run_ids = [result_store.save_run(comparison, inputs, store_dir) for _ in range(4)]
+    now = time.time()
+    for age, run_id in zip([40, 30, 20, 10], run_ids):  # 첫 실행이 가장 오래됨
+        set_created(result_store.find_run(run_id, store_dir), now - age)
+    run_bytes = result_store.directory_size(result_store.find_run(run_ids[0], store_dir).path)
+
+    assert result_store.prune(store_dir, 10 * run_bytes, 35, keep={run_ids[0]}) == 0
+    assert [run.run_id for run in result_store.list_runs(store_dir)] == run_ids[::-1]
+
+    assert result_store.prune(store_dir, 10 * run_bytes, 35) == 1  # 기간 초과
+    assert result_store.prune(store_dir, 2 * run_bytes, 35, keep={run_ids[1]}) == 1  # 용량 초과, keep 제외
+    assert [run.run_id for run in result_store.list_runs(store_dir)] == [run_ids[3], run_ids[1]]
+
+def test_store_limits_accept_fractional_values(monkeypatch):
+    """용량과 보관 기간 환경 변수에 소수를 쓸 수 있는지 확인"""
+    monkeypatch.setenv('BEL_COMPARATOR_STORE_MAX_MB', '0.5')
+    monkeypatch.setenv('BEL_COMPARATOR_STORE_MAX_DAYS', '0.5')
+    assert result_store.get_store_limits() == (512 * 1024, 12 * 60 * 60)
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.result_store as result_store
+import bel_comparator.run_diff as run_diff
+
+# First에는 중복 키와 빈 키가 있음
+FIRST_CSV = ('POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n'
+             '1,10,0,1\n2,10,0,1\n2,10,0,1\n,11,0,1\n4,12,0,1\n5,10,0,1\n6,10,0,1\n')
+OLD_SECOND_CSV = ('POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n'
+                  '1,10,0,1,0.5\n2,10,0,1,0.25\n,11,0,1,0.125\n4,12,0,1,1\n5,10,0,1,2\n6,10,0,1,3\n7,10,0,1,1\n')
+# 7은 빠지고 8이 추가됨
+NEW_SECOND_CSV = ('POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n'
+                  '1,10,0,1,0.5\n2,10,0,1,0.25\n,11,0,1,0.125\n4,12,0,1,1\n5,10,0,1,2\n6,10,0,1,3\n8,10,0,1,1\n')
+# 이전 실행: 2 통과, 4 에러, 5 통과, 6 에러 / 새 실행: 2 에러, 4 통과, 5는 허용오차 안에서 변화, 6은 N/A
+OLD_BEL_TEXT = '0.5\n0.25\n0.25\n0.125\n0.75\n2\n2.5'
+NEW_BEL_TEXT = '0.5\n0.375\n0.375\n0.125\n1\n2.0005\nN/A'
+TOLERANCE = 0.001
+
+@pytest.fixture
+def comparisons(tmp_path, monkeypatch):
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(tmp_path / 'cache'))
+    first = tmp_path / 'first.csv'
+    first.write_text(FIRST_CSV, encoding='utf-8')
+    results = []
+    for name, second_csv, bel_text in [('old', OLD_SECOND_CSV, OLD_BEL_TEXT), ('new', NEW_SECOND_CSV, NEW_BEL_TEXT)]:
+        second = tmp_path / f'{name}_second.csv'
+        second.write_text(second_csv, encoding='utf-8')
+        comparison = data_processing.run_comparison(str(first), str(second), bel_text, '', '', '', TOLERANCE, 1000,
+                                                    lambda message: None)
+        inputs = result_store.RunInputs(str(first), str(second), name, bel_text, '', '')
+        results.append((comparison, inputs))
+    return results
+
+def write_source(comparison, inputs, source_format, path, store_dir):
+    """비교 결과를 형식에 맞게 파일로 내보내거나 저장소에 저장하고 run_diff에 넘길 경로/실행 ID를 반환하는 함수"""
+    if source_format == 'stored':
+        return result_store.save_run(comparison, inputs, store_dir)
+    export.export_result(comparison.result, str(path), export_format=source_format)
+    return str(path)
+
+def reference_reports(old_result, new_result, exclude_na):
+    """두 결과를 키와 키 안 등장 순번으로 pd.merge하여 보고서별 (OLD_ROW, NEW_ROW) 집합을 계산하는 함수"""
+    def keyed(result):
+        frame = pd.DataFrame({
+            'POL_NO': run_diff.key_strings(result['POL_NO']),
+            'RIDER_PRD_CODE': run_diff.key_strings(result['RIDER_PRD_CODE']),
+            'INDEX': result['INDEX'].astype(np.float64).fillna(-1).to_numpy(),
+            'ROW': result['ROW'].to_numpy(),
+            'DIFF': data_processing.diff_array(result),
+        })
+        frame['OCCURRENCE'] = frame.groupby(run_diff.DIFF_KEY_COLUMNS).cumcount()
+        return frame
+
+    merged = pd.merge(keyed(old_result), keyed(new_result), on=run_diff.DIFF_KEY_COLUMNS + ['OCCURRENCE'],
+                      how='outer', suffixes=('_OLD', '_NEW'), indicator=True)
+    both = merged[merged['_merge'] == 'both']
+    old_error = data_processing.error_mask(both['DIFF_OLD'].to_numpy(), TOLERANCE, exclude_na)
+    new_error = data_processing.error_mask(both['DIFF_NEW'].to_numpy(), TOLERANCE, exclude_na)
+    delta = (both['DIFF_NEW'] - both['DIFF_OLD']).abs().to_numpy()
+    changed = (delta > TOLERANCE) | (both['DIFF_OLD'].isna() != both['DIFF_NEW'].isna()).to_numpy()
+
+    def rows(frame):
+        return {(None if pd.isna(old) else int(old), None if pd.isna(new) else int(new))
+                for old, new in zip(frame['ROW_OLD'], frame['ROW_NEW'])}
+
+    return {
+        'newly_failing': rows(both[~old_error & new_error]),
+        'newly_passing': rows(both[old_error & ~new_error]),
+        'changed': rows(both[changed]),
+        'only_old': rows(merged[merged['_merge'] == 'left_only']),
+        'only_new': rows(merged[merged['_merge'] == 'right_only']),
+    }
+
+def report_rows(path):
+    report = pd.read_csv(path)
+    return {(None if pd.isna(old) else int(old), None if pd.isna(new) else int(new))
+            for old, new in zip(report['OLD_ROW'], report['NEW_ROW'])}
+
+@pytest.mark.parametrize('old_format,new_format', [
+    ('csv', 'csv'), (export.FORMAT_EXCEL_CSV, export.FORMAT_CSV_GZIP), ('parquet', 'stored'), ('stored', 'stored'),
+])
+@pytest.mark.parametrize('bucket_count', [1, 3])
+@pytest.mark.parametrize('exclude_na', [False, True])
+def test_run_diff_reports_match_merge(tmp_path, monkeypatch, comparisons, old_format, new_format, bucket_count,
+                                      exclude_na):
+    """결과 파일과 저장된 실행의 보고서별 행이 pd.merge로 계산한 상태 변화와 같고, 요약 값이 맞는지 확인"""
+    if 'parquet' in (old_format, new_format) or 'stored' in (old_format, new_format):
+        if not result_store.is_available():
+            pytest.skip('Parquet 결과와 저장된 실행에는 pyarrow가 필요합니다.')
+    monkeypatch.setattr(run_diff, 'estimate_bucket_count', lambda sources, memory_limit_bytes: bucket_count)
+    store_dir = str(tmp_path / 'runs')
+    (old_comparison, old_inputs), (new_comparison, new_inputs) = comparisons
+    old_source = write_source(old_comparison, old_inputs, old_format, tmp_path / f'old.{old_format}', store_dir)
+    new_source = write_source(new_comparison, new_inputs, new_format, tmp_path / f'new.{new_format}', store_dir)
+
+    result = run_diff.run_diff(old_source, new_source, str(tmp_path / 'diff'), TOLERANCE, exclude_na,
+                               lambda message: None, store_dir=store_dir)
+    expected = reference_reports(old_comparison.result, new_comparison.result, exclude_na)
+    for name, path in zip(run_diff.RUN_DIFF_REPORTS, result.paths):
+        assert report_rows(path) == expected[name], name
+        assert result.counts[name] == len(expected[name])
+    assert all(expected.values())  # 모든 보고서에 행이 있는 입력
+    assert result.counts['old_rows'] == len(old_comparison.result)
+    assert result.counts['new_rows'] == len(new_comparison.result)
+    assert result.max_abs_delta == pytest.approx(0.25)
+
+def test_run_diff_rejects_unknown_source(tmp_path):
+    """없는 파일이나 실행 ID는 오류로 알리는지 확인"""
+    with pytest.raises(run_diff.InvalidInputError):
+        run_diff.run_diff(str(tmp_path / 'missing.csv'), str(tmp_path / 'missing.csv'), str(tmp_path / 'diff'),
+                          TOLERANCE, store_dir=str(tmp_path / 'runs'))
@@ -0,0 +1,51 @@
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.session as session
+
+# First에는 중복 키와 빈 키(NaN)가 있어 POL_NO가 float이고, Second의 POL_NO는 정수
+FIRST_CSV = ('POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\n'
+             '123,10,0,201901\n123,10,0,201901\n,11,0,201901\n456,,0,201902\n789,12,1,201902\n')
+SECOND_CSV = ('POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE,BEL\n'
+              '123,10,0,201901,0.5\n456,13,0,201902,0.25\n789,12,1,201902,\n999,10,0,201903,1.5\n123,10,0,201901,0.75\n')
+# 텍스트 키가 있는 First (키 컬럼이 object)
+TEXT_FIRST_CSV = 'POL_NO,RIDER_PRD_CODE,INIT_V_CHECK,LOA_CODE\nA1,10,0,201901\n123,10,0,201901\n'
+BEL_TEXT = '0.5\n0.25\nN/A\n1.0\n2.0'
+
+# 범위 이름별 (시작, 종료)를 First 행 수로 계산하는 함수 (빈 범위는 마지막 행 다음부터)
+WINDOWS = {
+    'empty': lambda rows: (str(rows), ''),
+    'first_row': lambda rows: ('0', '0'),
+    'middle': lambda rows: ('1', '3'),
+    'tail': lambda rows: ('1', ''),
+    'full': lambda rows: ('', ''),
+}
+
+def exported_bytes(result, path):
+    export.export_result(result, str(path))
+    return path.read_bytes()
+
+@pytest.mark.parametrize('first_csv', [FIRST_CSV, TEXT_FIRST_CSV], ids=['nan_keys', 'text_keys'])
+@pytest.mark.parametrize('window', sorted(WINDOWS))
+def test_compare_range_matches_run_comparison(tmp_path, monkeypatch, first_csv, window):
+    """세션의 범위 비교 결과와 내보낸 CSV가 빈 범위, 일부 범위, 전체 범위에서 run_comparison과 같은지 확인"""
+    monkeypatch.setenv('BEL_COMPARATOR_CACHE_DIR', str(tmp_path / 'cache'))
+    first = tmp_path / 'first.csv'
+    first.write_text(first_csv, encoding='utf-8')
+    second = tmp_path / 'second.csv'
+    second.write_text(SECOND_CSV, encoding='utf-8')
+
+    start, end = WINDOWS[window](first_csv.count('\n') - 1)
+    comparison_session = session.ComparisonSession()
+    comparison_session.load(str(first), str(second), 1000, lambda message: None)
+    windowed = comparison_session.compare_range(BEL_TEXT, start, end, '', 0.001)
+    expected = data_processing.run_comparison(str(first), str(second), BEL_TEXT, start, end, '', 0.001, 1000,
+                                              lambda message: None)
+
+    assert exported_bytes(windowed.result, tmp_path / 'session.csv') == exported_bytes(expected.result,
+                                                                                       tmp_path / 'expected.csv')
+    assert windowed.result.dtypes.equals(expected.result.dtypes)
+    for col in ['POL_NO', 'RIDER_PRD_CODE']:
+        assert windowed.result[col].cat.categories.equals(expected.result[col].cat.categories)
+    assert windowed.loa_code.categories.equals(expected.loa_code.categories)
+    assert windowed.inno_count == expected.inno_count
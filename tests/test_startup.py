@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip('PyQt5')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# benchmarks/bench_startup.py의 기본 --budget과 같은 창 표시 예산 (초)
+STARTUP_BUDGET_SECONDS = 1.0
+
+# 진입 모듈을 불러오는 데 걸린 시간과 그 시점에 pandas, 비교 엔진이 불러와졌는지를 JSON으로 출력하는 자식 프로세스
+IMPORT_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import bel_comparator
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({'elapsed': elapsed, 'loaded': sorted(set(sys.argv[1:]) & set(sys.modules))}))
+'''
+
+def run_probe(probe, *args):
+    """새 프로세스에서 probe 코드를 실행하고 마지막 줄의 JSON을 반환하는 함수"""
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    output = subprocess.run([sys.executable, '-c', probe, *args], capture_output=True, text=True, check=True,
+                            cwd=ROOT_DIR, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_entry_import_is_lazy_and_fast():
+    """GUI 진입 모듈(main, bel_comparator)을 불러와도 pandas와 비교 엔진이 로드되지 않고 예산 안에 끝나는지 확인"""
+    heavy_modules = ['pandas', 'bel_comparator.bel_comparator_core', 'bel_comparator.data_processing']
+    probe = run_probe(IMPORT_PROBE, *heavy_modules)
+    assert probe['loaded'] == []
+    assert probe['elapsed'] < STARTUP_BUDGET_SECONDS
+
+def test_window_shows_before_pandas():
+    """창이 pandas를 불러오기 전에 예산 안에 뜨는지 확인"""
+    sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+    try:
+        import bench_startup
+    finally:
+        sys.path.pop(0)
+    shown_seconds, _, pandas_before_show = bench_startup.run_gui_probe()
+    assert not pandas_before_show
+    # 창 표시 시간에는 인터프리터 시작 시간이 포함되므로 그만큼 예산에 더함
+    assert shown_seconds < STARTUP_BUDGET_SECONDS + bench_startup.run_interpreter()
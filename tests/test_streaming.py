@@ -0,0 +1,91 @@
+import os
+import sys
+import pandas as pd
+import bel_comparator.data_processing as data_processing
+import bel_comparator.export as export
+import bel_comparator.streaming as streaming
+import bel_comparator.utils as utils
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+import generators  # noqa: E402
+import memory_probe  # noqa: E402
+
+MEMORY_LIMIT_MB = 1
+# 입력 크기와 무관하게 필요한 메모리 (인터프리터 작업 공간, pandas 파서 버퍼 등, MB)
+FIXED_OVERHEAD_MB = 24
+
+# 모듈을 모두 불러오고 BEL 텍스트를 읽은 뒤부터 스트리밍 비교가 끝날 때까지 늘어난 최대 RSS(MB)를 출력하는 자식 프로세스
+STREAMING_SCRIPT = '''
+import sys
+import bel_comparator.streaming as streaming
+import bel_comparator.utils as utils
+
+first_path, second_path, bel_path, output_path, memory_limit_mb = sys.argv[1:]
+bel_text = utils.read_text_file(bel_path)
+reset_peak_rss()
+before = peak_rss_mb()
+streaming.run_streaming_comparison(first_path, second_path, bel_text, '', '', '', 0.001, output_path,
+                                   False, False, lambda message: None, memory_limit_mb=int(memory_limit_mb))
+print(peak_rss_mb() - before)
+'''
+
+def streaming_peak_growth(inputs, output_path, memory_limit_mb):
+    """새 프로세스에서 스트리밍 비교를 실행하고 최대 RSS 증가량(MB)을 반환하는 함수"""
+    return memory_probe.run_child(STREAMING_SCRIPT, inputs.first_path, inputs.second_path, inputs.bel_path,
+                                  output_path, memory_limit_mb)[0]
+
+def test_streaming_peak_memory_and_output(tmp_path):
+    """스트리밍 비교의 최대 메모리가 입력 크기에 따라 늘지 않고 한도 + 고정 오버헤드 이내이며, 결과가 메모리 내 비교와 같은지 확인"""
+    memory_probe.require_peak_rss()
+    small = generators.write_inputs(str(tmp_path), 50000, duplicate_rate=0.01, missing_rate=0.01, seed=7)
+    os.makedirs(tmp_path / 'large')
+    large = generators.write_inputs(str(tmp_path / 'large'), 100000, duplicate_rate=0.01, missing_rate=0.01, seed=7)
+    input_bytes = os.path.getsize(small.first_path) + os.path.getsize(small.second_path)
+    assert input_bytes > 4 * MEMORY_LIMIT_MB * 2 ** 20
+
+    streamed_path = tmp_path / 'streamed.csv'
+    small_growth = streaming_peak_growth(small, tmp_path / 'small.csv', MEMORY_LIMIT_MB)
+    large_growth = streaming_peak_growth(large, streamed_path, MEMORY_LIMIT_MB)
+    # 한도가 입력보다 크면 파티션 하나로 메모리 내 비교와 같은 양의 메모리를 씀
+    single_partition_growth = streaming_peak_growth(large, tmp_path / 'single.csv', 1024)
+
+    assert large_growth < MEMORY_LIMIT_MB + FIXED_OVERHEAD_MB
+    assert large_growth - small_growth < FIXED_OVERHEAD_MB / 4  # 입력이 두 배가 되어도 거의 늘지 않음
+    assert large_growth < single_partition_growth / 4
+
+    comparison = data_processing.run_comparison(large.first_path, large.second_path,
+                                                utils.read_text_file(large.bel_path), '', '', '', 0.001, 100000,
+                                                lambda message: None, use_cache=False)
+    in_memory_path = tmp_path / 'in_memory.csv'
+    export.export_result(comparison.result, str(in_memory_path))
+    assert streamed_path.read_bytes() == in_memory_path.read_bytes()
+
+def test_warns_when_one_pol_no_exceeds_limit(tmp_path):
+    """한 POL_NO의 행만으로 메모리 한도를 넘으면 경고를 기록하고, 결과는 메모리 내 비교와 같은지 확인"""
+    inputs = generators.write_inputs(str(tmp_path), 20000, duplicate_rate=0.01, missing_rate=0.01, seed=3)
+    messages = []
+    streaming.run_streaming_comparison(inputs.first_path, inputs.second_path, utils.read_text_file(inputs.bel_path),
+                                       '', '', '', 0.001, str(tmp_path / 'uniform.csv'), False, False,
+                                       messages.append, memory_limit_mb=MEMORY_LIMIT_MB)
+    assert not [message for message in messages if message.startswith('주의')]
+
+    # First와 Second 행의 대부분을 같은 POL_NO로 바꿈
+    for path in (inputs.first_path, inputs.second_path):
+        df = pd.read_csv(path)
+        df.loc[df.index % 5 != 0, 'POL_NO'] = 7
+        df.to_csv(path, index=False)
+    messages = []
+    streamed_path = tmp_path / 'skewed.csv'
+    streaming.run_streaming_comparison(inputs.first_path, inputs.second_path, utils.read_text_file(inputs.bel_path),
+                                       '', '', '', 0.001, str(streamed_path), False, False,
+                                       messages.append, memory_limit_mb=MEMORY_LIMIT_MB)
+    warnings = [message for message in messages if message.startswith('주의')]
+    assert len(warnings) == 1 and 'POL_NO 7의' in warnings[0]
+
+    comparison = data_processing.run_comparison(inputs.first_path, inputs.second_path,
+                                                utils.read_text_file(inputs.bel_path), '', '', '', 0.001, 100000,
+                                                lambda message: None, use_cache=False)
+    in_memory_path = tmp_path / 'in_memory.csv'
+    export.export_result(comparison.result, str(in_memory_path))
+    assert streamed_path.read_bytes() == in_memory_path.read_bytes()
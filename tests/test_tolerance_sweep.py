@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+import bel_comparator.data_processing as data_processing
+import bel_comparator.tolerance_sweep as tolerance_sweep
+from bel_comparator.custom_exceptions import InvalidInputError
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sweep_matches_count_errors(seed):
+    """허용오차마다 스윕의 에러 수(N/A 포함/제외)가 count_errors와 같은지 확인 (허용오차와 같은 |DIFF|와 N/A 포함)"""
+    rng = np.random.default_rng(seed)
+    diff = rng.normal(scale=0.01, size=2000) * rng.choice([1, 1e-3, 1e-6], 2000)
+    diff[rng.random(2000) < 0.05] = np.nan
+    tolerances = tolerance_sweep.parse_tolerances(tolerance_sweep.DEFAULT_SWEEP + ',0.000001:0.00005:0.000001')
+    diff[:len(tolerances)] = tolerances * rng.choice([-1, 1], len(tolerances))  # 경계 값
+
+    sweep = tolerance_sweep.sweep_error_counts(tolerance_sweep.sort_diff(diff), tolerances)
+    assert sweep['TOLERANCE'].tolist() == tolerances.tolist()
+    assert sweep['ERRORS'].tolist() == [data_processing.count_errors(diff, tolerance, False) for tolerance in tolerances]
+    assert sweep['ERRORS_EXCLUDE_NA'].tolist() == [data_processing.count_errors(diff, tolerance, True)
+                                                   for tolerance in tolerances]
+
+def test_sweep_of_empty_diff():
+    """결과 행이 없으면 모든 허용오차의 에러 수가 0인지 확인"""
+    sweep = tolerance_sweep.sweep_error_counts(tolerance_sweep.sort_diff(np.empty(0)), np.array([0.001, 0.1]))
+    assert sweep['ERRORS'].tolist() == [0, 0] and sweep['ERRORS_EXCLUDE_NA'].tolist() == [0, 0]
+
+def test_parse_tolerances():
+    """값과 범위(종료 포함)를 오름차순 고유 배열로 바꾸고, 잘못된 입력은 거부하는지 확인"""
+    np.testing.assert_array_equal(tolerance_sweep.parse_tolerances('0.01, 0.001:0.003:0.001,0.001'),
+                                  [0.001, 0.002, 0.003, 0.01])
+    for text in ['', '0', '2', 'abc', '0.1:0.01:0.01', '0.01:0.1:0', '0.01:0.1', '0.000001:1:0.000001']:
+        with pytest.raises(InvalidInputError):
+            tolerance_sweep.parse_tolerances(text)
@@ -0,0 +1,78 @@
+import os
+import sys
+import numpy as np
+import pytest
+import bel_comparator.utils as utils
+from bel_comparator import BELComparator
+from bel_comparator.custom_exceptions import InvalidBELValuesError
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+import generators  # noqa: E402
+import memory_probe  # noqa: E402
+
+# 모듈을 모두 불러온 뒤부터 CSV 로드가 끝날 때까지 늘어난 최대 RSS(MB)와 결과 DataFrame 크기(MB)를 출력하는 자식 프로세스
+LOAD_SCRIPT = '''
+import sys
+import pandas as pd
+import bel_comparator.utils as utils
+from bel_comparator.key_index import KEY_COLUMNS
+
+file_name, loader, chunksize = sys.argv[1], sys.argv[2], int(sys.argv[3])
+reset_peak_rss()
+before = peak_rss_mb()
+if loader == 'chunked':
+    df = utils.load_csv_with_chunksize(file_name, chunksize, usecols=KEY_COLUMNS, use_cache=False)
+else:
+    df = pd.concat(pd.read_csv(file_name, chunksize=chunksize, usecols=KEY_COLUMNS), ignore_index=True)
+print(peak_rss_mb() - before, df.memory_usage(deep=True).sum() / 2 ** 20)
+'''
+
+def test_chunked_load_memory_scales_with_frame(tmp_path):
+    """청크 로더의 최대 메모리 증가가 파일 크기가 아니라 결과 DataFrame 크기만큼 늘고, pd.concat 로드보다 작은지 확인"""
+    memory_probe.require_peak_rss()
+    rng = np.random.default_rng(0)
+    file_names = []
+    for rows in (150000, 450000):
+        file_name = str(tmp_path / f'first_{rows}.csv')
+        generators.generate_first(rows, 0.01, rng).to_csv(file_name, index=False)
+        file_names.append(file_name)
+
+    # 두 파일의 차이로 비교하여 인터프리터, 파서 버퍼 등 고정 오버헤드를 뺌
+    chunked = [memory_probe.run_child(LOAD_SCRIPT, file_name, 'chunked', 5000) for file_name in file_names]
+    concat = [memory_probe.run_child(LOAD_SCRIPT, file_name, 'concat', 5000) for file_name in file_names]
+    (small_growth, small_frame), (large_growth, large_frame) = chunked
+    file_mb = (os.path.getsize(file_names[1]) - os.path.getsize(file_names[0])) / 2 ** 20
+
+    growth_per_frame = (large_growth - small_growth) / (large_frame - small_frame)
+    assert growth_per_frame < 1.5  # 결과 배열 한 벌 (concat은 청크 목록과 결과로 두 벌)
+    assert large_growth - small_growth < file_mb / 2
+    assert large_growth - small_growth < 0.75 * (concat[1][0] - concat[0][0])
+
+def reference_float_lines(text):
+    """개선 전 BEL 파싱 (빈 줄을 건너뛰고 줄마다 float 변환, 실패하면 NaN)"""
+    return [float(line) if utils.is_valid_float(line) else np.nan for line in text.splitlines() if line.strip()]
+
+@pytest.mark.parametrize('text', [
+    '0.5\n1e-3\n-2\n\n3.25\n',
+    '0.5\nN/A\n\n \n 1.5 \nabc\n2\r\n-\n4',
+    '1\t\n2\n#\n' * 5,
+], ids=['numeric', 'mixed', 'repeated_blocks'])
+@pytest.mark.parametrize('block_size', [2, utils.FLOAT_PARSE_BLOCK_SIZE])
+def test_parse_float_lines_matches_per_line_parse(text, block_size):
+    """빠른 경로와 블록 단위 대체 경로 모두 줄 단위 변환과 같은 값(변환 실패는 NaN)을 반환하는지 확인"""
+    values = utils.parse_float_lines(text, block_size)
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(values, reference_float_lines(text))
+
+def test_parse_bel_values_drops_header():
+    """BEL 텍스트의 문자 헤더 줄은 제거하고, 값이 없으면 오류를 내는지 확인"""
+    np.testing.assert_array_equal(BELComparator.parse_bel_values('BEL\n0.5\nN/A\n'), [0.5, np.nan])
+    with pytest.raises(InvalidBELValuesError):
+        BELComparator.parse_bel_values('BEL\n')
+
+def test_read_text_file_strips_bom(tmp_path):
+    """UTF-8 BOM이 있는 BEL 파일도 첫 값이 그대로 변환되는지 확인"""
+    path = tmp_path / 'bel.txt'
+    path.write_bytes('\ufeff0.5\n0.25\n'.encode('utf-8'))
+    np.testing.assert_array_equal(utils.parse_float_lines(utils.read_text_file(str(path))), [0.5, 0.25])